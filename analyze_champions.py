@@ -1,17 +1,9 @@
-import json
+from champion_data import CHAMPIONS_PATH, load_champions
+import argparse
 import os
 from collections import Counter
 
-def analyze_data():
-    file_path = 'src/data/champions.json'
-    if not os.path.exists(file_path):
-        print(f"Error: {file_path} not found.")
-        return
-
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-
-    champions = data.get('champions', [])
+def analyze_data(champions):
     total_champions = len(champions)
 
     # 1. Hero Type Analysis
@@ -44,5 +36,20 @@ def analyze_data():
     for level, count in sorted(difficulty_counts.items()):
         print(f"  Level {level}: {count} ({count/total_champions*100:.1f}%)")
 
+def main():
+    parser = argparse.ArgumentParser(description='Summarize the roster by hero type, range and difficulty.')
+    parser.add_argument('--roster', default=CHAMPIONS_PATH,
+                        help='champions.json style file, or @VERSION for a stored roster version')
+    args = parser.parse_args()
+
+    if not args.roster.startswith('@') and not os.path.exists(args.roster):
+        print(f"Error: {args.roster} not found.")
+        return
+    try:
+        champions = load_champions(args.roster)
+    except KeyError as e:
+        parser.error(e.args[0])
+    analyze_data(champions)
+
 if __name__ == "__main__":
-    analyze_data()
+    main()
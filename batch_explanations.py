@@ -0,0 +1,412 @@
+"""
+Batch Explanation Generator
+LoL Champion Recommender System
+Precomputes the LLM explanations the page would otherwise request per user
+action: a short explanation for every champion under the common answer
+profiles (their own role or no role preference, crossed with each playstyle)
+and one for every quality metric per reachable 5% score bucket. Results go to
+src/data/explanations.json, which the page reads before it would fall back to
+generateFallbackExplanation / generateMetricFallbackExplanation, so it never
+waits on a live call.
+
+Requests run on asyncio with at most --concurrency in flight. Identical
+prompts are sent once however many entries share them, and every response is
+kept in a content-addressed disk cache keyed by model, generation settings
+and prompt, so re-running after a roster change only pays for new prompts.
+Backends are anything with a `model` name and an async generate(prompt,
+config); the Gemini one speaks the same generateContent API as the page, and
+--backend stub starts a local server in the same format for trying the job
+without a key
+"""
+
+from champion_data import ATTRIBUTES, CHAMPIONS_PATH, DATA_DIR, load_champions, load_json, parse_set_literal
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import metrics
+
+DEFAULT_OUTPUT = os.path.join(DATA_DIR, 'explanations.json')
+DEFAULT_CACHE_DIR = '.explanation_cache'
+QUESTIONS_PATH = os.path.join(DATA_DIR, 'questions.json')
+GEMINI_URL = 'https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent'
+DEFAULT_MODEL = 'gemini-2.5-flash'
+DEFAULT_CONCURRENCY = 8
+MAX_RETRIES = 3
+RETRY_DELAY = 1.0
+REQUEST_TIMEOUT = 30
+
+# Generation settings the page uses for each kind of explanation
+CHAMPION_CONFIG = {'temperature': 0.7, 'maxOutputTokens': 150, 'topP': 0.8, 'topK': 40}
+METRIC_CONFIG = {'temperature': 0.7, 'maxOutputTokens': 120, 'topP': 0.8, 'topK': 40}
+
+# Question ids of the answers a champion explanation is keyed by
+ROLE_QUESTION, PLAYSTYLE_QUESTION = 2, 4
+NO_PREFERENCE = 'No Preference'
+
+METRIC_NAMES = {'p1': 'Precision@1', 'p3': 'Precision@3', 'p5': 'Precision@10', 'mrr': 'Mean Reciprocal Rank'}
+METRIC_DESCRIPTIONS = {
+    'p1': 'measures if your #1 recommended champion matches your preferences',
+    'p3': 'measures how many of your top 3 recommendations match your preferences',
+    'p5': 'measures how many of your top 10 recommendations match your preferences',
+    'mrr': 'measures our algorithm confidence in top recommendations and the balance between champion diversity '
+           'and match accuracy',
+}
+# Scores (percent, rounded down to a multiple of 5) each metric can reach with ten recommendations.
+# Rounding down keeps every bucket on one side of the 40% and 70% performance thresholds
+METRIC_SCORES = {
+    'p1': [0, 100],
+    'p3': [0, 30, 65, 100],
+    'p5': list(range(0, 101, 10)),
+    'mrr': list(range(0, 101, 5)),
+}
+# Relevant-champion counts are bucketed so the prompt stays reusable; (key, lower bound, description)
+RELEVANT_BANDS = [('few', 0, 'fewer than 10'), ('some', 10, 'between 10 and 29'), ('many', 30, '30 or more')]
+RECOMMENDED_COUNT = 10
+
+REQUESTS = metrics.counter('explanation_requests_total', 'Explanation backend requests by outcome',
+                           labels=('result',))
+CACHE_LOOKUPS = metrics.counter('explanation_cache_total', 'Explanation cache lookups', labels=('result',))
+REQUEST_SECONDS = metrics.histogram('explanation_request_seconds', 'Explanation backend request latency')
+
+
+def question_options(question_id, path=QUESTIONS_PATH):
+    data = load_json(path)
+    questions = data['questions'] if isinstance(data, dict) else data
+    question = next(q for q in questions if q['id'] == question_id)
+    return [o if isinstance(o, str) else o['text'] for o in question['options']]
+
+
+def champion_profiles(champion, roles, playstyles, all_roles=False):
+    """(role, playstyle) answer pairs to explain a champion for"""
+    herotype = champion.get('herotype') or champion.get('role')
+    matching = roles if all_roles else [r for r in roles if r == herotype]
+    return [(role, playstyle) for role in matching + [NO_PREFERENCE] for playstyle in playstyles]
+
+
+def champion_prompt(champion, role, playstyle):
+    attributes = champion.get('attributes', {})
+    ratings = ', '.join(f"{a} {attributes.get(a, 2.0):.0f}" for a in ATTRIBUTES)
+    positions = ', '.join(parse_set_literal(champion.get('position'))) or 'any lane'
+    return f"""You are a League of Legends expert. Explain in 2-3 sentences why this champion suits this player. Be specific, friendly and concise.
+
+Champion: {champion['name']}, {champion.get('title', '')}
+Class: {champion.get('herotype', 'Unknown')} ({champion.get('range_type', 'Unknown')}), played {positions}
+Ratings (1-3): {ratings}, difficulty {champion.get('difficulty', 2)}
+
+Player's preferred role: {role}
+Player's preferred playstyle: {playstyle}"""
+
+
+def relevant_band(count):
+    return [key for key, lower, _ in RELEVANT_BANDS if count >= lower][-1]
+
+
+def performance_tier(value):
+    """The verdict the page gives a 0-1 metric value"""
+    return 'excellent' if value >= 0.7 else 'good' if value >= 0.4 else 'needs improvement'
+
+
+def metric_prompt(metric, percent, band):
+    """Prompt for every score in [percent, percent + 5); the text must not quote a number the page would contradict"""
+    score = '100%' if percent >= 100 else f"at least {percent}% and below {percent + 5}%"
+    described = next(text for key, _, text in RELEVANT_BANDS if key == band)
+    return f"""You are a machine learning evaluation expert. Explain this recommendation quality metric in simple terms (2-3 sentences max):
+
+Metric: {METRIC_NAMES[metric]}
+Score: {score}
+Performance: {performance_tier(percent / 100)}
+Relevant champions found: {described}
+Total recommendations: {RECOMMENDED_COUNT}
+
+This metric {METRIC_DESCRIPTIONS[metric]}. Explain what this score means for the user and whether it's good or bad. Do not quote an exact score or count; the page shows them next to your text. Be friendly and concise."""
+
+
+def build_jobs(champions, kinds=('champions', 'metrics'), all_roles=False):
+    """[(section, entry key, subkey, prompt, config)] for everything to precompute"""
+    jobs = []
+    if 'champions' in kinds:
+        roles, playstyles = question_options(ROLE_QUESTION), question_options(PLAYSTYLE_QUESTION)
+        for champion in champions:
+            for role, playstyle in champion_profiles(champion, roles, playstyles, all_roles):
+                jobs.append(('champions', champion['id'], f"{role}|{playstyle}",
+                             champion_prompt(champion, role, playstyle), CHAMPION_CONFIG))
+    if 'metrics' in kinds:
+        for metric, scores in METRIC_SCORES.items():
+            for percent in scores:
+                for band, _, _ in RELEVANT_BANDS:
+                    jobs.append(('metrics', metric, f"{percent}|{performance_tier(percent / 100)}|{band}",
+                                 metric_prompt(metric, percent, band), METRIC_CONFIG))
+    return jobs
+
+
+def cache_key(model, prompt, config):
+    payload = json.dumps({'model': model, 'config': config, 'prompt': prompt}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class DiskCache:
+    """Responses stored as <dir>/<key[:2]>/<key>.json, written atomically"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def get(self, key):
+        try:
+            with open(self.path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)['text']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, text, model):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'model': model, 'text': text, 'created': time.time()}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class BackendError(Exception):
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class GeminiBackend:
+    """generateContent over HTTP; blocking urllib calls run on the event loop's thread pool"""
+
+    def __init__(self, api_key, model=DEFAULT_MODEL, url=None):
+        self.api_key = api_key
+        self.model = model
+        self.url = url or GEMINI_URL.format(model=model)
+
+    def _post(self, prompt, config):
+        body = json.dumps({'contents': [{'parts': [{'text': prompt}]}], 'generationConfig': config}).encode('utf-8')
+        request = urllib.request.Request(f"{self.url}?key={self.api_key}", data=body, method='POST',
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+                data = json.load(response)
+        except urllib.error.HTTPError as e:
+            raise BackendError(f"HTTP {e.code}", retryable=e.code == 429 or e.code >= 500) from e
+        except (urllib.error.URLError, TimeoutError) as e:
+            raise BackendError(str(e)) from e
+        try:
+            return data['candidates'][0]['content']['parts'][0]['text'].strip()
+        except (KeyError, IndexError) as e:
+            raise BackendError('no text in response', retryable=False) from e
+
+    async def generate(self, prompt, config):
+        return await asyncio.get_running_loop().run_in_executor(None, self._post, prompt, config)
+
+
+class StubServer:
+    """Local server answering generateContent requests with deterministic text.
+
+    `latency` seconds are added to every response and roughly `failure_rate`
+    of first attempts get a 503, so retries and concurrency can be exercised.
+    """
+
+    def __init__(self, latency=0.05, failure_rate=0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                prompt = body['contents'][0]['parts'][0]['text']
+                digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+                with server._lock:
+                    server.requests += 1
+                    first_attempt = digest not in server._seen
+                    server._seen.add(digest)
+                time.sleep(server.latency)
+                if first_attempt and int(digest[:8], 16) / 0xffffffff < server.failure_rate:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                subject = prompt.splitlines()[2] if len(prompt.splitlines()) > 2 else prompt[:60]
+                text = f"[stub {digest[:8]}] {subject}"
+                payload = json.dumps({'candidates': [{'content': {'parts': [{'text': text}]}}]}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1beta/models/stub:generateContent"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+async def generate_all(jobs, backend, cache=None, concurrency=DEFAULT_CONCURRENCY):
+    """Run every unique prompt once; returns ({cache key: text or None}, stats)"""
+    unique = {}
+    for _, _, _, prompt, config in jobs:
+        unique.setdefault(cache_key(backend.model, prompt, config), (prompt, config))
+    stats = {'jobs': len(jobs), 'unique': len(unique), 'cached': 0, 'requested': 0, 'retries': 0, 'failed': 0}
+    results = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(key, prompt, config):
+        text = cache.get(key) if cache else None
+        if text is not None:
+            CACHE_LOOKUPS.labels('hit').inc()
+            stats['cached'] += 1
+            results[key] = text
+            return
+        CACHE_LOOKUPS.labels('miss').inc()
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with semaphore:
+                    stats['requested'] += 1
+                    start = time.perf_counter()
+                    text = await backend.generate(prompt, config)
+                REQUEST_SECONDS.observe(time.perf_counter() - start)
+                REQUESTS.labels('ok').inc()
+                break
+            except BackendError as e:
+                REQUESTS.labels('error').inc()
+                if not e.retryable or attempt == MAX_RETRIES:
+                    stats['failed'] += 1
+                    results[key] = None
+                    return
+                stats['retries'] += 1
+                # Back off without holding a slot, so other prompts keep flowing
+                await asyncio.sleep(RETRY_DELAY * 2 ** attempt)
+        if cache:
+            cache.put(key, text, backend.model)
+        results[key] = text
+
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    await asyncio.gather(*(run(key, prompt, config) for key, (prompt, config) in unique.items()))
+    return results, stats
+
+
+def assemble(jobs, results, model, previous=None):
+    """The static file layout the page reads: {section: {id or metric: {subkey: text}}}.
+
+    Entries of `previous` (an earlier output) are kept unless this run regenerated them.
+    """
+    output = {'model': model, 'generated': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+              'champions': {}, 'metrics': {}}
+    if previous and previous.get('model') == model:
+        regenerated = {(section, entry) for section, entry, *_ in jobs}
+        for section in ('champions', 'metrics'):
+            output[section] = {entry: texts for entry, texts in previous.get(section, {}).items()
+                               if (section, entry) not in regenerated}
+    for section, entry, subkey, prompt, config in jobs:
+        text = results.get(cache_key(model, prompt, config))
+        if text is not None:
+            output[section].setdefault(entry, {})[subkey] = text
+    return output
+
+
+def write_output(output, path):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def run_job(jobs, backend, cache, concurrency, output_path, merge=False):
+    start = time.perf_counter()
+    results, stats = asyncio.run(generate_all(jobs, backend, cache, concurrency))
+    stats['seconds'] = time.perf_counter() - start
+    previous = load_json(output_path) if merge and os.path.exists(output_path) else None
+    output = assemble(jobs, results, backend.model, previous)
+    write_output(output, output_path)
+    return output, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute champion and metric explanations into a static file.')
+    parser.add_argument('--backend', choices=('gemini', 'stub'), default='gemini')
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Requests in flight at once')
+    parser.add_argument('--only', choices=('champions', 'metrics'), help='Generate just one section')
+    parser.add_argument('--champions', nargs='+', metavar='ID', help='Limit to these champion ids')
+    parser.add_argument('--all-roles', action='store_true',
+                        help="Explain every champion for every role answer, not just its own")
+    parser.add_argument('--roster', default=CHAMPIONS_PATH)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true', help='Neither read nor write the response cache')
+    parser.add_argument('--stub-latency', type=float, default=0.05, help='Seconds per stub response')
+    parser.add_argument('--stub-failure-rate', type=float, default=0.0, help='Share of first stub attempts that fail')
+    parser.add_argument('--dry-run', action='store_true', help='Only count prompts')
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    champions = load_champions(args.roster)
+    if args.champions:
+        unknown = set(args.champions) - {c['id'] for c in champions}
+        if unknown:
+            parser.error(f"unknown champion(s): {', '.join(sorted(unknown))}")
+        champions = [c for c in champions if c['id'] in args.champions]
+    kinds = (args.only,) if args.only else ('champions', 'metrics')
+    jobs = build_jobs(champions, kinds, args.all_roles)
+    if args.dry_run:
+        unique = len({cache_key(args.model, prompt, config) for *_, prompt, config in jobs})
+        print(f"{len(jobs):,} explanations from {unique:,} unique prompts")
+        return
+
+    cache = None if args.no_cache else DiskCache(args.cache_dir)
+    # A partial run updates its own entries in an existing file and keeps the rest
+    merge = bool(args.only or args.champions)
+    if args.backend == 'stub':
+        with StubServer(args.stub_latency, args.stub_failure_rate) as stub:
+            output, stats = run_job(jobs, GeminiBackend('stub', 'stub', stub.url), cache, args.concurrency,
+                                    args.output, merge)
+            stats['served'] = stub.requests
+    else:
+        api_key = os.environ.get('GEMINI_API_KEY')
+        if not api_key:
+            parser.error("set GEMINI_API_KEY, or use --backend stub")
+        output, stats = run_job(jobs, GeminiBackend(api_key, args.model), cache, args.concurrency, args.output,
+                                 merge)
+
+    print("\n" + "=" * 50)
+    for label, key in (('Explanations', 'jobs'), ('Unique prompts', 'unique'), ('From cache', 'cached'),
+                       ('Requests sent', 'requested'), ('Retries', 'retries'), ('Failed', 'failed')):
+        print(f"{label:<30}{stats[key]:>12,}")
+    print("-" * 50)
+    written = sum(len(v) for section in ('champions', 'metrics') for v in output[section].values())
+    print(f"Wrote {written:,} explanations to {args.output} in {stats['seconds']:.1f}s "
+          f"({os.path.getsize(args.output) / 1024:.0f} KB)")
+    print("=" * 50)
+    if stats['failed']:
+        print(f"{stats['failed']} prompts failed; the page falls back to its templates for those")
+
+
+if __name__ == "__main__":
+    main()
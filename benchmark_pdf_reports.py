@@ -0,0 +1,115 @@
+"""
+PDF Report Build Benchmark
+LoL Champion Recommender System
+Compares the raster (PNG), vector (SVG) and resampled-image-cache chart paths
+of the PDF reports: build time, peak memory and output size
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory is not reported
+    resource = None
+
+GRAPHS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'Graphs')
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def _image_cache(mode):
+    from report_image_cache import ImageCache
+    return ImageCache() if mode == 'cached' else None
+
+
+def _build_champion_analysis(mode, output):
+    import generate_pdf_report
+    generate_pdf_report.generate_pdf(image_cache=_image_cache(mode), output_path=output)
+
+
+def _build_research_framework(mode, output):
+    import generate_research_framework
+    generate_research_framework.generate_report(vector=mode == 'vector', output_filename=output,
+                                                image_cache=_image_cache(mode))
+
+
+def _build_ml_report(mode, output):
+    sys.path.insert(0, GRAPHS_DIR)
+    os.chdir(GRAPHS_DIR)
+    from generate_pdf_report import MLReportGenerator
+    MLReportGenerator(output, vector=mode == 'vector', image_cache=_image_cache(mode)).generate_report()
+
+
+# Report name -> (builder, supported modes)
+BUILDERS = {
+    'champion_analysis': (_build_champion_analysis, ('raster', 'cached')),
+    'research_framework': (_build_research_framework, ('raster', 'vector', 'cached')),
+    'ml_report': (_build_ml_report, ('raster', 'vector', 'cached')),
+}
+
+
+def _run(builder, mode, output, queue):
+    start = time.perf_counter()
+    BUILDERS[builder][0](mode, output)
+    queue.put((time.perf_counter() - start, _peak_rss_mb()))
+
+
+def measure(builder, mode, output):
+    """Build one report in a fresh process and return (seconds, peak MB, bytes)."""
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(builder, mode, output, queue))
+    proc.start()
+    proc.join()
+    if proc.exitcode != 0:
+        raise RuntimeError(f"{builder} build failed (exit code {proc.exitcode})")
+    elapsed, peak = queue.get()
+    return elapsed, peak, os.path.getsize(output)
+
+
+def benchmark(builders, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+    for builder in builders:
+        for mode in BUILDERS[builder][1]:
+            output = os.path.abspath(os.path.join(output_dir, f'{builder}_{mode}.pdf'))
+            elapsed, peak, size = measure(builder, mode, output)
+            results.append((builder, mode, elapsed, peak, size))
+
+    print("\n" + "=" * 70)
+    print(f"{'Report':<22}{'Mode':<8}{'Time (s)':>10}{'Peak RSS (MB)':>16}{'Size (KB)':>12}")
+    print("-" * 70)
+    for builder, mode, elapsed, peak, size in results:
+        peak_text = f"{peak:.1f}" if peak is not None else 'n/a'
+        print(f"{builder:<22}{mode:<8}{elapsed:>10.2f}{peak_text:>16}{size / 1024:>12.1f}")
+    print("=" * 70)
+    print("Vector mode needs fpdf2 for the research framework and svglib plus the\n"
+          "SVG charts (generate_ml_charts.py --svg) for the ML report; without them\n"
+          "it falls back to PNG and the two rows match. The cached mode resamples\n"
+          "charts to 150 dpi once; rerun to measure warm-cache builds.")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark raster, vector and cached PDF report builds.')
+    parser.add_argument('reports', nargs='*', help=f"Reports to build (default: all of {', '.join(BUILDERS)})")
+    parser.add_argument('--output-dir', default='benchmark_output')
+    args = parser.parse_args()
+    unknown = set(args.reports) - set(BUILDERS)
+    if unknown:
+        parser.error(f"unknown report(s): {', '.join(sorted(unknown))}")
+    benchmark(args.reports or list(BUILDERS), args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Unified Report Builder
+LoL Champion Recommender System
+Builds all five PDF reports in a single process so they share what each
+script would otherwise load on its own: imported libraries and font metrics,
+one reportlab stylesheet, and one image cache so every chart is hashed,
+decoded and resampled at most once per invocation
+"""
+
+from reportlab.lib.styles import getSampleStyleSheet
+from parallel_report_build import GRAPHS_DIR, ROOT_DIR, load_graphs_module
+from report_image_cache import DEFAULT_CACHE_DIR, ImageCache
+from report_profiler import ReportProfiler, profile_path_for
+import argparse
+import metrics
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+class ReportResources:
+    """Resources shared by every report built in this process"""
+
+    def __init__(self, image_cache=True, profile=False):
+        self.image_cache = ImageCache(os.path.join(ROOT_DIR, DEFAULT_CACHE_DIR)) if image_cache else None
+        self.profile = profile
+        self._stylesheet = None
+
+    def profiler(self, name, output_path):
+        """A ReportProfiler writing next to output_path when profiling is on"""
+        return ReportProfiler(name, profile_path_for(output_path)) if self.profile else None
+
+    @property
+    def stylesheet(self):
+        # Both reportlab generators add uniquely named custom styles, so one sheet serves both
+        if self._stylesheet is None:
+            self._stylesheet = getSampleStyleSheet()
+        return self._stylesheet
+
+
+def build_champion_analysis(output_dir, resources):
+    import generate_pdf_report
+    output = os.path.join(output_dir, 'Champion_Analysis_Report.pdf')
+    generate_pdf_report.generate_pdf(resources.image_cache, output,
+                                     resources.profiler('champion_analysis', output))
+
+
+def build_project_summary(output_dir, resources):
+    import generate_project_summary
+    output = os.path.join(output_dir, 'Project_Summary_Report.pdf')
+    generate_project_summary.generate_report(output, resources.profiler('project_summary', output))
+
+
+def build_research_framework(output_dir, resources):
+    import generate_research_framework
+    output = os.path.join(output_dir, 'Research_Framework.pdf')
+    generate_research_framework.generate_report(output_filename=output, image_cache=resources.image_cache,
+                                                diagram_dir=output_dir,
+                                                profiler=resources.profiler('research_framework', output))
+
+
+def build_ml_report(output_dir, resources):
+    module = load_graphs_module('generate_pdf_report')
+    output = os.path.join(output_dir, 'ML_Performance_Comprehensive_Analysis_Report.pdf')
+    cwd = os.getcwd()
+    os.chdir(GRAPHS_DIR)
+    try:
+        module.MLReportGenerator(output, image_cache=resources.image_cache, styles=resources.stylesheet,
+                                 profiler=resources.profiler('ml_report', output)).generate_report()
+    finally:
+        os.chdir(cwd)
+
+
+def build_methodology(output_dir, resources):
+    module = load_graphs_module('generate_methodology_report')
+    output = os.path.join(output_dir, 'ML_Methodology_Analysis_Report.pdf')
+    cwd = os.getcwd()
+    # The methodology charts are written to and removed from the working directory
+    work_dir = tempfile.mkdtemp(prefix='methodology_report_')
+    os.chdir(work_dir)
+    try:
+        module.MLMethodologyReportGenerator(output, styles=resources.stylesheet,
+                                            profiler=resources.profiler('methodology', output)).build()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+REPORTS = {
+    'champion_analysis': build_champion_analysis,
+    'project_summary': build_project_summary,
+    'research_framework': build_research_framework,
+    'ml_report': build_ml_report,
+    'methodology': build_methodology,
+}
+
+
+def build_all(names, output_dir, image_cache=True, profile=False):
+    """Build the named reports in this process; returns {name: seconds}"""
+    os.chdir(ROOT_DIR)
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    resources = ReportResources(image_cache, profile)
+    timings = {}
+    for name in names:
+        start = time.perf_counter()
+        REPORTS[name](output_dir, resources)
+        timings[name] = time.perf_counter() - start
+        metrics.PDF_SECONDS.labels(name).observe(timings[name])
+    return timings
+
+
+def _run_script(args, output_dir, image_cache):
+    """Run this script in a fresh interpreter and return its wall-clock time"""
+    cmd = [sys.executable, os.path.abspath(__file__), *args, '--output-dir', output_dir]
+    if not image_cache:
+        cmd.append('--no-image-cache')
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True, cwd=ROOT_DIR, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def compare(names, output_dir, image_cache=True):
+    """Time one unified run against one fresh process per report, startup included"""
+    if image_cache:
+        # Prime the on-disk image cache so neither side pays for the first resample
+        _run_script(names, os.path.join(output_dir, 'warmup'), image_cache)
+    unified = _run_script(names, os.path.join(output_dir, 'unified'), image_cache)
+    separate = {name: _run_script([name], os.path.join(output_dir, 'separate'), image_cache) for name in names}
+
+    print("\n" + "=" * 50)
+    print(f"{'Separate processes':<30}{'Time (s)':>12}")
+    print("-" * 50)
+    for name in names:
+        print(f"  {name:<28}{separate[name]:>12.2f}")
+    total = sum(separate.values())
+    print(f"{'Total, separate':<30}{total:>12.2f}")
+    print(f"{'Total, unified':<30}{unified:>12.2f}")
+    print(f"{'Saved':<30}{total - unified:>12.2f}  ({(total - unified) / total * 100:.1f}%)")
+    print("=" * 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build every PDF report in one process.')
+    parser.add_argument('reports', nargs='*', help=f"Reports to build (default: all of {', '.join(REPORTS)})")
+    parser.add_argument('--output-dir', default='reports')
+    parser.add_argument('--no-image-cache', action='store_true', help='Embed full-resolution charts')
+    parser.add_argument('--compare', action='store_true',
+                        help='Time a unified run against running each report in its own process')
+    parser.add_argument('--profile', action='store_true',
+                        help='Write a .profile.json with section and flowable timings next to each report')
+    parser.add_argument('--metrics', metavar='DIR', nargs='?', const=metrics.DEFAULT_METRICS_DIR,
+                        help=f"Export build metrics to DIR every few seconds (default: {metrics.DEFAULT_METRICS_DIR})")
+    args = parser.parse_args()
+
+    unknown = set(args.reports) - set(REPORTS)
+    if unknown:
+        parser.error(f"unknown report(s): {', '.join(sorted(unknown))}")
+    names = args.reports or list(REPORTS)
+    output_dir = os.path.abspath(args.output_dir)
+    image_cache = not args.no_image_cache
+
+    if args.compare:
+        compare(names, output_dir, image_cache)
+        return
+
+    exporter = metrics.PeriodicExporter(os.path.abspath(args.metrics)).start() if args.metrics else None
+    start = time.perf_counter()
+    try:
+        timings = build_all(names, output_dir, image_cache, args.profile)
+    finally:
+        if exporter:
+            exporter.stop()
+    total = time.perf_counter() - start
+
+    print("\n" + "=" * 50)
+    for name in names:
+        print(f"  {name:<28}{timings[name]:>12.2f}s")
+    print(f"{'Total':<30}{total:>12.2f}s")
+    print("=" * 50)
+    if args.metrics:
+        print(f"Metrics written to {os.path.join(args.metrics, metrics.PROMETHEUS_FILE)} and {metrics.JSON_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Analytics Dataset Builder
+LoL Champion Recommender System
+Precomputes every series the analytics dashboard plots (hero types, melee vs.
+ranged, resources, difficulty shares, release timeline and attribute
+averages) into one small JSON file, so the page only draws numbers. The file
+records a hash of its inputs (roster, CSV, this script and the champion_data
+loaders) and is rebuilt only when one of them changes
+"""
+
+from build_data_bundles import canonical_bytes
+from champion_data import (ATTRIBUTES, CHAMPIONS_PATH, CSV_PATH, DATA_DIR, load_champion_csv, load_champions,
+                           name_key)
+from collections import Counter, defaultdict
+from datetime import datetime
+import argparse
+import champion_data
+import hashlib
+import json
+import os
+
+DEFAULT_OUTPUT = os.path.join(DATA_DIR, 'analytics.json')
+DIFFICULTY_LABELS = {1: 'Low (1)', 2: 'Medium (2)', 3: 'High (3)'}
+
+
+def inputs_hash(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        if path.startswith('@'):
+            # A roster snapshot version is hashed by the roster it resolves to
+            digest.update(canonical_bytes(load_champions(path)))
+        elif os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def load_csv_extras(path):
+    """{name key: {'resource', 'release_year'}} from the archived champion CSV"""
+    extras = {}
+    for key, row in load_champion_csv(path).items():
+        try:
+            year = datetime.strptime(row['date'], '%d/%m/%Y').year
+        except (KeyError, ValueError):
+            year = None
+        extras[key] = {'resource': row.get('resource') or None, 'release_year': year}
+    return extras
+
+
+def series(counter, order=None):
+    """Chart.js-ready {labels, values}; most common first unless an order is given"""
+    items = [(k, counter.get(k, 0)) for k in order] if order else counter.most_common()
+    return {'labels': [str(k) for k, _ in items], 'values': [v for _, v in items]}
+
+
+def compute_analytics(champions, extras):
+    total = len(champions)
+    joined = [extras.get(name_key(c['name']), {}) for c in champions]
+
+    difficulty = Counter(c.get('difficulty') or 2 for c in champions)
+    difficulty_series = series(difficulty, order=sorted(DIFFICULTY_LABELS))
+    difficulty_series['labels'] = [DIFFICULTY_LABELS[k] for k in sorted(DIFFICULTY_LABELS)]
+    difficulty_series['shares'] = [round(v / total * 100, 1) if total else 0 for v in difficulty_series['values']]
+
+    years = Counter(e['release_year'] for e in joined if e.get('release_year'))
+    timeline = series(years, order=list(range(min(years), max(years) + 1))) if years else series(Counter())
+
+    sums, counts = defaultdict(lambda: [0.0] * len(ATTRIBUTES)), Counter()
+    for champion in champions:
+        attributes = champion.get('attributes', {})
+        for key in ('All', champion.get('herotype') or 'Unknown'):
+            counts[key] += 1
+            for i, name in enumerate(ATTRIBUTES):
+                sums[key][i] += attributes.get(name, 0.0)
+    averages = {key: [round(s / counts[key], 3) for s in values] for key, values in sums.items()}
+
+    return {
+        'total_champions': total,
+        'hero_types': series(Counter(c.get('herotype') or 'Unknown' for c in champions)),
+        'range_types': series(Counter(c.get('range_type') or 'Unknown' for c in champions)),
+        'resources': series(Counter(e.get('resource') or 'Unknown' for e in joined)),
+        'difficulty': difficulty_series,
+        'release_timeline': timeline,
+        'attribute_averages': {
+            'attributes': list(ATTRIBUTES),
+            'overall': averages.pop('All', []),
+            'by_herotype': dict(sorted(averages.items())),
+        },
+    }
+
+
+def build_analytics(roster_path=CHAMPIONS_PATH, csv_path=CSV_PATH, output_path=DEFAULT_OUTPUT, force=False):
+    """Rewrite output_path if its inputs changed; returns (data, rebuilt)"""
+    source_hash = inputs_hash([roster_path, csv_path, __file__, champion_data.__file__])
+    if not force and os.path.exists(output_path):
+        with open(output_path, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+        if existing.get('source_hash') == source_hash:
+            return existing, False
+
+    data = {'source_hash': source_hash,
+            **compute_analytics(load_champions(roster_path), load_csv_extras(csv_path))}
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, output_path)
+    return data, True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute the analytics dashboard datasets.')
+    parser.add_argument('--roster', default=CHAMPIONS_PATH)
+    parser.add_argument('--csv', default=CSV_PATH, help='Champion CSV with resource and release date columns')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--force', action='store_true', help='Rebuild even if the inputs are unchanged')
+    args = parser.parse_args()
+
+    data, rebuilt = build_analytics(args.roster, args.csv, args.output, args.force)
+    if not rebuilt:
+        print(f"{args.output} is up to date (roster hash {data['source_hash'][:12]})")
+        return
+    print(f"Wrote {args.output} ({os.path.getsize(args.output)} bytes) for {data['total_champions']} champions")
+    for key in ('hero_types', 'range_types', 'resources', 'difficulty', 'release_timeline'):
+        pairs = ', '.join(f"{l}: {v}" for l, v in zip(data[key]['labels'], data[key]['values']))
+        print(f"  {key}: {pairs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Data Bundle Builder
+LoL Champion Recommender System
+Build stage for the static site's JSON data: canonicalizes and minifies the
+roster, questions, counters, guides and tips, writes them under
+content-hashed filenames with gzip (and brotli, when installed) variants, and
+emits a manifest the pages read to find the current files. Hashed files never
+change, so they can be cached forever; only the small manifest is revalidated
+"""
+
+from champion_data import DATA_DIR
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+
+try:
+    import brotli
+except ImportError:  # brotli variants are skipped; gzip is always written
+    brotli = None
+
+BUNDLES = {
+    'champions': 'champions.json',
+    'questions': 'questions.json',
+    'counters': 'champion_counters.json',
+    'guides': 'champion_guides.json',
+    'tips': 'champion_tips.json',
+    # Written by build_roster_index.py and build_analytics_data.py
+    'roster_index': os.path.join('roster', 'index.json'),
+    'analytics': 'analytics.json',
+}
+
+DEFAULT_OUTPUT_DIR = os.path.join(DATA_DIR, 'bundles')
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 10
+
+
+def canonical_value(value):
+    """Normalize a parsed JSON value: whole floats become ints (2.0 -> 2)"""
+    if isinstance(value, dict):
+        return {k: canonical_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [canonical_value(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def canonical_bytes(data):
+    """Minified UTF-8 JSON with sorted keys, so equal data always hashes equally"""
+    return json.dumps(canonical_value(data), ensure_ascii=False, sort_keys=True,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def content_hash(payload):
+    return hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+
+
+def write_bytes(path, payload):
+    """Write atomically, skipping the write if the file already holds payload"""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return True
+
+
+def prune_stale(output_dir, name, keep):
+    """Remove earlier hashed versions of one bundle"""
+    pattern = re.compile(rf'^{re.escape(name)}\.[0-9a-f]{{{HASH_LENGTH}}}\.json(\.gz|\.br)?$')
+    for filename in os.listdir(output_dir):
+        if pattern.match(filename) and filename not in keep:
+            os.remove(os.path.join(output_dir, filename))
+
+
+def build_bundle(name, source_path, output_dir):
+    """Write one bundle and its compressed variants; returns its manifest entry"""
+    with open(source_path, 'r', encoding='utf-8') as f:
+        payload = canonical_bytes(json.load(f))
+    digest = content_hash(payload)
+    filename = f"{name}.{digest}.json"
+
+    variants = {'gzip': (filename + '.gz', gzip.compress(payload, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        variants['br'] = (filename + '.br', brotli.compress(payload, quality=11))
+
+    write_bytes(os.path.join(output_dir, filename), payload)
+    entry = {
+        'file': filename,
+        'hash': digest,
+        'source': os.path.relpath(source_path, output_dir).replace(os.sep, '/'),
+        'source_bytes': os.path.getsize(source_path),
+        'bytes': len(payload),
+    }
+    for encoding, (variant_name, data) in variants.items():
+        write_bytes(os.path.join(output_dir, variant_name), data)
+        entry[encoding] = variant_name
+        entry[encoding + '_bytes'] = len(data)
+
+    prune_stale(output_dir, name, {filename} | {v for v, _ in variants.values()})
+    return entry
+
+
+def build_bundles(data_dir=DATA_DIR, output_dir=DEFAULT_OUTPUT_DIR, names=None):
+    """Build the named bundles (default: all) and rewrite the manifest"""
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = {'bundles': {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    for name in names or BUNDLES:
+        source_path = os.path.join(data_dir, BUNDLES[name])
+        if not os.path.exists(source_path):
+            print(f"Skipping {name}: {source_path} not found")
+            continue
+        manifest['bundles'][name] = build_bundle(name, source_path, output_dir)
+
+    manifest['bundles'] = dict(sorted(manifest['bundles'].items()))
+    changed = write_bytes(manifest_path, (json.dumps(manifest, indent=2) + '\n').encode('utf-8'))
+    return manifest, changed
+
+
+def print_summary(manifest):
+    print("\n" + "=" * 80)
+    print(f"{'Bundle':<14}{'File':<36}{'Source':>8}{'Min':>8}{'gzip':>7}{'br':>7}")
+    print("-" * 80)
+    for name, entry in manifest['bundles'].items():
+        br = f"{entry['br_bytes'] / 1024:.1f}" if 'br_bytes' in entry else '-'
+        print(f"{name:<14}{entry['file']:<36}{entry['source_bytes'] / 1024:>7.1f}K"
+              f"{entry['bytes'] / 1024:>7.1f}K{entry['gzip_bytes'] / 1024:>6.1f}K{br:>7}")
+    print("=" * 80)
+    if brotli is None:
+        print("brotli is not installed; only gzip variants were written (pip install brotli)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build minified, content-hashed JSON data bundles.')
+    parser.add_argument('bundles', nargs='*', help=f"Bundles to build (default: all of {', '.join(BUNDLES)})")
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args()
+
+    unknown = set(args.bundles) - set(BUNDLES)
+    if unknown:
+        parser.error(f"unknown bundle(s): {', '.join(sorted(unknown))}")
+
+    manifest, changed = build_bundles(args.data_dir, args.output_dir, args.bundles)
+    print_summary(manifest)
+    print(f"Manifest {'updated' if changed else 'unchanged'}: {os.path.join(args.output_dir, MANIFEST_NAME)}")
+
+
+if __name__ == "__main__":
+    main()
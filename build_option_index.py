@@ -0,0 +1,150 @@
+"""
+Option Availability Index Builder
+LoL Champion Recommender System
+Indexes which champions satisfy each roster-backed questionnaire option as a
+bitset, then walks every combination of earlier answers to record which
+options of each later question still leave at least one champion. The page
+looks the answer prefix up in these tables to hide options that would lead to
+an empty recommendation, instead of rescanning the roster on every click
+"""
+
+from champion_data import CHAMPIONS_PATH, CSV_PATH, DATA_DIR, load_champion_csv, load_champions, name_key, parse_set_literal
+import argparse
+import json
+import os
+import time
+
+QUESTIONS_PATH = os.path.join(DATA_DIR, 'questions.json')
+DEFAULT_OUTPUT = os.path.join(DATA_DIR, 'option_availability.json')
+NO_PREFERENCE = 'No Preference'
+FEATURES = ('difficulty', 'role', 'position', 'attack_range', 'resource_type', 'damage_type')
+
+# Questionnaire option -> roster value, per feature. The roster's own `role`
+# column is 'Fighter' for every champion, so the role question is matched
+# against `herotype`, which is what the engines score it on
+DIFFICULTY_LEVELS = {'Easy (1-3)': {1}, 'Medium (4-6)': {2}, 'Hard (7-8)': {3}, 'Very Hard (9-10)': {3}}
+POSITION_NAMES = {'Top': 'Top', 'Jungle': 'Jungle', 'Mid': 'Middle', 'Bot': 'Bottom', 'Support': 'Support'}
+
+
+def champion_matches(feature, option, champion, extra):
+    """Whether one champion satisfies one option of a roster-backed question"""
+    if option == NO_PREFERENCE:
+        return True
+    if feature == 'difficulty':
+        return (champion.get('difficulty') or 2) in DIFFICULTY_LEVELS.get(option, ())
+    if feature == 'role':
+        return champion.get('herotype') == option
+    if feature == 'position':
+        return POSITION_NAMES.get(option) in parse_set_literal(champion.get('position'))
+    if feature == 'attack_range':
+        return champion.get('range_type') == option
+    if feature == 'resource_type':
+        return extra.get('resource') == option
+    if feature == 'damage_type':
+        return extra.get('adaptivetype') == option
+    raise KeyError(feature)
+
+
+def option_bitsets(questions, champions, extras):
+    """{question id: [bitset per option]} for the roster-backed questions; bit i is champions[i]"""
+    joined = [extras.get(name_key(c['name']), {}) for c in champions]
+    bitsets = {}
+    for question in questions:
+        feature = question.get('feature_mapping')
+        if feature not in FEATURES:
+            continue
+        bitsets[question['id']] = [
+            sum(1 << i for i, (champion, extra) in enumerate(zip(champions, joined))
+                if champion_matches(feature, option, champion, extra))
+            for option in question['options']
+        ]
+    return bitsets
+
+
+def availability_tables(order, bitsets, everyone):
+    """For each question, one option mask per combination of answers to the questions before it.
+
+    Every earlier question contributes a digit in [0, n_options]; the extra
+    value n_options stands for "not answered yet". Digits are combined in
+    mixed radix, first question most significant, so the page can compute the
+    same index from its answers without any search.
+    """
+    tables = {}
+    for position, question_id in enumerate(order):
+        prefix = order[:position]
+        options = bitsets[question_id]
+        table = []
+
+        def walk(depth, mask):
+            if depth == len(prefix):
+                table.append(sum(1 << i for i, bits in enumerate(options) if mask & bits))
+                return
+            for bits in bitsets[prefix[depth]]:
+                walk(depth + 1, mask & bits)
+            walk(depth + 1, mask)
+
+        walk(0, everyone)
+        tables[question_id] = table
+    return tables
+
+
+def build_index(questions, champions, extras):
+    bitsets = option_bitsets(questions, champions, extras)
+    order = [q['id'] for q in questions if q['id'] in bitsets]
+    if any(len(bits) > 8 for bits in bitsets.values()):
+        raise ValueError("option masks are stored as one byte; a question has more than 8 options")
+    tables = availability_tables(order, bitsets, (1 << len(champions)) - 1)
+    by_id = {q['id']: q for q in questions}
+    return {
+        'champions': len(champions),
+        'questions': [
+            {
+                'id': question_id,
+                'feature': by_id[question_id]['feature_mapping'],
+                'options': by_id[question_id]['options'],
+                'counts': [bin(bits).count('1') for bits in bitsets[question_id]],
+                # Two hex digits per prefix; bit i set means options[i] still has champions
+                'table': bytes(tables[question_id]).hex(),
+            }
+            for question_id in order
+        ],
+    }
+
+
+def print_summary(index):
+    print("\n" + "=" * 72)
+    print(f"{'Q':<4}{'Feature':<16}{'Prefixes':>10}{'Dead ends':>11}  Options (champions)")
+    print("-" * 72)
+    for question in index['questions']:
+        table = bytes.fromhex(question['table'])
+        full = (1 << len(question['options'])) - 1
+        dead = sum(1 for mask in table if mask != full)
+        options = ', '.join(f"{o} ({n})" for o, n in zip(question['options'], question['counts']))
+        print(f"{question['id']:<4}{question['feature']:<16}{len(table):>10}{dead:>11}  {options}")
+    print("=" * 72)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute which questionnaire options still lead to champions.')
+    parser.add_argument('--roster', default=CHAMPIONS_PATH)
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--csv', default=CSV_PATH, help='Champion CSV with resource and damage type columns')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        questions = json.load(f)['questions']
+    start = time.perf_counter()
+    index = build_index(questions, load_champions(args.roster), load_champion_csv(args.csv))
+    elapsed = time.perf_counter() - start
+
+    tmp_path = args.output + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(tmp_path, args.output)
+    print_summary(index)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output)} bytes) in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
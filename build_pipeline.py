@@ -0,0 +1,358 @@
+"""
+Build Pipeline
+LoL Champion Recommender System
+Declarative dependency graph of the generated artifacts (data -> charts ->
+reports). Targets are rebuilt only when the content of one of their inputs
+changed, independent targets run in parallel, and watch mode rebuilds the
+minimal set of descendants whenever a source file changes. With --metrics
+each rebuilt target exports its metrics to DIR/<target>/ and the pipeline
+merges them, plus its own timing of each PDF target, into DIR/metrics.prom
+and DIR/metrics.json
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+import metrics
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = os.path.join(ROOT_DIR, '.build_state.json')
+
+CHAMPION_CHARTS = [f'chart_{name}.png' for name in
+                   ('hero_type', 'range_type', 'resource_type', 'difficulty', 'release_year')]
+ML_CHARTS = [f'src/Graphs/{name}.png' for name in (
+    '1_precision_comparison', '2_recall_f1_comparison', '3_mrr_comparison', '4_execution_time',
+    '5_radar_performance', '6_champion_distribution', '7_difficulty_distribution',
+    '8_precision_recall_tradeoff', '9_metrics_heatmap', '10_ensemble_advantage')]
+ADVANCED_ML_CHARTS = [f'src/Graphs/{name}.png' for name in (
+    '11_precision_degradation_analysis', '12_recall_progression', '13_f1_score_k_comparison',
+    '14_algorithm_efficiency', '15_ensemble_weighted_contribution', '16_metrics_correlation',
+    '17_performance_distribution', '18_ensemble_improvement', '19_precision_recall_curves',
+    '20_top_k_accuracy', '21_algorithm_strengths_radar', '22_metric_trends_summary')]
+
+
+class Target:
+    """One build step: a script run in cwd that turns inputs into outputs.
+
+    The script itself is always an input. Dependencies between targets are
+    derived from which target produces each input file.
+    """
+
+    def __init__(self, name, script, inputs=(), outputs=(), cwd='.', args=()):
+        self.name = name
+        self.script = script
+        self.inputs = [script] + list(inputs)
+        self.outputs = list(outputs)
+        self.cwd = cwd
+        self.args = list(args)
+
+    def command(self):
+        return [sys.executable, os.path.relpath(os.path.join(ROOT_DIR, self.script), os.path.join(ROOT_DIR, self.cwd)),
+                *self.args]
+
+
+TARGETS = [
+    Target('champion_charts', 'generate_charts.py',
+           inputs=['src/data/champions.json', 'metrics.py'], outputs=CHAMPION_CHARTS),
+    Target('champion_analysis_pdf', 'generate_pdf_report.py',
+           inputs=CHAMPION_CHARTS + ['report_image_cache.py', 'report_profiler.py', 'metrics.py'],
+           outputs=['Champion_Analysis_Report.pdf'], args=['--image-cache']),
+    Target('ml_charts', 'src/Graphs/generate_ml_charts.py',
+           inputs=['metrics.py'], outputs=ML_CHARTS, cwd='src/Graphs'),
+    Target('advanced_ml_charts', 'src/Graphs/generate_advanced_ml_charts.py',
+           inputs=['metrics.py'], outputs=ADVANCED_ML_CHARTS, cwd='src/Graphs'),
+    Target('ml_report_pdf', 'src/Graphs/generate_pdf_report.py',
+           inputs=ML_CHARTS + ADVANCED_ML_CHARTS + ['report_image_cache.py', 'report_profiler.py', 'metrics.py'],
+           outputs=['src/Graphs/ML_Performance_Comprehensive_Analysis_Report.pdf'], cwd='src/Graphs',
+           args=['--image-cache']),
+    Target('methodology_pdf', 'src/Graphs/generate_methodology_report.py',
+           inputs=['report_profiler.py', 'metrics.py'],
+           outputs=['src/Graphs/ML_Methodology_Analysis_Report.pdf'], cwd='src/Graphs'),
+    Target('research_framework_pdf', 'generate_research_framework.py',
+           inputs=['report_image_cache.py', 'report_profiler.py', 'metrics.py'],
+           outputs=['framework_diagram.png', 'Research_Framework.pdf'], args=['--image-cache']),
+    Target('project_summary_pdf', 'generate_project_summary.py',
+           inputs=['report_profiler.py'], outputs=['Project_Summary_Report.pdf']),
+    Target('roster_index', 'build_roster_index.py',
+           inputs=['champion_data.py', 'build_data_bundles.py', 'src/data/champions.json',
+                   'src/data/champion_counters.json', 'src/data/champion_guides.json',
+                   'src/data/champion_tips.json'],
+           outputs=['src/data/roster/index.json']),
+    Target('feature_pack', 'export_feature_pack.py',
+           inputs=['champion_data.py', 'src/data/champions.json'],
+           outputs=['src/data/roster/features.bin']),
+    Target('analytics_data', 'build_analytics_data.py',
+           inputs=['champion_data.py', 'build_data_bundles.py', 'src/data/champions.json',
+                   'docs-archive/LoL_champion_data.csv'],
+           outputs=['src/data/analytics.json']),
+    Target('questionnaire_tables', 'compile_questionnaire.py',
+           inputs=['champion_data.py', 'src/data/questions.json', 'src/index.html'],
+           outputs=['src/data/questionnaire_tables.json']),
+    Target('option_index', 'build_option_index.py',
+           inputs=['champion_data.py', 'src/data/champions.json', 'src/data/questions.json',
+                   'docs-archive/LoL_champion_data.csv'],
+           outputs=['src/data/option_availability.json']),
+    Target('search_index', 'champion_search.py',
+           inputs=['champion_data.py', 'metrics.py', 'src/data/champions.json', 'src/data/champion_guides.json',
+                   'src/data/champion_tips.json', 'docs-archive/LoL_champion_data.csv'],
+           outputs=['src/data/search_index.json']),
+    Target('similarity_index', 'build_similarity_index.py',
+           inputs=['champion_data.py', 'src/data/champions.json'],
+           outputs=['src/data/roster/neighbors.ids.npy', 'src/data/roster/neighbors.scores.npy',
+                    'src/data/roster/neighbors.json']),
+    Target('data_bundles', 'build_data_bundles.py',
+           inputs=['champion_data.py', 'src/data/champions.json', 'src/data/questions.json',
+                   'src/data/champion_counters.json', 'src/data/champion_guides.json',
+                   'src/data/champion_tips.json', 'src/data/roster/index.json', 'src/data/analytics.json'],
+           outputs=['src/data/bundles/manifest.json']),
+    Target('chart_assets', 'optimize_chart_assets.py',
+           inputs=CHAMPION_CHARTS + ML_CHARTS + ADVANCED_ML_CHARTS,
+           outputs=['src/assets/charts/manifest.json', 'src/assets/charts/charts_sprite.png']),
+]
+
+
+class BuildGraph:
+    """Dependency graph over TARGETS with content-hash staleness tracking"""
+
+    def __init__(self, targets=TARGETS, state_file=STATE_FILE, metrics_dir=None):
+        self.targets = {t.name: t for t in targets}
+        self.state_file = state_file
+        self.metrics_dir = os.path.abspath(metrics_dir) if metrics_dir else None
+        self.state = self._load_state()
+        self._hash_memo = {}
+
+        producers = {}
+        for target in targets:
+            for output in target.outputs:
+                producers[output] = target.name
+        self.deps = {t.name: sorted({producers[i] for i in t.inputs if i in producers} - {t.name})
+                     for t in targets}
+        self.children = {name: [] for name in self.targets}
+        for name, deps in self.deps.items():
+            for dep in deps:
+                self.children[dep].append(name)
+        # Files no target produces: the ones worth watching
+        self.sources = sorted({i for t in targets for i in t.inputs if i not in producers})
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"dependency cycle through {name}")
+            visiting.add(name)
+            for dep in self.deps[name]:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.targets:
+            visit(name)
+        return order
+
+    def _load_state(self):
+        if os.path.exists(self.state_file):
+            with open(self.state_file) as f:
+                return json.load(f)
+        return {}
+
+    def _save_state(self):
+        with open(self.state_file, 'w') as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+
+    def file_hash(self, path):
+        """Content hash of a repo-relative path, memoized on (mtime, size)"""
+        full = os.path.join(ROOT_DIR, path)
+        if not os.path.exists(full):
+            return None
+        st = os.stat(full)
+        stamp = (st.st_mtime_ns, st.st_size)
+        memo = self._hash_memo.get(path)
+        if memo and memo[0] == stamp:
+            return memo[1]
+        with open(full, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self._hash_memo[path] = (stamp, digest)
+        return digest
+
+    def input_hashes(self, name):
+        return {path: self.file_hash(path) for path in self.targets[name].inputs}
+
+    def is_stale(self, name):
+        target = self.targets[name]
+        if any(not os.path.exists(os.path.join(ROOT_DIR, o)) for o in target.outputs):
+            return True
+        return self.state.get(name) != self.input_hashes(name)
+
+    def descendants(self, names):
+        seen, stack = set(), list(names)
+        while stack:
+            for child in self.children[stack.pop()]:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return seen
+
+    def select(self, names=None):
+        """The requested targets plus everything they depend on"""
+        if not names:
+            return set(self.targets)
+        selected, stack = set(), list(names)
+        while stack:
+            name = stack.pop()
+            if name not in selected:
+                selected.add(name)
+                stack.extend(self.deps[name])
+        return selected
+
+    def _run(self, name):
+        target = self.targets[name]
+        env = None
+        if self.metrics_dir:
+            env = dict(os.environ, **{metrics.METRICS_DIR_ENV: os.path.join(self.metrics_dir, name)})
+        start = time.perf_counter()
+        result = subprocess.run(target.command(), cwd=os.path.join(ROOT_DIR, target.cwd), env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        return result.returncode, result.stdout, time.perf_counter() - start
+
+    def build(self, names=None, jobs=None, force=False, dry_run=False):
+        """Rebuild stale targets, running independent ones in parallel.
+
+        A target is checked for staleness only once its dependencies have
+        finished, so a rebuild that reproduces identical outputs does not
+        cascade. Returns {name: 'built' | 'fresh' | 'failed' | 'skipped'}.
+        """
+        selected = self.select(names)
+        pending = [n for n in self.order if n in selected]
+        status, elapsed_by_target = {}, {}
+
+        if dry_run:
+            stale = {n for n in pending if force or self.is_stale(n)}
+            stale |= self.descendants(stale) & selected
+            for name in pending:
+                print(f"  {'rebuild' if name in stale else 'fresh  '}  {name}")
+            return {n: 'stale' if n in stale else 'fresh' for n in pending}
+
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+            running = {}
+            while pending or running:
+                for name in list(pending):
+                    deps = self.deps[name]
+                    if any(status.get(d) in ('failed', 'skipped') for d in deps):
+                        status[name] = 'skipped'
+                        pending.remove(name)
+                        print(f"  skipped  {name} (dependency failed)")
+                    elif all(d in status for d in deps):
+                        pending.remove(name)
+                        if force or self.is_stale(name):
+                            print(f"  building {name}")
+                            running[pool.submit(self._run, name)] = name
+                        else:
+                            status[name] = 'fresh'
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    code, output, elapsed = future.result()
+                    if code == 0:
+                        status[name] = 'built'
+                        elapsed_by_target[name] = elapsed
+                        self.state[name] = self.input_hashes(name)
+                        self._save_state()
+                        print(f"  built    {name} ({elapsed:.1f}s)")
+                    else:
+                        status[name] = 'failed'
+                        self.state.pop(name, None)
+                        self._save_state()
+                        print(f"  FAILED   {name} (exit {code})\n" + '\n'.join(
+                            '      ' + line for line in output.strip().splitlines()[-10:]))
+        if all(s == 'fresh' for s in status.values()):
+            print("  Everything is up to date.")
+        elif self.metrics_dir:
+            self.merge_metrics(elapsed_by_target)
+        return status
+
+    def merge_metrics(self, elapsed_by_target):
+        """Combine the snapshots the built targets exported, plus the build time of each PDF target"""
+        paths = [os.path.join(self.metrics_dir, name, metrics.JSON_FILE) for name in elapsed_by_target]
+        snapshots = [metrics.load_snapshot(path) for path in paths if os.path.exists(path)]
+        exported = len(snapshots)
+        # A registry per build, so repeated builds in watch mode do not accumulate
+        registry = metrics.Registry()
+        pdf_seconds = registry.histogram(metrics.PDF_SECONDS.name, metrics.PDF_SECONDS.help,
+                                         metrics.PDF_SECONDS.labelnames)
+        for name, elapsed in elapsed_by_target.items():
+            if any(output.endswith('.pdf') for output in self.targets[name].outputs):
+                pdf_seconds.labels(name.removesuffix('_pdf')).observe(elapsed)
+        if pdf_seconds.children:
+            snapshots.append(registry.snapshot())
+        if snapshots:
+            metrics.write_snapshot(self.metrics_dir, snapshot=metrics.merge_snapshots(snapshots))
+            print(f"  Metrics from {exported} target(s) written to "
+                  f"{os.path.join(self.metrics_dir, metrics.PROMETHEUS_FILE)}")
+
+    def watch(self, names=None, jobs=None, interval=1.0):
+        """Poll the source files and rebuild stale targets after each change"""
+        watched = sorted({i for n in self.select(names) for i in self.targets[n].inputs if i in self.sources})
+        print(f"Watching {len(watched)} source files (Ctrl+C to stop)")
+        self.build(names, jobs)
+        snapshot = {p: self.file_hash(p) for p in watched}
+        try:
+            while True:
+                time.sleep(interval)
+                current = {p: self.file_hash(p) for p in watched}
+                changed = [p for p in watched if current[p] != snapshot[p]]
+                if changed:
+                    print(f"\nChanged: {', '.join(changed)}")
+                    self.build(names, jobs)
+                    snapshot = current
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+
+    def describe(self):
+        for name in self.order:
+            deps = ', '.join(self.deps[name]) or '-'
+            print(f"  {name:<24} <- {deps}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build charts and reports from their dependency graph.')
+    parser.add_argument('targets', nargs='*', help='Targets to build with their dependencies (default: all)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Parallel jobs (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if up to date')
+    parser.add_argument('--dry-run', action='store_true', help='Show what would be rebuilt')
+    parser.add_argument('--watch', action='store_true', help='Rebuild whenever a source file changes')
+    parser.add_argument('--interval', type=float, default=1.0, help='Watch polling interval in seconds')
+    parser.add_argument('--graph', action='store_true', help='Print the dependency graph')
+    parser.add_argument('--metrics', metavar='DIR', nargs='?', const=metrics.DEFAULT_METRICS_DIR,
+                        help=f"Collect metrics from rebuilt targets into DIR (default: {metrics.DEFAULT_METRICS_DIR})")
+    args = parser.parse_args()
+
+    graph = BuildGraph(metrics_dir=args.metrics)
+    unknown = set(args.targets) - set(graph.targets)
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(sorted(unknown))}")
+
+    if args.graph:
+        graph.describe()
+    elif args.watch:
+        graph.watch(args.targets, args.jobs, args.interval)
+    else:
+        status = graph.build(args.targets, args.jobs, args.force, args.dry_run)
+        if 'failed' in status.values():
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Roster Index Builder
+LoL Champion Recommender System
+Splits the roster into a compact index holding only what scoring needs (id,
+name, role, range type, positions, difficulty, numeric attributes) and one
+detail shard per champion (title, tags, counters, guides, tips). The index
+role is the champion's herotype; the roster's own role field is 'Fighter'
+for everyone. build_data_bundles.py bundles the index; the pages still load
+champions.json and the counters, guides and tips files directly
+"""
+
+from build_data_bundles import canonical_bytes, content_hash, write_bytes
+from champion_data import (ATTRIBUTES, CHAMPIONS_PATH, DATA_DIR, load_champion_details,
+                           load_champions, parse_set_literal)
+import argparse
+import json
+import os
+import re
+
+DEFAULT_OUTPUT_DIR = os.path.join(DATA_DIR, 'roster')
+INDEX_NAME = 'index.json'
+DETAILS_DIR = 'details'
+
+# Row layout of the index; clients zip these names with each row
+INDEX_COLUMNS = ['id', 'name', 'role', 'range_type', 'positions', 'difficulty', 'attributes', 'detail']
+
+
+def index_row(champion, detail_hash):
+    attributes = champion.get('attributes', {})
+    return [
+        champion['id'],
+        champion['name'],
+        champion.get('herotype') or 'Unknown',
+        champion.get('range_type') or 'Unknown',
+        parse_set_literal(champion.get('position')),
+        champion.get('difficulty'),
+        [attributes.get(name) for name in ATTRIBUTES],
+        detail_hash,
+    ]
+
+
+def detail_shard(champion, details):
+    """Everything about one champion the questionnaire does not need"""
+    shard = {
+        'id': champion['id'],
+        'name': champion['name'],
+        'title': champion.get('title'),
+        'tags': champion.get('tags', []),
+    }
+    for key, entries in details.items():
+        if champion['id'] in entries:
+            shard[key] = entries[champion['id']]
+    return shard
+
+
+def build_index(champions, details, output_dir=DEFAULT_OUTPUT_DIR):
+    """Write index.json and the detail shards; returns (index bytes, shard bytes, shards written)"""
+    details_dir = os.path.join(output_dir, DETAILS_DIR)
+    os.makedirs(details_dir, exist_ok=True)
+
+    rows, keep, shard_bytes, written = [], set(), 0, 0
+    for champion in sorted(champions, key=lambda c: c['id']):
+        payload = canonical_bytes(detail_shard(champion, details))
+        digest = content_hash(payload)
+        filename = f"{champion['id']}.{digest}.json"
+        keep.add(filename)
+        written += write_bytes(os.path.join(details_dir, filename), payload)
+        shard_bytes += len(payload)
+        rows.append(index_row(champion, digest))
+
+    # Shards of champions that changed or left the roster
+    pattern = re.compile(r'^.+\.[0-9a-f]+\.json$')
+    for filename in os.listdir(details_dir):
+        if pattern.match(filename) and filename not in keep:
+            os.remove(os.path.join(details_dir, filename))
+
+    index = {
+        'columns': INDEX_COLUMNS,
+        'attributes': list(ATTRIBUTES),
+        'details': f'{DETAILS_DIR}/{{id}}.{{detail}}.json',
+        'champions': rows,
+    }
+    index_payload = canonical_bytes(index)
+    write_bytes(os.path.join(output_dir, INDEX_NAME), index_payload)
+    return len(index_payload), shard_bytes, written
+
+
+def update_index(champions, details, changed_ids, output_dir=DEFAULT_OUTPUT_DIR):
+    """Rewrite only the shards of changed_ids and drop shards of champions no longer in the roster.
+
+    Unchanged champions keep the detail hash already recorded in index.json,
+    so their shards are neither serialized nor hashed again. Returns the
+    number of shards written.
+    """
+    details_dir = os.path.join(output_dir, DETAILS_DIR)
+    with open(os.path.join(output_dir, INDEX_NAME), 'r', encoding='utf-8') as f:
+        existing = json.load(f)
+    if existing.get('columns') != INDEX_COLUMNS:
+        # Written by an older layout: every row and shard changes
+        return build_index(champions, details, output_dir)[2]
+    detail_column = existing['columns'].index('detail')
+    hashes = {row[0]: row[detail_column] for row in existing['champions']}
+
+    written = 0
+    for champion in champions:
+        if champion['id'] in changed_ids or champion['id'] not in hashes:
+            payload = canonical_bytes(detail_shard(champion, details))
+            hashes[champion['id']] = content_hash(payload)
+            written += write_bytes(os.path.join(details_dir, f"{champion['id']}.{hashes[champion['id']]}.json"),
+                                   payload)
+
+    roster_ids = {c['id'] for c in champions}
+    pattern = re.compile(r'^(.+)\.([0-9a-f]+)\.json$')
+    for filename in os.listdir(details_dir):
+        match = pattern.match(filename)
+        if match and (match.group(1) not in roster_ids or hashes.get(match.group(1)) != match.group(2)):
+            os.remove(os.path.join(details_dir, filename))
+
+    existing['champions'] = [index_row(c, hashes[c['id']]) for c in sorted(champions, key=lambda c: c['id'])]
+    write_bytes(os.path.join(output_dir, INDEX_NAME), canonical_bytes(existing))
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the compact roster index and per-champion detail shards.')
+    parser.add_argument('--roster', default=CHAMPIONS_PATH)
+    parser.add_argument('--data-dir', default=DATA_DIR, help='Directory with the counters/guides/tips files')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args()
+
+    champions = load_champions(args.roster)
+    details = load_champion_details(args.data_dir)
+    index_bytes, shard_bytes, written = build_index(champions, details, args.output_dir)
+
+    print(f"Index: {len(champions)} champions, {index_bytes / 1024:.1f} KB "
+          f"({os.path.join(args.output_dir, INDEX_NAME)})")
+    print(f"Detail shards: {shard_bytes / 1024:.1f} KB total, {written} written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Champion Similarity Index Builder
+LoL Champion Recommender System
+Precomputes each champion's most similar champions from the numeric
+attributes plus herotype, position and range encodings. Similarity is the
+cosine of weighted feature vectors; the matrix is computed in row x column
+blocks with a running top-N per row, so memory stays bounded by the block
+size even for synthetic rosters of millions. Only the neighbor lists are
+kept, as two .npy arrays that load by memory map:
+
+    neighbors.ids.npy     int32   (champions x N) row numbers, best first
+    neighbors.scores.npy  float16 (champions x N) cosine similarity
+    neighbors.json        champion ids in row order and the build settings
+"""
+
+from champion_data import ATTRIBUTES, CHAMPIONS_PATH, DATA_DIR, load_champions, parse_set_literal
+import argparse
+import json
+import os
+import time
+import numpy as np
+
+DEFAULT_OUTPUT_DIR = os.path.join(DATA_DIR, 'roster')
+PREFIX = 'neighbors'
+DEFAULT_TOP = 10
+DEFAULT_BLOCK = 2048
+
+# Relative weight of each feature group in the similarity
+FEATURE_WEIGHTS = {'attributes': 1.0, 'herotype': 1.0, 'positions': 0.7, 'range_type': 0.5}
+
+
+def one_hot(codes, size):
+    matrix = np.zeros((len(codes), size), dtype=np.float32)
+    matrix[np.arange(len(codes)), codes] = 1
+    return matrix
+
+
+def feature_matrix(attributes, herotype, positions, range_type, vocab_sizes):
+    """Row-normalized weighted features; each group is scaled to unit norm before weighting"""
+    groups = {
+        # Attributes are 1-3; centre them so "all average" is not similar to everything
+        'attributes': (attributes.astype(np.float32) - 2.0),
+        'herotype': one_hot(herotype, vocab_sizes['herotype']),
+        'positions': ((positions[:, None] >> np.arange(vocab_sizes['positions'])) & 1).astype(np.float32),
+        'range_type': one_hot(range_type, vocab_sizes['range_type']),
+    }
+    blocks = []
+    for name, values in groups.items():
+        norms = np.linalg.norm(values, axis=1, keepdims=True)
+        blocks.append(FEATURE_WEIGHTS[name] * values / np.maximum(norms, 1e-9))
+    features = np.hstack(blocks)
+    return features / np.maximum(np.linalg.norm(features, axis=1, keepdims=True), 1e-9)
+
+
+def roster_features(champions):
+    vocab = {
+        'herotype': sorted({c.get('herotype') or 'Unknown' for c in champions}),
+        'range_type': sorted({c.get('range_type') or 'Unknown' for c in champions}),
+        'positions': sorted({p for c in champions for p in parse_set_literal(c.get('position'))}),
+    }
+    bit = {p: 1 << i for i, p in enumerate(vocab['positions'])}
+    attributes = np.array([[c.get('attributes', {}).get(a, 2.0) for a in ATTRIBUTES + ('difficulty',)]
+                           for c in champions])
+    herotype = np.array([vocab['herotype'].index(c.get('herotype') or 'Unknown') for c in champions])
+    range_type = np.array([vocab['range_type'].index(c.get('range_type') or 'Unknown') for c in champions])
+    positions = np.array([sum(bit[p] for p in parse_set_literal(c.get('position'))) for c in champions],
+                         dtype=np.int64)
+    sizes = {key: len(values) for key, values in vocab.items()}
+    return [c['id'] for c in champions], feature_matrix(attributes, herotype, positions, range_type, sizes)
+
+
+def synthetic_features(directory):
+    """Features for a columnar roster written by generate_synthetic_data.py"""
+    with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    column = lambda name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+    attributes = np.stack([column(a) for a in ATTRIBUTES + ('difficulty',)], axis=1)
+    sizes = {key: len(meta['vocabularies'][key]) for key in ('herotype', 'range_type', 'positions')}
+    features = feature_matrix(attributes, np.asarray(column('herotype')), np.asarray(column('positions'), dtype=np.int64),
+                              np.asarray(column('range_type')), sizes)
+    return [f"synthetic-{i}" for i in range(meta['rows'])], features
+
+
+def top_neighbors(features, top=DEFAULT_TOP, block=DEFAULT_BLOCK):
+    """(ids int32, scores float16) of each row's `top` most similar other rows.
+
+    Works on block x block tiles, merging each tile into a running top-N, so
+    peak memory is O(block * (block + top)) regardless of the roster size.
+    """
+    n = len(features)
+    top = min(top, n - 1)
+    ids = np.empty((n, top), dtype=np.int32)
+    scores = np.empty((n, top), dtype=np.float16)
+    for row_start in range(0, n, block):
+        rows = features[row_start:row_start + block]
+        best_scores = np.full((len(rows), top), -np.inf, dtype=np.float32)
+        best_ids = np.zeros((len(rows), top), dtype=np.int64)
+        for col_start in range(0, n, block):
+            tile = rows @ features[col_start:col_start + block].T
+            if col_start == row_start:
+                np.fill_diagonal(tile, -np.inf)
+            candidates = np.hstack([best_scores, tile])
+            candidate_ids = np.hstack([best_ids, np.broadcast_to(np.arange(col_start, col_start + tile.shape[1]),
+                                                                 tile.shape)])
+            keep = np.argpartition(-candidates, top - 1, axis=1)[:, :top]
+            best_scores = np.take_along_axis(candidates, keep, axis=1)
+            best_ids = np.take_along_axis(candidate_ids, keep, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        ids[row_start:row_start + len(rows)] = np.take_along_axis(best_ids, order, axis=1)
+        scores[row_start:row_start + len(rows)] = np.take_along_axis(best_scores, order, axis=1)
+    return ids, scores
+
+
+def write_index(output_dir, champion_ids, ids, scores, source):
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, f"{PREFIX}.ids.npy"), ids)
+    np.save(os.path.join(output_dir, f"{PREFIX}.scores.npy"), scores)
+    meta = {'source': source, 'top': ids.shape[1], 'feature_weights': FEATURE_WEIGHTS,
+            'champions': champion_ids if len(champion_ids) <= 100_000 else None}
+    with open(os.path.join(output_dir, f"{PREFIX}.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, separators=(',', ':'))
+
+
+class NeighborIndex:
+    """Memory-mapped neighbor lists; a lookup reads one row of each array"""
+
+    def __init__(self, directory=DEFAULT_OUTPUT_DIR):
+        self.ids = np.load(os.path.join(directory, f"{PREFIX}.ids.npy"), mmap_mode='r')
+        self.scores = np.load(os.path.join(directory, f"{PREFIX}.scores.npy"), mmap_mode='r')
+        with open(os.path.join(directory, f"{PREFIX}.json"), 'r', encoding='utf-8') as f:
+            self.champions = json.load(f)['champions']
+        self.rows = {champion_id: i for i, champion_id in enumerate(self.champions or [])}
+
+    def neighbors(self, champion, k=None):
+        """[(champion id or row, score)] for a champion id or row number"""
+        row = self.rows[champion] if isinstance(champion, str) else champion
+        ids, scores = self.ids[row, :k], self.scores[row, :k]
+        label = (lambda i: self.champions[i]) if self.champions else int
+        return [(label(i), float(s)) for i, s in zip(ids, scores)]
+
+
+def verify(features, ids, scores, sample=200):
+    """Compare sampled rows against a brute-force ranking; returns the number of mismatched rows"""
+    rows = np.random.default_rng(0).choice(len(features), min(sample, len(features)), replace=False)
+    mismatches = 0
+    for row in rows:
+        exact = features @ features[row]
+        exact[row] = -np.inf
+        kth = np.sort(exact)[-ids.shape[1]]
+        # Ties at the cut-off may be broken either way; every kept score must reach it
+        if not np.all(exact[ids[row]] >= kth - 1e-3) or not np.allclose(scores[row], exact[ids[row]], atol=2e-3):
+            mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute top-N champion similarity neighbor lists.')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='Neighbors kept per champion')
+    parser.add_argument('--block', type=int, default=DEFAULT_BLOCK, help='Tile size of the blockwise product')
+    parser.add_argument('--roster', default=CHAMPIONS_PATH)
+    parser.add_argument('--synthetic', metavar='DIR', help='Use a columnar roster from generate_synthetic_data.py')
+    parser.add_argument('--output-dir', default=None, help=f"Default: {DEFAULT_OUTPUT_DIR} (or DIR for --synthetic)")
+    parser.add_argument('--verify', action='store_true', help='Check sampled rows against brute force')
+    parser.add_argument('--show', nargs='*', metavar='ID', help='Print the neighbors of these champions')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        champion_ids, features = synthetic_features(args.synthetic)
+        source, output_dir = args.synthetic, args.output_dir or args.synthetic
+    else:
+        champion_ids, features = roster_features(load_champions(args.roster))
+        source, output_dir = args.roster, args.output_dir or DEFAULT_OUTPUT_DIR
+    if len(champion_ids) < 2:
+        parser.error("need at least two champions")
+
+    start = time.perf_counter()
+    ids, scores = top_neighbors(features, args.top, args.block)
+    elapsed = time.perf_counter() - start
+    write_index(output_dir, champion_ids, ids, scores, source)
+    print(f"Wrote top-{ids.shape[1]} neighbors for {len(champion_ids):,} champions to {output_dir} "
+          f"in {elapsed:.2f}s ({(ids.nbytes + scores.nbytes) / 1024:.1f} KB; full float32 matrix would be "
+          f"{len(champion_ids) ** 2 * 4 / 1024:,.0f} KB)")
+
+    if args.verify:
+        mismatches = verify(features, ids, scores)
+        print(f"Verification: {mismatches} mismatched rows in sample")
+        if mismatches:
+            raise SystemExit(1)
+
+    if args.show is not None:
+        index = NeighborIndex(output_dir)
+        for champion in args.show or champion_ids[:3]:
+            if index.champions and champion not in index.rows:
+                parser.error(f"unknown champion: {champion}")
+            row = champion if index.champions else int(champion.rsplit('-', 1)[-1])
+            pairs = ', '.join(f"{c} ({s:.2f})" for c, s in index.neighbors(row, 5))
+            print(f"  {champion}: {pairs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Champion Data Helpers
+LoL Champion Recommender System
+Shared loaders for the roster and per-champion detail files in src/data
+"""
+
+import ast
+import csv
+import json
+import os
+import re
+
+DATA_DIR = os.path.join('src', 'data')
+CHAMPIONS_PATH = os.path.join(DATA_DIR, 'champions.json')
+# Archived source dataset with resource, release date, damage type and ability names
+CSV_PATH = os.path.join('docs-archive', 'LoL_champion_data.csv')
+# Numeric 1-3 attributes every champion record carries (difficulty is kept separately)
+ATTRIBUTES = ('damage', 'toughness', 'control', 'mobility', 'utility')
+DETAIL_FILES = {
+    'counters': 'champion_counters.json',
+    'guides': 'champion_guides.json',
+    'tips': 'champion_tips.json',
+}
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_champions(path=CHAMPIONS_PATH):
+    """Return the list of champion records from a champions.json style file.
+
+    A path of the form @VERSION reads that version from the roster snapshot
+    store instead (see roster_snapshots.py).
+    """
+    if path.startswith('@'):
+        from roster_snapshots import load_version
+        return load_version(path[1:])
+    data = load_json(path)
+    return data.get('champions', []) if isinstance(data, dict) else data
+
+
+def load_champion_details(data_dir=DATA_DIR):
+    """Return {'counters': {...}, 'guides': {...}, 'tips': {...}} keyed by champion id"""
+    details = {}
+    for key, filename in DETAIL_FILES.items():
+        path = os.path.join(data_dir, filename)
+        details[key] = load_json(path) if os.path.exists(path) else {}
+    return details
+
+
+def parse_set_literal(value):
+    """Parse the "{'Middle', 'Top'}" strings used for positions into a sorted list"""
+    if isinstance(value, (list, tuple, set)):
+        return sorted(value)
+    if not value:
+        return []
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return [value]
+    if isinstance(parsed, (set, list, tuple)):
+        return sorted(str(v) for v in parsed)
+    return [str(parsed)]
+
+
+def name_key(name):
+    """Case- and punctuation-insensitive key for matching champion names across sources"""
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+def load_champion_csv(path=CSV_PATH):
+    """Return {name_key: row} from the archived champion CSV, or {} if it is missing"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline='', encoding='utf-8') as f:
+        return {name_key(row['Champion_name']): row for row in csv.DictReader(f)}
@@ -0,0 +1,322 @@
+"""
+Champion Dossier Generator
+LoL Champion Recommender System
+Writes a printable dossier for every champion, combining champions.json with
+the counter, guide and tip files. Pages are streamed to disk as soon as they
+are laid out, so memory stays flat no matter how large the roster is; the
+fonts and the page header/footer template are written once per file and
+shared by every page. Large rosters are split into shards rendered in parallel.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from array import array
+from champion_data import CHAMPIONS_PATH, DATA_DIR, load_champion_details, load_champions, parse_set_literal
+import argparse
+import os
+import time
+import zlib
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US Letter in points
+MARGIN = 54
+CONTENT_TOP = PAGE_HEIGHT - 96
+CONTENT_BOTTOM = 60
+
+# Resource names used in content streams -> base font
+FONTS = {'F1': 'Helvetica', 'F2': 'Helvetica-Bold', 'F3': 'Helvetica-Oblique'}
+
+ATTRIBUTE_COLORS = {
+    'damage': (0.91, 0.30, 0.24),
+    'toughness': (0.20, 0.60, 0.86),
+    'control': (0.61, 0.35, 0.71),
+    'mobility': (0.10, 0.74, 0.61),
+    'utility': (0.95, 0.77, 0.06),
+}
+
+
+def pdf_string(text):
+    """Encode text as a PDF literal string in WinAnsi (cp1252)"""
+    raw = text.encode('cp1252', errors='replace')
+    return b'(' + raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+class StreamingPDFWriter:
+    """Minimal PDF writer that appends each page to the file as it is added.
+
+    Only object offsets and page ids are kept in memory (a few bytes per
+    page), so files with thousands of pages are written in constant memory.
+    """
+
+    def __init__(self, path, template_ops=b'', compress=True):
+        self.path = path
+        self.compress = compress
+        self.file = open(path, 'wb')
+        self.offsets = array('Q', [0])
+        self.page_ids = array('I')
+        self.file.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+        # Object 1 is the catalog and 2 the page tree, written at close()
+        self.offsets.extend([0, 0])
+        font_ids = {name: self._write_object(
+            f'<< /Type /Font /Subtype /Type1 /BaseFont /{base} /Encoding /WinAnsiEncoding >>'.encode())
+            for name, base in FONTS.items()}
+        fonts = b'/Font << ' + b' '.join(f'/{n} {i} 0 R'.encode() for n, i in font_ids.items()) + b' >>'
+        template_id = self._write_stream(
+            template_ops,
+            b'/Type /XObject /Subtype /Form /BBox [0 0 %d %d] /Resources << %s >>' % (PAGE_WIDTH, PAGE_HEIGHT, fonts))
+        self.resources_id = self._write_object(b'<< %s /XObject << /Tpl %d 0 R >> >>' % (fonts, template_id))
+
+    def _write_object(self, body, obj_id=None):
+        if obj_id is None:
+            obj_id = len(self.offsets)
+            self.offsets.append(0)
+        self.offsets[obj_id] = self.file.tell()
+        self.file.write(b'%d 0 obj\n' % obj_id + body + b'\nendobj\n')
+        return obj_id
+
+    def _write_stream(self, data, extra=b''):
+        if self.compress:
+            data = zlib.compress(data, 6)
+            extra += b' /Filter /FlateDecode'
+        return self._write_object(b'<< %s /Length %d >>\nstream\n' % (extra, len(data)) + data + b'\nendstream')
+
+    def add_page(self, ops):
+        """Write one page whose content stream draws the shared template plus ops"""
+        content_id = self._write_stream(b'q /Tpl Do Q\n' + ops)
+        page_id = self._write_object(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources %d 0 R /Contents %d 0 R >>'
+            % (PAGE_WIDTH, PAGE_HEIGHT, self.resources_id, content_id))
+        self.page_ids.append(page_id)
+
+    @property
+    def page_count(self):
+        return len(self.page_ids)
+
+    def close(self):
+        kids = b' '.join(b'%d 0 R' % i for i in self.page_ids)
+        self._write_object(b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self.page_ids)), 2)
+        self._write_object(b'<< /Type /Catalog /Pages 2 0 R >>', 1)
+
+        xref_offset = self.file.tell()
+        self.file.write(b'xref\n0 %d\n0000000000 65535 f \n' % len(self.offsets))
+        for offset in self.offsets[1:]:
+            self.file.write(b'%010d 00000 n \n' % offset)
+        self.file.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                        % (len(self.offsets), xref_offset))
+        self.file.close()
+
+
+class PageBuilder:
+    """Accumulates drawing operators for the page currently being laid out"""
+
+    def __init__(self):
+        self.ops = []
+
+    def text(self, x, y, text, font='F1', size=10, color=(0, 0, 0)):
+        self.ops.append(b'BT %.3f %.3f %.3f rg /%s %.1f Tf %.2f %.2f Td %s Tj ET'
+                        % (*color, font.encode(), size, x, y, pdf_string(text)))
+
+    def rect(self, x, y, w, h, color):
+        self.ops.append(b'%.3f %.3f %.3f rg %.2f %.2f %.2f %.2f re f' % (*color, x, y, w, h))
+
+    def line(self, x1, y1, x2, y2, gray=0.75):
+        self.ops.append(b'%.2f G 0.5 w %.2f %.2f m %.2f %.2f l S' % (gray, x1, y1, x2, y2))
+
+    def render(self):
+        return b'\n'.join(self.ops)
+
+
+def page_template():
+    """Header band and footer rule shared by every dossier page"""
+    page = PageBuilder()
+    page.rect(0, PAGE_HEIGHT - 60, PAGE_WIDTH, 60, (0.17, 0.24, 0.31))
+    page.text(MARGIN, PAGE_HEIGHT - 38, 'League of Legends Champion Dossier', 'F2', 14, (1, 1, 1))
+    page.line(MARGIN, 45, PAGE_WIDTH - MARGIN, 45)
+    page.text(MARGIN, 30, 'LoL Champion Recommender System', 'F3', 8, (0.5, 0.5, 0.5))
+    return page.render()
+
+
+def wrap_text(text, font, size, width):
+    """Greedy word wrap using the standard font metrics"""
+    base = FONTS[font]
+    lines, current = [], ''
+    for word in text.split():
+        candidate = f'{current} {word}' if current else word
+        if current and stringWidth(candidate, base, size) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines
+
+
+class DossierRenderer:
+    """Lays out champion dossiers top-to-bottom, flushing each full page to the writer"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.page = None
+        self.y = CONTENT_TOP
+        self.champion_name = ''
+        self.pages_in_dossier = 0
+
+    def _flush(self):
+        if self.page is not None:
+            footer = f'{self.champion_name} - page {self.pages_in_dossier}'
+            x = PAGE_WIDTH - MARGIN - stringWidth(footer, FONTS['F1'], 8)
+            self.page.text(x, 30, footer, 'F1', 8, (0.5, 0.5, 0.5))
+            self.writer.add_page(self.page.render())
+            self.page = None
+
+    def _new_page(self):
+        self._flush()
+        self.page = PageBuilder()
+        self.pages_in_dossier += 1
+        self.y = CONTENT_TOP
+
+    def _ensure_space(self, height):
+        if self.y - height < CONTENT_BOTTOM:
+            self._new_page()
+            self.page.text(MARGIN, self.y, f'{self.champion_name} (continued)', 'F3', 10, (0.4, 0.4, 0.4))
+            self.y -= 20
+
+    def heading(self, text):
+        self._ensure_space(34)
+        self.y -= 10
+        self.page.text(MARGIN, self.y, text, 'F2', 13, (0.16, 0.50, 0.73))
+        self.y -= 6
+        self.page.line(MARGIN, self.y, PAGE_WIDTH - MARGIN, self.y)
+        self.y -= 16
+
+    def paragraph(self, text, font='F1', size=10, indent=0, bullet=False):
+        width = PAGE_WIDTH - 2 * MARGIN - indent - (10 if bullet else 0)
+        leading = size * 1.35
+        for i, line in enumerate(wrap_text(text, font, size, width)):
+            self._ensure_space(leading)
+            x = MARGIN + indent
+            if bullet:
+                if i == 0:
+                    self.page.text(x, self.y, '-', font, size)
+                x += 10
+            self.page.text(x, self.y, line, font, size)
+            self.y -= leading
+
+    def render(self, champion, counters, guides, tips):
+        name = champion.get('name', champion.get('id', 'Unknown'))
+        self.champion_name = name
+        self.pages_in_dossier = 0
+        self._new_page()
+
+        self.page.text(MARGIN, self.y, name, 'F2', 24)
+        self.y -= 20
+        self.page.text(MARGIN, self.y, champion.get('title', ''), 'F3', 12, (0.4, 0.4, 0.4))
+        self.y -= 28
+
+        facts = [
+            ('Role', champion.get('role', '-')),
+            ('Hero type', champion.get('herotype', '-')),
+            ('Range', champion.get('range_type', '-')),
+            ('Positions', ', '.join(parse_set_literal(champion.get('position'))) or '-'),
+            ('Difficulty', f"{champion.get('difficulty', '-')} / 3"),
+        ]
+        for label, value in facts:
+            self.page.text(MARGIN, self.y, f'{label}:', 'F2', 10)
+            self.page.text(MARGIN + 80, self.y, str(value), 'F1', 10)
+            self.y -= 15
+
+        self.heading('Attributes')
+        attributes = champion.get('attributes', {})
+        for attr, color in ATTRIBUTE_COLORS.items():
+            value = float(attributes.get(attr, 0))
+            self._ensure_space(18)
+            self.page.text(MARGIN, self.y, attr.capitalize(), 'F1', 10)
+            self.page.rect(MARGIN + 80, self.y - 2, 300, 10, (0.92, 0.92, 0.92))
+            self.page.rect(MARGIN + 80, self.y - 2, 300 * min(value, 3.0) / 3.0, 10, color)
+            self.page.text(MARGIN + 390, self.y, f'{value:.1f}', 'F1', 10)
+            self.y -= 18
+
+        self.heading('Matchups')
+        if counters:
+            for label, key in [('Strong against', 'strong_against'), ('Weak against', 'weak_against'),
+                               ('Synergizes with', 'synergizes_with')]:
+                self.paragraph(f"{label}: {', '.join(counters.get(key, [])) or '-'}")
+        else:
+            self.paragraph('No matchup data recorded yet.', 'F3')
+
+        self.heading('Guides & Videos')
+        entries = (guides or {}).get('guides', []) + (guides or {}).get('videos', [])
+        for entry in entries:
+            self.paragraph(entry.get('title', ''), 'F2', 10, bullet=True)
+            self.paragraph(entry.get('description', ''), indent=10)
+            self.paragraph(entry.get('url', ''), 'F3', 8, indent=10)
+        if not entries:
+            self.paragraph('No guides recorded yet.', 'F3')
+
+        self.heading('Tips')
+        for tip in tips or []:
+            self.paragraph(tip, bullet=True)
+        if not tips:
+            self.paragraph('No tips recorded yet.', 'F3')
+
+        self._flush()
+
+
+def render_shard(task):
+    """Render one shard of champions to its own PDF; returns (path, champions, pages)"""
+    path, champions, details = task
+    writer = StreamingPDFWriter(path, page_template())
+    renderer = DossierRenderer(writer)
+    for champion in champions:
+        cid = champion.get('id')
+        renderer.render(champion, details['counters'].get(cid), details['guides'].get(cid), details['tips'].get(cid))
+    writer.close()
+    return path, len(champions), writer.page_count
+
+
+def generate_dossiers(champions, details, output_dir='dossiers', shard_size=500, workers=None):
+    """Render all dossiers into output_dir/dossiers_NNNN.pdf shards"""
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = []
+    for index, start in enumerate(range(0, len(champions), shard_size)):
+        shard = champions[start:start + shard_size]
+        ids = {c.get('id') for c in shard}
+        shard_details = {k: {cid: v for cid, v in d.items() if cid in ids} for k, d in details.items()}
+        tasks.append((os.path.join(output_dir, f'dossiers_{index:04d}.pdf'), shard, shard_details))
+
+    start_time = time.perf_counter()
+    if workers == 1 or len(tasks) == 1:
+        results = [render_shard(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(render_shard, tasks))
+    elapsed = time.perf_counter() - start_time
+
+    pages = sum(r[2] for r in results)
+    for path, count, shard_pages in results:
+        print(f"  {path}: {count} champions, {shard_pages} pages")
+    print(f"\nDossiers: {len(champions)} champions, {pages} pages in {len(results)} file(s)")
+    print(f"Elapsed:  {elapsed:.2f}s ({pages / elapsed if elapsed else 0:.0f} pages/sec)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate per-champion dossier PDFs.')
+    parser.add_argument('--roster', default=CHAMPIONS_PATH, help='champions.json style roster file')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='Directory with counter/guide/tip files')
+    parser.add_argument('--output-dir', default='dossiers')
+    parser.add_argument('--shard-size', type=int, default=500, help='Champions per output file')
+    parser.add_argument('--workers', type=int, default=None, help='Process pool size (default: CPU count)')
+    args = parser.parse_args()
+
+    champions = load_champions(args.roster)
+    if not champions:
+        print("No champion data found.")
+        return
+    generate_dossiers(champions, load_champion_details(args.data_dir), args.output_dir,
+                      args.shard_size, args.workers)
+
+
+if __name__ == "__main__":
+    main()
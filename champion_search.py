@@ -0,0 +1,347 @@
+"""
+Champion Search Index
+LoL Champion Recommender System
+Full-text search over champion names, titles, ability names (from the
+archived CSV), guides and tips. Builds a field-weighted inverted index once
+per roster version, persists it, and answers ranked keyword queries (BM25)
+with prefix completion of the last word through a character trie built from
+the index's vocabulary on load. When one champion's text changes, only that
+champion's postings are replaced
+"""
+
+from champion_data import (CHAMPIONS_PATH, CSV_PATH, DATA_DIR, load_champion_csv, load_champion_details,
+                           load_champions, name_key)
+from collections import Counter
+import argparse
+import ast
+import hashlib
+import json
+import math
+import os
+import re
+import time
+
+import metrics
+
+DEFAULT_OUTPUT = os.path.join(DATA_DIR, 'search_index.json')
+FORMAT_VERSION = 1
+
+# Term frequency in each field is multiplied by its weight before scoring
+FIELD_WEIGHTS = {'name': 4.0, 'title': 2.0, 'abilities': 2.0, 'guides': 1.0, 'tips': 1.0}
+ABILITY_COLUMNS = ('Passive', 'Q', 'W', 'E', 'Ultimate')
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_PREFIX_TERMS = 20
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+INDEX_LOADS = metrics.counter('search_index_loads_total', 'Search index loads by whether the cache was current',
+                              labels=('result',))
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower().replace("'", ''))
+
+
+def ability_names(row):
+    """Ability names from the CSV's "{1: 'Name', 2: 'Name 2'}" cells"""
+    names = []
+    for column in ABILITY_COLUMNS:
+        try:
+            value = ast.literal_eval(row.get(column) or '{}')
+        except (ValueError, SyntaxError):
+            value = {}
+        names.extend(str(v) for v in (value.values() if isinstance(value, dict) else [value]))
+    return names
+
+
+def champion_fields(champion, csv_row, details):
+    """{field: text} for one champion from every source"""
+    guides = details['guides'].get(champion['id'], {})
+    guide_text = [f"{g.get('title', '')} {g.get('description', '')}"
+                  for key in ('guides', 'videos') for g in guides.get(key, [])]
+    return {
+        'name': champion['name'],
+        'title': champion.get('title', ''),
+        'abilities': ' '.join(ability_names(csv_row)),
+        'guides': ' '.join(guide_text),
+        'tips': ' '.join(details['tips'].get(champion['id'], [])),
+    }
+
+
+def weighted_terms(fields):
+    """Counter of term -> field-weighted frequency"""
+    terms = Counter()
+    for field, text in fields.items():
+        for token in tokenize(text):
+            terms[token] += FIELD_WEIGHTS[field]
+    return terms
+
+
+def load_documents(roster_path=CHAMPIONS_PATH, data_dir=DATA_DIR, csv_path=CSV_PATH, only=None):
+    """[(champion id, name, fields)] in roster order, optionally just for the ids in `only`"""
+    csv_rows = load_champion_csv(csv_path)
+    details = load_champion_details(data_dir)
+    return [(c['id'], c['name'], champion_fields(c, csv_rows.get(name_key(c['name']), {}), details))
+            for c in load_champions(roster_path) if only is None or c['id'] in only]
+
+
+def sources_hash(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class PrefixTrie:
+    """Character trie over the vocabulary; '' marks the end of a term"""
+
+    def __init__(self, terms=()):
+        self.root = {}
+        for term in terms:
+            self.add(term)
+
+    def add(self, term):
+        node = self.root
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def remove(self, term):
+        path, node = [], self.root
+        for char in term:
+            if char not in node:
+                return
+            path.append((node, char))
+            node = node[char]
+        node.pop('', None)
+        # Prune branches left without any term
+        for parent, char in reversed(path):
+            if parent[char]:
+                break
+            del parent[char]
+
+    def complete(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        terms, stack = [], [(node, prefix)]
+        while stack:
+            node, text = stack.pop()
+            for char, child in node.items():
+                if char == '':
+                    terms.append(text)
+                else:
+                    stack.append((child, text + char))
+        return terms
+
+
+class SearchIndex:
+    """Inverted index: term -> {doc: weighted tf}, plus each document's terms for updates"""
+
+    def __init__(self, version=None):
+        self.version = version
+        self.docs = []          # [champion id, name] per document slot
+        self.slots = {}         # champion id -> slot
+        self.doc_terms = []     # Counter per slot
+        self.doc_lengths = []
+        self.postings = {}
+        self.total_length = 0.0
+        self.trie = PrefixTrie()
+
+    @classmethod
+    def build(cls, documents, version=None):
+        index = cls(version)
+        for champion_id, name, fields in documents:
+            index.update(champion_id, name, fields)
+        return index
+
+    def update(self, champion_id, name, fields):
+        """Add or replace one champion's document; fields=None removes it"""
+        slot = self.slots.get(champion_id)
+        if slot is None:
+            if fields is None:
+                return
+            slot = len(self.docs)
+            self.slots[champion_id] = slot
+            self.docs.append([champion_id, name])
+            self.doc_terms.append(Counter())
+            self.doc_lengths.append(0.0)
+
+        for term in self.doc_terms[slot]:
+            postings = self.postings[term]
+            del postings[slot]
+            if not postings:
+                del self.postings[term]
+                self.trie.remove(term)
+        self.total_length -= self.doc_lengths[slot]
+
+        terms = weighted_terms(fields) if fields is not None else Counter()
+        self.docs[slot][1] = name
+        self.doc_terms[slot] = terms
+        self.doc_lengths[slot] = sum(terms.values())
+        self.total_length += self.doc_lengths[slot]
+        for term, weight in terms.items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                self.trie.add(term)
+            self.postings[term][slot] = weight
+        if fields is None:
+            del self.slots[champion_id]
+
+    def expand(self, prefix):
+        """Vocabulary terms starting with prefix, most widespread first"""
+        terms = self.trie.complete(prefix)
+        terms.sort(key=lambda t: (-len(self.postings[t]), t))
+        return terms[:MAX_PREFIX_TERMS]
+
+    def search(self, query, limit=10, prefix=True):
+        """[(champion id, name, score)] ranked by BM25; the last word also matches as a prefix"""
+        tokens = tokenize(query)
+        if not tokens or not self.slots:
+            return []
+        groups = [[t] for t in tokens[:-1]]
+        groups.append(self.expand(tokens[-1]) if prefix else [tokens[-1]])
+
+        n = len(self.slots)
+        average = self.total_length / n
+        scores = {}
+        for group in groups:
+            for term in group:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for slot, tf in postings.items():
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[slot] / average)
+                    scores[slot] = scores.get(slot, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+        ranked = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        return [(self.docs[slot][0], self.docs[slot][1], score) for slot, score in ranked]
+
+    def to_dict(self):
+        live = [slot for slot in range(len(self.docs)) if self.docs[slot][0] in self.slots]
+        renumber = {slot: i for i, slot in enumerate(live)}
+        return {
+            'format': FORMAT_VERSION,
+            'version': self.version,
+            'field_weights': FIELD_WEIGHTS,
+            'docs': [self.docs[slot] for slot in live],
+            'postings': {term: [[renumber[slot], weight] for slot, weight in sorted(postings.items())]
+                         for term, postings in sorted(self.postings.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('format') != FORMAT_VERSION:
+            raise ValueError(f"unsupported search index format {data.get('format')}")
+        index = cls(data['version'])
+        index.docs = [list(doc) for doc in data['docs']]
+        index.slots = {doc[0]: slot for slot, doc in enumerate(index.docs)}
+        index.doc_terms = [Counter() for _ in index.docs]
+        for term, postings in data['postings'].items():
+            index.postings[term] = {slot: weight for slot, weight in postings}
+            for slot, weight in postings:
+                index.doc_terms[slot][term] = weight
+        index.doc_lengths = [sum(terms.values()) for terms in index.doc_terms]
+        index.total_length = sum(index.doc_lengths)
+        index.trie = PrefixTrie(index.postings)
+        return index
+
+
+def save_index(index, path):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index.to_dict(), f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def load_index(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return SearchIndex.from_dict(json.load(f))
+
+
+def source_paths(roster_path, data_dir, csv_path):
+    return [roster_path, csv_path, __file__] + [os.path.join(data_dir, f) for f in ('champion_guides.json',
+                                                                                      'champion_tips.json')]
+
+
+def build_or_load(roster_path=CHAMPIONS_PATH, data_dir=DATA_DIR, csv_path=CSV_PATH, output=DEFAULT_OUTPUT,
+                  force=False):
+    """Load the persisted index, rebuilding it first if the sources changed; returns (index, rebuilt)"""
+    version = sources_hash(source_paths(roster_path, data_dir, csv_path))
+    if not force and os.path.exists(output):
+        index = load_index(output)
+        if index.version == version:
+            INDEX_LOADS.labels('hit').inc()
+            return index, False
+    index = SearchIndex.build(load_documents(roster_path, data_dir, csv_path), version)
+    save_index(index, output)
+    INDEX_LOADS.labels('rebuilt').inc()
+    return index, True
+
+
+def update_champions(champion_ids, roster_path=CHAMPIONS_PATH, data_dir=DATA_DIR, csv_path=CSV_PATH,
+                     output=DEFAULT_OUTPUT):
+    """Re-read only the given champions' text and patch the persisted index"""
+    index = load_index(output)
+    documents = {champion_id: (name, fields) for champion_id, name, fields in
+                 load_documents(roster_path, data_dir, csv_path, only=set(champion_ids))}
+    for champion_id in champion_ids:
+        name, fields = documents.get(champion_id, (None, None))
+        index.update(champion_id, name, fields)
+    index.version = sources_hash(source_paths(roster_path, data_dir, csv_path))
+    save_index(index, output)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and query the champion full-text search index.')
+    parser.add_argument('query', nargs='*', help='Search terms; the last word also matches as a prefix')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--exact', action='store_true', help='Do not treat the last word as a prefix')
+    parser.add_argument('--complete', metavar='PREFIX', help='List vocabulary completions for a prefix')
+    parser.add_argument('--update', nargs='+', metavar='ID', help='Re-index only these champions')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild even if the sources are unchanged')
+    parser.add_argument('--benchmark', action='store_true', help='Time the query')
+    parser.add_argument('--roster', default=CHAMPIONS_PATH)
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--csv', default=CSV_PATH)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    if args.update:
+        if not os.path.exists(args.output):
+            parser.error(f"{args.output} does not exist yet; build it first")
+        index = update_champions(args.update, args.roster, args.data_dir, args.csv, args.output)
+        print(f"Re-indexed {', '.join(args.update)} in {args.output}")
+    else:
+        start = time.perf_counter()
+        index, rebuilt = build_or_load(args.roster, args.data_dir, args.csv, args.output, args.rebuild)
+        print(f"{'Built' if rebuilt else 'Loaded'} {args.output}: {len(index.slots)} champions, "
+              f"{len(index.postings)} terms in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    if args.complete:
+        print(', '.join(index.expand(args.complete.lower())) or 'No completions')
+    if args.query:
+        query = ' '.join(args.query)
+        results = index.search(query, args.limit, prefix=not args.exact)
+        print(f"\n{'Champion':<20}{'Score':>8}")
+        print("-" * 28)
+        for _, name, score in results:
+            print(f"{name:<20}{score:>8.2f}")
+        if not results:
+            print("No matches")
+        if args.benchmark:
+            runs = 2000
+            start = time.perf_counter()
+            for _ in range(runs):
+                index.search(query, args.limit, prefix=not args.exact)
+            print(f"\n{(time.perf_counter() - start) / runs * 1e6:.1f} us per query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Collaborative Filtering Engine
+LoL Champion Recommender System
+Implicit-feedback matrix factorization over stored questionnaire sessions
+("players who were recommended Ahri also ended up with Lux"). Session exports
+(the championRecommenderUsers records saved by the site, as a JSON array,
+NDJSON or CSV) become a sparse user x champion matrix of interaction
+strengths, which is factorized with alternating least squares in the
+confidence-weighted form of Hu, Koren and Volinsky (2008):
+
+    confidence c_ui = 1 + alpha * r_ui,  preference p_ui = 1 if r_ui > 0
+
+New users are folded in by solving their least-squares step against the
+fixed champion factors, so they get recommendations without retraining
+"""
+
+from champion_data import CHAMPIONS_PATH, load_champions, name_key
+import argparse
+import csv
+import json
+import time
+import numpy as np
+
+import metrics
+
+# How strongly each recorded field signals interest in a champion
+INTERACTION_WEIGHTS = {
+    'recommendedChampion': 3.0,
+    'randomForestChampion': 1.0,
+    'decisionTreeChampion': 1.0,
+    'knnChampion': 1.0,
+}
+DEFAULT_FACTORS = 32
+DEFAULT_ITERATIONS = 10
+DEFAULT_REGULARIZATION = 0.05
+DEFAULT_ALPHA = 10.0
+# Interactions per batched solve; bounds the (interactions x factors x factors) working set
+SOLVE_CHUNK_NNZ = 16384
+# Rows with more interactions than this (champions, on the item step) are solved one at a time
+LONG_ROW = 64
+ROWS_SCORED = metrics.counter('rows_scored_total', 'Rows scored by each scorer', labels=('scorer',)).labels('als')
+
+
+class InteractionMatrix:
+    """CSR user x champion matrix; duplicate (user, champion) pairs are summed"""
+
+    def __init__(self, users, items, weights, n_users, n_items):
+        order = np.lexsort((items, users))
+        users, items, weights = users[order], items[order], weights[order].astype(np.float32)
+        if len(users):
+            starts = np.flatnonzero(np.r_[True, (users[1:] != users[:-1]) | (items[1:] != items[:-1])])
+            weights = np.add.reduceat(weights, starts)
+            users, items = users[starts], items[starts]
+        self.shape = (n_users, n_items)
+        self.indices = items.astype(np.int32)
+        self.data = weights
+        self.indptr = np.zeros(n_users + 1, dtype=np.int64)
+        np.cumsum(np.bincount(users, minlength=n_users), out=self.indptr[1:])
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def row(self, user):
+        start, end = self.indptr[user], self.indptr[user + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def transpose(self):
+        users = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        return InteractionMatrix(self.indices.astype(np.int64), users, self.data, self.shape[1], self.shape[0])
+
+
+def load_sessions(paths):
+    """Session records from exported JSON arrays, NDJSON or CSV files"""
+    records = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if path.endswith('.csv'):
+                records.extend(csv.DictReader(f))
+            elif path.endswith('.ndjson') or path.endswith('.jsonl'):
+                records.extend(json.loads(line) for line in f if line.strip())
+            else:
+                data = json.load(f)
+                records.extend(data.get('championRecommenderUsers', []) if isinstance(data, dict) else data)
+    return records
+
+
+def session_interactions(records, champion_names):
+    """(user keys, user index array, item index array, weight array) from session records.
+
+    Sessions from the same email are one user; anonymous sessions stand alone.
+    Champions that are not in the roster are skipped.
+    """
+    items_by_name = {name_key(name): i for i, name in enumerate(champion_names)}
+    user_index, users, items, weights = {}, [], [], []
+    for record in records:
+        email = (record.get('email') or '').strip().lower()
+        key = email or record.get('sessionId')
+        if not key:
+            continue
+        for field, weight in INTERACTION_WEIGHTS.items():
+            item = items_by_name.get(name_key(str(record.get(field) or '')))
+            if item is None:
+                continue
+            users.append(user_index.setdefault(key, len(user_index)))
+            items.append(item)
+            weights.append(weight)
+    return (list(user_index), np.array(users, dtype=np.int64), np.array(items, dtype=np.int64),
+            np.array(weights, dtype=np.float32))
+
+
+def least_squares_step(matrix, fixed, regularization, alpha):
+    """Solve every row's factors against the fixed factors of the other side.
+
+    For row u with observed columns i: (F'F + sum_i (c_ui - 1) f_i f_i' + lambda I) x_u = sum_i c_ui f_i
+    Rows without interactions get zero factors.
+    """
+    n_rows, factors = matrix.shape[0], fixed.shape[1]
+    gram = fixed.T @ fixed + regularization * np.eye(factors, dtype=np.float32)
+    result = np.zeros((n_rows, factors), dtype=np.float32)
+    lengths = np.diff(matrix.indptr)
+
+    for row in np.flatnonzero(lengths > LONG_ROW):
+        items, values = matrix.row(row)
+        vectors, confidence = fixed[items], 1 + alpha * values
+        result[row] = np.linalg.solve(gram + (vectors.T * (confidence - 1)) @ vectors, vectors.T @ confidence)
+
+    # Group rows of equal length so each chunk pads its rows to (almost) the same width
+    short = np.flatnonzero((lengths > 0) & (lengths <= LONG_ROW))
+    short = short[np.argsort(lengths[short], kind='stable')]
+    if not len(short):
+        return result
+    cumulative = np.cumsum(lengths[short])
+    splits = np.searchsorted(cumulative, np.arange(SOLVE_CHUNK_NNZ, cumulative[-1], SOLVE_CHUNK_NNZ))
+    for rows in np.split(short, splits):
+        if not len(rows):
+            continue
+        counts = lengths[rows]
+        offsets = np.cumsum(counts) - counts
+        positions = np.repeat(matrix.indptr[rows] - offsets, counts) + np.arange(counts.sum())
+        local = np.repeat(np.arange(len(rows)), counts)
+        slot = np.arange(counts.sum()) - offsets[local]
+        vectors = np.zeros((len(rows), counts.max(), factors), dtype=np.float32)
+        confidence = np.zeros((len(rows), counts.max()), dtype=np.float32)
+        vectors[local, slot] = fixed[matrix.indices[positions]]
+        confidence[local, slot] = 1 + alpha * matrix.data[positions]
+        # Padding has zero vectors, so it adds nothing to either sum
+        correction = np.matmul(vectors.transpose(0, 2, 1) * (confidence - 1)[:, None, :], vectors)
+        rhs = np.matmul(confidence[:, None, :], vectors)[:, 0, :]
+        result[rows] = np.linalg.solve(gram + correction, rhs[:, :, None])[:, :, 0]
+    return result
+
+
+class ImplicitALS:
+    def __init__(self, factors=DEFAULT_FACTORS, regularization=DEFAULT_REGULARIZATION, alpha=DEFAULT_ALPHA,
+                 iterations=DEFAULT_ITERATIONS, seed=0):
+        self.factors = factors
+        self.regularization = regularization
+        self.alpha = alpha
+        self.iterations = iterations
+        self.seed = seed
+        self.user_factors = None
+        self.item_factors = None
+
+    def fit(self, matrix, callback=None):
+        rng = np.random.default_rng(self.seed)
+        self.item_factors = (rng.standard_normal((matrix.shape[1], self.factors)) * 0.01).astype(np.float32)
+        transposed = matrix.transpose()
+        for iteration in range(self.iterations):
+            self.user_factors = least_squares_step(matrix, self.item_factors, self.regularization, self.alpha)
+            self.item_factors = least_squares_step(transposed, self.user_factors, self.regularization, self.alpha)
+            if callback:
+                callback(iteration)
+        return self
+
+    def fold_in(self, items, weights=None):
+        """Factors for unseen users from their (champion indices, weights) lists, without retraining"""
+        users, cols, vals = [], [], []
+        for user, user_items in enumerate(items):
+            users.extend([user] * len(user_items))
+            cols.extend(user_items)
+            vals.extend(weights[user] if weights else [1.0] * len(user_items))
+        matrix = InteractionMatrix(np.array(users, dtype=np.int64), np.array(cols, dtype=np.int64),
+                                   np.array(vals, dtype=np.float32), len(items), len(self.item_factors))
+        return least_squares_step(matrix, self.item_factors, self.regularization, self.alpha)
+
+    def recommend(self, user_factors, k=5, exclude=None):
+        """Top-k champion indices and scores for a batch of user factor rows.
+
+        exclude is an optional InteractionMatrix whose rows (one per user) are
+        masked out, so already-seen champions are not recommended again.
+        """
+        scores = user_factors @ self.item_factors.T
+        ROWS_SCORED.inc(len(scores))
+        if exclude is not None:
+            rows = np.repeat(np.arange(exclude.shape[0]), np.diff(exclude.indptr))
+            scores[rows, exclude.indices] = -np.inf
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def similar_items(self, item, k=5):
+        """Champions whose predicted scores move with item's across all users.
+
+        Cosine similarity of the score columns X Y', computed in factor space
+        as Y G Y' with G = X'X, which unlike raw factor cosine ignores
+        directions no user actually occupies.
+        """
+        weighted = self.item_factors @ (self.user_factors.T @ self.user_factors)
+        norms = np.sqrt(np.einsum('if,if->i', weighted, self.item_factors)) + 1e-9
+        similarity = weighted @ self.item_factors[item] / (norms * norms[item])
+        similarity[item] = -np.inf
+        top = np.argsort(-similarity)[:k]
+        return top, similarity[top]
+
+    def save(self, path, user_keys, item_names):
+        np.savez(path, user_factors=self.user_factors, item_factors=self.item_factors,
+                 user_keys=np.array(user_keys), item_names=np.array(item_names),
+                 params=np.array([self.factors, self.regularization, self.alpha, self.iterations], dtype=np.float64))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            factors, regularization, alpha, iterations = data['params']
+            model = cls(int(factors), float(regularization), float(alpha), int(iterations))
+            model.user_factors = data['user_factors']
+            model.item_factors = data['item_factors']
+            return model, list(data['user_keys']), list(data['item_names'])
+
+
+def synthetic_interactions(champions, n_users, per_user=5, seed=0):
+    """Users who favour one champion and sample the rest of their history from its herotype"""
+    rng = np.random.default_rng(seed)
+    herotypes = np.array([c.get('herotype') or 'Unknown' for c in champions])
+    groups = [np.flatnonzero(herotypes == h) for h in np.unique(herotypes)]
+    group_of = np.empty(len(champions), dtype=np.int64)
+    for g, members in enumerate(groups):
+        group_of[members] = g
+    sizes = np.array([len(g) for g in groups])
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    flat = np.concatenate(groups)
+
+    favourite = rng.integers(0, len(champions), n_users)
+    group = group_of[favourite]
+    others = flat[starts[group][:, None] + (rng.random((n_users, per_user - 1)) * sizes[group][:, None]).astype(np.int64)]
+    users = np.repeat(np.arange(n_users), per_user)
+    items = np.hstack([favourite[:, None], others]).ravel()
+    weights = np.tile(np.array([INTERACTION_WEIGHTS['recommendedChampion']] + [1.0] * (per_user - 1),
+                               dtype=np.float32), n_users)
+    return InteractionMatrix(users, items, weights, n_users, len(champions))
+
+
+def benchmark(champions, n_users, factors, iterations, batch=100_000):
+    import tracemalloc
+    start = time.perf_counter()
+    matrix = synthetic_interactions(champions, n_users)
+    build_time = time.perf_counter() - start
+    print(f"Synthetic matrix: {n_users:,} users x {matrix.shape[1]} champions, {matrix.nnz:,} interactions "
+          f"({(matrix.indptr.nbytes + matrix.indices.nbytes + matrix.data.nbytes) / 2**20:.1f} MiB CSR) "
+          f"in {build_time:.2f}s")
+
+    model = ImplicitALS(factors=factors, iterations=iterations)
+    times = []
+    last = [time.perf_counter()]
+
+    def lap(iteration):
+        now = time.perf_counter()
+        times.append(now - last[0])
+        last[0] = now
+
+    tracemalloc.start()
+    model.fit(matrix, callback=lap)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    model.recommend(model.user_factors[:batch], k=10)
+    recommend_time = time.perf_counter() - start
+    start = time.perf_counter()
+    model.fold_in([[0, 1, 2]] * 1000)
+    fold_in_time = time.perf_counter() - start
+
+    print("\n" + "=" * 60)
+    print(f"{'Factors':<28}{factors:>14}")
+    print(f"{'Iterations':<28}{iterations:>14}")
+    print(f"{'Training time':<28}{sum(times):>13.2f}s")
+    print(f"{'Per iteration':<28}{sum(times) / len(times):>13.2f}s")
+    print(f"{'Peak traced memory':<28}{peak / 2**20:>10.1f} MiB")
+    print(f"{'User factors':<28}{model.user_factors.nbytes / 2**20:>10.1f} MiB")
+    print(f"{'Top-10 for ' + format(min(batch, n_users), ','):<28}{recommend_time * 1000:>12.1f}ms")
+    print(f"{'Fold-in 1,000 users':<28}{fold_in_time * 1000:>12.1f}ms")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Implicit ALS collaborative filtering over stored sessions.')
+    parser.add_argument('sessions', nargs='*', help='Exported session files (.json, .ndjson or .csv) to train on')
+    parser.add_argument('--model', help='Saved model to load (.npz) instead of training')
+    parser.add_argument('--save', help='Where to save the trained model (.npz)')
+    parser.add_argument('--liked', nargs='+', metavar='CHAMPION', help='Fold in a new user who liked these')
+    parser.add_argument('--similar', metavar='CHAMPION', help='Champions whose players overlap with this one')
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--factors', type=int, default=DEFAULT_FACTORS)
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--regularization', type=float, default=DEFAULT_REGULARIZATION)
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA)
+    parser.add_argument('--benchmark', type=int, metavar='USERS', help='Train on this many synthetic users and time it')
+    parser.add_argument('--roster', default=CHAMPIONS_PATH)
+    parser.add_argument('--metrics', metavar='DIR', nargs='?', const=metrics.DEFAULT_METRICS_DIR,
+                        help=f"Export rows scored to DIR on exit (default: {metrics.DEFAULT_METRICS_DIR})")
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.export_on_exit(args.metrics)
+
+    champions = load_champions(args.roster)
+    if args.benchmark:
+        benchmark(champions, args.benchmark, args.factors, args.iterations)
+        return
+
+    if args.model:
+        model, user_keys, names = ImplicitALS.load(args.model)
+    elif args.sessions:
+        names = [c['name'] for c in champions]
+        user_keys, users, items, weights = session_interactions(load_sessions(args.sessions), names)
+        if not user_keys:
+            parser.error("no sessions with a recommended champion were found")
+        matrix = InteractionMatrix(users, items, weights, len(user_keys), len(names))
+        model = ImplicitALS(args.factors, args.regularization, args.alpha, args.iterations)
+        start = time.perf_counter()
+        model.fit(matrix)
+        print(f"Trained on {len(user_keys)} users, {matrix.nnz} interactions in {time.perf_counter() - start:.2f}s")
+        if args.save:
+            model.save(args.save, user_keys, names)
+            print(f"Saved {args.save}")
+    else:
+        parser.error("pass session files to train on, --model, or --benchmark")
+
+    index = {name_key(name): i for i, name in enumerate(names)}
+
+    def lookup(name):
+        if name_key(name) not in index:
+            parser.error(f"unknown champion: {name}")
+        return index[name_key(name)]
+
+    if args.liked:
+        liked = [lookup(name) for name in args.liked]
+        factors = model.fold_in([liked])
+        seen = InteractionMatrix(np.zeros(len(liked), dtype=np.int64), np.array(liked), np.ones(len(liked)),
+                                 1, len(names))
+        top, scores = model.recommend(factors, args.top, exclude=seen)
+        print(f"\nPlayers who liked {', '.join(args.liked)} also got:")
+        for item, score in zip(top[0], scores[0]):
+            print(f"  {names[item]:<16}{score:>7.3f}")
+    if args.similar:
+        top, scores = model.similar_items(lookup(args.similar), args.top)
+        print(f"\nChampions similar to {args.similar}:")
+        for item, score in zip(top, scores):
+            print(f"  {names[item]:<16}{score:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Questionnaire Compiler
+LoL Champion Recommender System
+Compiles questions.json and the answer-mapping functions in src/index.html
+(mapDifficulty, mapPlaystyle, mapRange, adjustAttributesBasedOnPlaystyle and
+EvaluationMetrics.mapDifficultyToNumeric / mapPlaystyleToAttributes) into one
+lookup table per question. A batch of answers encoded as option indices is
+then turned into a feature matrix with one fancy-indexing gather per question
+instead of mapping answer objects one at a time
+"""
+
+from champion_data import DATA_DIR
+import argparse
+import json
+import os
+import re
+import time
+import numpy as np
+
+QUESTIONS_PATH = os.path.join(DATA_DIR, 'questions.json')
+INDEX_HTML = os.path.join('src', 'index.html')
+DEFAULT_OUTPUT = os.path.join(DATA_DIR, 'questionnaire_tables.json')
+
+# Code for a question the user skipped; -1 also selects the default row (the last one)
+UNANSWERED = -1
+CHUNK_ROWS = 4096
+
+
+def _function_body(source, signature):
+    """Text between the braces of the first function whose header matches signature"""
+    match = re.search(signature, source)
+    if not match:
+        raise ValueError(f"{signature!r} not found in the page source")
+    start = source.index('{', match.end())
+    depth = 0
+    for pos in range(start, len(source)):
+        if source[pos] == '{':
+            depth += 1
+        elif source[pos] == '}':
+            depth -= 1
+            if depth == 0:
+                return source[start + 1:pos]
+    raise ValueError(f"unbalanced braces after {signature!r}")
+
+
+def _js_value(text):
+    text = text.strip()
+    if text.startswith("'"):
+        return text.strip("'")
+    if text == 'null':
+        return None
+    if text.startswith('{'):
+        return {k: _js_value(v) for k, v in re.findall(r"(\w+)\s*:\s*([-\d.]+|null)", text)}
+    return float(text)
+
+
+def _js_mapping(body):
+    """Parse a `const mapping = {...}` literal and the `|| default` of its return"""
+    literal = _function_body(body, r'const mapping =')
+    mapping = {k: _js_value(v) for k, v in re.findall(r"'([^']*)'\s*:\s*(\{[^}]*\}|'[^']*'|[-\d.]+|null)", literal)}
+    default = re.search(r'return mapping\[\w+\]\s*\|\|\s*([^;]+);', body)
+    return mapping, _js_value(default.group(1)) if default else None
+
+
+def _js_switch(body):
+    """Parse adjustAttributesBasedOnPlaystyle's switch into ({case: {attr: value}}, default case)"""
+    cases, default = {}, None
+    for block in body.split('break;'):
+        labels = re.findall(r"case '([^']*)':", block)
+        assignments = {k: float(v) for k, v in re.findall(r'features\.(\w+)\s*=\s*([-\d.]+);', block)}
+        for label in labels:
+            cases[label] = assignments
+        if 'default:' in block:
+            default = labels[-1] if labels else None
+            cases.setdefault(default, assignments)
+    return cases, default
+
+
+def extract_js_mappings(index_path=INDEX_HTML):
+    """Read the answer mappings out of the page's JavaScript"""
+    with open(index_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    difficulty, difficulty_default = _js_mapping(_function_body(source, r'function mapDifficulty\('))
+    playstyle, playstyle_default = _js_mapping(_function_body(source, r'function mapPlaystyle\('))
+    adjustments, adjustment_default = _js_switch(_function_body(source, r'function adjustAttributesBasedOnPlaystyle\('))
+    eval_difficulty, _ = _js_mapping(_function_body(source, r'static mapDifficultyToNumeric\('))
+    eval_playstyle, _ = _js_mapping(_function_body(source, r'static mapPlaystyleToAttributes\('))
+    return {
+        'difficulty': difficulty, 'difficulty_default': difficulty_default,
+        'playstyle': playstyle, 'playstyle_default': playstyle_default,
+        'adjustments': adjustments, 'adjustment_default': adjustment_default,
+        'eval_difficulty': eval_difficulty, 'eval_playstyle': eval_playstyle,
+    }
+
+
+def mapping_drift(mappings):
+    """Differences between the runtime mappings and the EvaluationMetrics copies"""
+    problems = []
+    for option, value in mappings['eval_difficulty'].items():
+        if mappings['difficulty'].get(option) != value:
+            problems.append(f"difficulty {option!r}: mapDifficulty={mappings['difficulty'].get(option)} "
+                            f"mapDifficultyToNumeric={value}")
+    for option, attributes in mappings['eval_playstyle'].items():
+        label = mappings['playstyle'].get(option, mappings['playstyle_default'])
+        runtime = mappings['adjustments'].get(label, mappings['adjustments'][mappings['adjustment_default']])
+        for name, value in attributes.items():
+            if runtime.get(name) != value:
+                problems.append(f"playstyle {option!r}.{name}: runtime={runtime.get(name)} evaluation={value}")
+    return problems
+
+
+class CompiledQuestionnaire:
+    """Per-question lookup tables over a fixed feature column layout.
+
+    tables[i] has one row per option of question i plus a final default row
+    for unanswered, and one column per feature the question owns
+    (column_slices[i]). NaN marks a feature the answer leaves unset.
+    """
+
+    def __init__(self, questions, columns, column_slices, tables, weights):
+        self.questions = questions
+        self.columns = columns
+        self.column_slices = column_slices
+        self.tables = tables
+        self.weights = weights
+        self.option_index = [{option: i for i, option in enumerate(q['options'])} for q in questions]
+
+    def encode_codes(self, answers):
+        """[{question id: option text}] -> int8 matrix of option indices (UNANSWERED if missing)"""
+        codes = np.full((len(answers), len(self.questions)), UNANSWERED, dtype=np.int8)
+        for row, answer in enumerate(answers):
+            for col, question in enumerate(self.questions):
+                option = answer.get(question['id'])
+                if option is not None:
+                    codes[row, col] = self.option_index[col].get(option, UNANSWERED)
+        return codes
+
+    def transform(self, codes, weighted=False, out=None):
+        """Gather the feature matrix for a (n, n_questions) array of option codes"""
+        codes = np.asarray(codes)
+        if out is None:
+            out = np.empty((codes.shape[0], len(self.columns)), dtype=np.float32)
+        # Work in row blocks that stay in cache while every question writes its columns
+        for start in range(0, codes.shape[0], CHUNK_ROWS):
+            block, block_out = codes[start:start + CHUNK_ROWS], out[start:start + CHUNK_ROWS]
+            for i, (table, columns) in enumerate(zip(self.tables, self.column_slices)):
+                block_out[:, columns] = table[block[:, i]]
+            if weighted:
+                block_out *= self.weights
+        return out
+
+    def to_json(self):
+        return {
+            'columns': self.columns,
+            'weights': self.weights.tolist(),
+            'unanswered': UNANSWERED,
+            'questions': [{
+                'id': q['id'],
+                'feature': q['feature_mapping'],
+                'columns': [s.start, s.stop],
+                # JSON has no NaN; null marks an unset feature
+                'table': [[None if np.isnan(v) else float(v) for v in row] for row in table],
+            } for q, s, table in zip(self.questions, self.column_slices, self.tables)],
+        }
+
+
+def compile_questionnaire(questions, mappings):
+    """Build a CompiledQuestionnaire from questions.json entries and the JS mappings"""
+    columns, slices, tables, weights = [], [], [], []
+
+    def add(question, names, rows, default):
+        start = len(columns)
+        columns.extend(names)
+        slices.append(slice(start, len(columns)))
+        tables.append(np.array(rows + [default], dtype=np.float32).reshape(len(rows) + 1, len(names)))
+        weights.extend([question.get('weight', 1.0)] * len(names))
+
+    adjustments = mappings['adjustments']
+    attribute_names = sorted({name for values in adjustments.values() for name in values})
+
+    for question in questions:
+        feature, options = question['feature_mapping'], question['options']
+        if feature == 'difficulty':
+            # mapDifficulty: unknown or missing answers fall back to its default
+            rows = [[mappings['difficulty'].get(o, mappings['difficulty_default'])] for o in options]
+            add(question, ['difficulty'], rows, [mappings['difficulty_default']])
+        elif feature == 'playstyle':
+            # mapPlaystyle then adjustAttributesBasedOnPlaystyle, plus a one-hot of the label
+            labels = [mappings['playstyle'].get(o, mappings['playstyle_default']) for o in options]
+            label_names = sorted(set(labels) | {mappings['playstyle_default']})
+
+            def row(label):
+                values = adjustments.get(label, adjustments[mappings['adjustment_default']])
+                return ([values.get(name, np.nan) for name in attribute_names] +
+                        [1.0 if label == name else 0.0 for name in label_names])
+
+            add(question, attribute_names + [f'playstyle={n}' for n in label_names],
+                [row(label) for label in labels], row(mappings['playstyle_default']))
+        elif feature == 'attack_range':
+            # mapRange lowercases the answer; 'no preference' sets neither column
+            names = [o.lower() for o in options if o.lower() != 'no preference']
+            rows = [[1.0 if o.lower() == n else 0.0 for n in names] for o in options]
+            add(question, [f'range={n}' for n in names], rows, [0.0] * len(names))
+        else:
+            # Categorical answers are one-hot; unanswered ('No Preference' in the page) is all zeros
+            names = [f'{feature}={o}' for o in options]
+            add(question, names, np.eye(len(options)).tolist(), [0.0] * len(options))
+
+    return CompiledQuestionnaire(questions, columns, slices, tables, np.array(weights, dtype=np.float32))
+
+
+def reference_features(question_list, mappings, answer):
+    """One answer at a time, the way the page does it; used to check the compiled tables"""
+    compiled_columns = {}
+    for question in question_list:
+        option = answer.get(question['id'])
+        feature = question['feature_mapping']
+        if feature == 'difficulty':
+            compiled_columns['difficulty'] = mappings['difficulty'].get(option, mappings['difficulty_default'])
+        elif feature == 'playstyle':
+            label = mappings['playstyle'].get(option, mappings['playstyle_default'])
+            adjustments = mappings['adjustments']
+            values = adjustments.get(label, adjustments[mappings['adjustment_default']])
+            for name in sorted({n for v in adjustments.values() for n in v}):
+                compiled_columns[name] = values.get(name, np.nan)
+            for name in sorted(set(mappings['playstyle'].values()) | {mappings['playstyle_default']}):
+                compiled_columns[f'playstyle={name}'] = 1.0 if label == name else 0.0
+        elif feature == 'attack_range':
+            chosen = option.lower() if option else 'no_preference'
+            for o in question['options']:
+                if o.lower() != 'no preference':
+                    compiled_columns[f'range={o.lower()}'] = 1.0 if chosen == o.lower() else 0.0
+        else:
+            for o in question['options']:
+                compiled_columns[f'{feature}={o}'] = 1.0 if option == o else 0.0
+    return compiled_columns
+
+
+def random_codes(compiled, n, seed=0, skip_rate=0.05):
+    """Random answer codes for benchmarking, with some questions skipped"""
+    rng = np.random.default_rng(seed)
+    counts = np.array([len(q['options']) for q in compiled.questions])
+    codes = (rng.random((n, len(counts))) * counts).astype(np.int8)
+    codes[rng.random(codes.shape) < skip_rate] = UNANSWERED
+    return codes
+
+
+def verify(compiled, mappings, samples=2000):
+    """Compare the compiled transform with reference_features on random answers"""
+    codes = random_codes(compiled, samples, seed=1, skip_rate=0.2)
+    features = compiled.transform(codes)
+    mismatches = 0
+    for row in range(samples):
+        answer = {q['id']: q['options'][c] for q, c in zip(compiled.questions, codes[row]) if c != UNANSWERED}
+        expected = reference_features(compiled.questions, mappings, answer)
+        actual = dict(zip(compiled.columns, features[row]))
+        if set(expected) != set(actual) or any(
+                not (np.isnan(v) and np.isnan(actual[k])) and np.float32(v) != actual[k]
+                for k, v in expected.items()):
+            mismatches += 1
+    return mismatches
+
+
+def benchmark(compiled, mappings, n=1_000_000):
+    codes = random_codes(compiled, n)
+    out = np.empty((n, len(compiled.columns)), dtype=np.float32)
+    start = time.perf_counter()
+    compiled.transform(codes, out=out)
+    compiled_time = time.perf_counter() - start
+
+    sample = 20_000
+    answers = [{q['id']: q['options'][c] for q, c in zip(compiled.questions, codes[row]) if c != UNANSWERED}
+               for row in range(sample)]
+    start = time.perf_counter()
+    for answer in answers:
+        reference_features(compiled.questions, mappings, answer)
+    reference_time = (time.perf_counter() - start) / sample * n
+
+    print("\n" + "=" * 60)
+    print(f"{'Encoder':<28}{'Rows':>10}{'Rows/sec':>16}")
+    print("-" * 60)
+    print(f"{'Per-answer mapping':<28}{sample:>10}{n / reference_time:>16,.0f}")
+    print(f"{'Compiled lookup tables':<28}{n:>10}{n / compiled_time:>16,.0f}")
+    print("=" * 60)
+    print(f"{reference_time / compiled_time:.0f}x faster ({n:,} x {len(compiled.columns)} float32 features)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile the questionnaire into batch feature lookup tables.')
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    parser.add_argument('--index-html', default=INDEX_HTML, help='Page whose JavaScript defines the mappings')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--benchmark', type=int, nargs='?', const=1_000_000, default=None, metavar='ROWS',
+                        help='Time the compiled transform against per-answer mapping')
+    args = parser.parse_args()
+
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        questions = json.load(f)['questions']
+    mappings = extract_js_mappings(args.index_html)
+    for problem in mapping_drift(mappings):
+        print(f"Warning: mapping drift, {problem}")
+
+    compiled = compile_questionnaire(questions, mappings)
+    mismatches = verify(compiled, mappings)
+    if mismatches:
+        raise SystemExit(f"Compiled tables disagree with the reference mapping on {mismatches} answers")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(compiled.to_json(), f, separators=(',', ':'))
+    print(f"Compiled {len(questions)} questions into {len(compiled.columns)} feature columns -> {args.output}")
+
+    if args.benchmark:
+        benchmark(compiled, mappings, args.benchmark)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Online Ensemble Weight Learner
+LoL Champion Recommender System
+Learns the Random Forest / Decision Tree / KNN blend used by
+ScoreAggregator from thumbs-up/down feedback instead of the fixed 40/30/30.
+
+Each feedback event carries the per-algorithm scores the champion had when it
+was served. The blended score sum_k w_k s_k is mapped to an acceptance
+probability through a logistic link; the weights take an exponentiated-
+gradient step on the log loss (so they stay positive and sum to one) and the
+link's offset a plain gradient step. That is a constant amount of work per
+event. Optionally a separate state is kept per user segment (the role answer
+by default), which falls back to the global weights until it has seen
+enough events.
+
+Weights are published by swapping in a new read-only mapping, so a reader
+never sees a half-updated set, and written to src/data/ensemble_weights.json
+with an atomic rename for the page to load. The whole learner state is a few
+numbers per segment, so checkpoints are small JSON files that record the
+stream offset they cover
+"""
+
+from champion_data import DATA_DIR
+from types import MappingProxyType
+import argparse
+import json
+import math
+import os
+import random
+import time
+
+ALGORITHMS = ('randomForest', 'decisionTree', 'knn')
+DEFAULT_WEIGHTS = {'randomForest': 0.4, 'decisionTree': 0.3, 'knn': 0.3}
+DEFAULT_PUBLISH_PATH = os.path.join(DATA_DIR, 'ensemble_weights.json')
+DEFAULT_CHECKPOINT = '.ensemble_state.json'
+
+LEARNING_RATE = 0.05
+OFFSET_LEARNING_RATE = 0.01
+# Slope of the logistic link on 0-1 blended scores
+LINK_SCALE = 8.0
+# Keep every algorithm in play so the blend can recover if feedback shifts
+MIN_WEIGHT = 0.02
+# Events a segment needs before its own weights are published
+MIN_SEGMENT_EVENTS = 50
+
+
+class WeightState:
+    """Weights, link offset and event count for the global model or one segment"""
+
+    __slots__ = ('weights', 'offset', 'events')
+
+    def __init__(self, weights=None, offset=0.5, events=0):
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.offset = offset
+        self.events = events
+
+    def update(self, scores, accepted):
+        blended = sum(self.weights[k] * scores[k] for k in ALGORITHMS)
+        predicted = 1 / (1 + math.exp(-LINK_SCALE * (blended - self.offset)))
+        error = predicted - (1.0 if accepted else 0.0)
+        # d(log loss)/d(w_k) = error * LINK_SCALE * s_k; exponentiated gradient keeps the simplex
+        raw = {k: self.weights[k] * math.exp(-LEARNING_RATE * error * LINK_SCALE * scores[k]) for k in ALGORITHMS}
+        total = sum(raw.values())
+        raw = {k: max(MIN_WEIGHT, v / total) for k, v in raw.items()}
+        total = sum(raw.values())
+        self.weights = {k: v / total for k, v in raw.items()}
+        self.offset += OFFSET_LEARNING_RATE * error * LINK_SCALE
+        self.events += 1
+        return predicted
+
+    def to_dict(self):
+        return {'weights': self.weights, 'offset': self.offset, 'events': self.events}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['weights'], data['offset'], data['events'])
+
+
+class OnlineWeightLearner:
+    def __init__(self, segmented=True):
+        self.segmented = segmented
+        self.global_state = WeightState()
+        self.segments = {}
+        self.offset = 0          # stream position the state covers
+        self.loss = 0.0
+        self._published = MappingProxyType({'global': MappingProxyType(dict(DEFAULT_WEIGHTS)), 'segments': {}})
+
+    def observe(self, event):
+        """Apply one feedback event: {'scores': {algorithm: 0-100}, 'accepted': bool, 'segment': str?}"""
+        scores = {k: float(event['scores'].get(k, 0.0)) / 100.0 for k in ALGORITHMS}
+        accepted = bool(event['accepted'])
+        predicted = self.global_state.update(scores, accepted)
+        self.loss += -math.log(max(1e-12, predicted if accepted else 1 - predicted))
+        segment = event.get('segment')
+        if self.segmented and segment:
+            state = self.segments.get(segment)
+            if state is None:
+                # New segments start from the global blend rather than the defaults
+                state = self.segments[segment] = WeightState(self.global_state.weights, self.global_state.offset)
+            state.update(scores, accepted)
+        self.offset += 1
+
+    def publish(self):
+        """Swap in a new read-only snapshot of the weights; returns it"""
+        segments = {name: MappingProxyType(dict(state.weights)) for name, state in sorted(self.segments.items())
+                    if state.events >= MIN_SEGMENT_EVENTS}
+        self._published = MappingProxyType({'global': MappingProxyType(dict(self.global_state.weights)),
+                                            'segments': MappingProxyType(segments)})
+        return self._published
+
+    def weights(self, segment=None):
+        """Current published weights for a segment, or the global ones"""
+        published = self._published
+        return published['segments'].get(segment, published['global'])
+
+    def state_dict(self):
+        return {'offset': self.offset, 'loss': self.loss, 'segmented': self.segmented,
+                'global': self.global_state.to_dict(),
+                'segments': {name: state.to_dict() for name, state in self.segments.items()}}
+
+    @classmethod
+    def from_state(cls, data):
+        learner = cls(data.get('segmented', True))
+        learner.offset = data['offset']
+        learner.loss = data.get('loss', 0.0)
+        learner.global_state = WeightState.from_dict(data['global'])
+        learner.segments = {name: WeightState.from_dict(s) for name, s in data['segments'].items()}
+        learner.publish()
+        return learner
+
+
+def write_json_atomic(path, data, indent=None):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def save_checkpoint(learner, path):
+    write_json_atomic(path, learner.state_dict())
+
+
+def load_checkpoint(path, segmented=True):
+    if not os.path.exists(path):
+        return OnlineWeightLearner(segmented)
+    with open(path, 'r', encoding='utf-8') as f:
+        return OnlineWeightLearner.from_state(json.load(f))
+
+
+def publish_file(learner, path):
+    """Write the published weights for the page, rounded for display"""
+    published = learner.publish()
+    round_all = lambda weights: {k: round(v, 4) for k, v in weights.items()}
+    write_json_atomic(path, {
+        'global': round_all(published['global']),
+        'segments': {name: round_all(w) for name, w in published['segments'].items()},
+        'events': learner.offset,
+        'updated': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }, indent=2)
+
+
+def read_events(path, skip=0):
+    """Feedback events from an NDJSON stream, skipping the first `skip` lines already learned"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f):
+            if number < skip or not line.strip():
+                continue
+            yield json.loads(line)
+
+
+def simulate_events(n, seed=0):
+    """Feedback where acceptance follows a blend that favours KNN for Mage players and RF otherwise"""
+    rng = random.Random(seed)
+    truth = {'Mage': {'randomForest': 0.2, 'decisionTree': 0.2, 'knn': 0.6}}
+    default = {'randomForest': 0.6, 'decisionTree': 0.25, 'knn': 0.15}
+    for i in range(n):
+        segment = rng.choice(['Mage', 'Tank', 'Marksman', 'Assassin'])
+        scores = {k: rng.uniform(0, 100) for k in ALGORITHMS}
+        weights = truth.get(segment, default)
+        blended = sum(weights[k] * scores[k] for k in ALGORITHMS) / 100
+        accepted = rng.random() < 1 / (1 + math.exp(-LINK_SCALE * (blended - 0.5)))
+        yield {'user': f"user-{i % 5000}", 'champion': 'Ahri', 'accepted': accepted, 'scores': scores,
+               'segment': segment}
+
+
+def print_weights(learner):
+    published = learner.publish()
+    print("\n" + "=" * 64)
+    print(f"{'Segment':<16}{'Events':>9}" + ''.join(f"{k:>13}" for k in ALGORITHMS))
+    print("-" * 64)
+    rows = [('global', learner.global_state.events, published['global'])]
+    rows += [(name, learner.segments[name].events, w) for name, w in published['segments'].items()]
+    for name, events, weights in rows:
+        print(f"{name:<16}{events:>9}" + ''.join(f"{weights[k]:>13.3f}" for k in ALGORITHMS))
+    print("=" * 64)
+    if learner.offset:
+        print(f"Mean log loss {learner.loss / learner.offset:.4f} over {learner.offset} events")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Learn ensemble weights online from thumbs-up/down feedback.')
+    parser.add_argument('events', nargs='?', help='NDJSON feedback stream')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help='Learner state to resume from and save')
+    parser.add_argument('--checkpoint-every', type=int, default=10_000, help='Events between checkpoints')
+    parser.add_argument('--publish', default=DEFAULT_PUBLISH_PATH, help='Weights file the page loads')
+    parser.add_argument('--no-segments', action='store_true', help='Learn one global blend only')
+    parser.add_argument('--simulate', type=int, metavar='EVENTS', help='Learn from simulated feedback instead')
+    parser.add_argument('--reset', action='store_true', help='Ignore any existing checkpoint')
+    args = parser.parse_args()
+
+    if not args.events and not args.simulate:
+        parser.error("pass an event stream or --simulate")
+
+    if args.simulate:
+        learner, events = OnlineWeightLearner(not args.no_segments), simulate_events(args.simulate)
+    else:
+        learner = OnlineWeightLearner(not args.no_segments) if args.reset else \
+            load_checkpoint(args.checkpoint, not args.no_segments)
+        events = read_events(args.events, skip=learner.offset)
+
+    start, resumed_at = time.perf_counter(), learner.offset
+    for event in events:
+        learner.observe(event)
+        if not args.simulate and learner.offset % args.checkpoint_every == 0:
+            save_checkpoint(learner, args.checkpoint)
+            learner.publish()
+    elapsed = time.perf_counter() - start
+    processed = learner.offset - resumed_at
+
+    if not args.simulate:
+        save_checkpoint(learner, args.checkpoint)
+        publish_file(learner, args.publish)
+        print(f"Published {args.publish}; checkpoint {args.checkpoint} at event {learner.offset}")
+    print_weights(learner)
+    if processed:
+        print(f"{processed:,} events in {elapsed:.2f}s ({elapsed / processed * 1e6:.1f} us per event)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Compiled Fallback Explanations
+LoL Champion Recommender System
+Python versions of the page's generateFallbackExplanation and
+generateMetricFallbackExplanation for server-side batch runs, which produce
+these strings millions of times.
+
+The naive versions rebuild every sentence per call. The compiled versions
+render everything that depends only on the champion or metric once, when
+the explainer is built: the champion's name and "offers" clause, the
+reason phrase for every role-match/playstyle combination, and each metric's
+verdict sentence per score tier. The reason phrase has only ten possible
+values per champion, so a champion request is a lookup; a metric request
+joins the pre-rendered pieces with its two user-dependent slots (percentage
+and relevant count). Both versions produce identical text, which
+--benchmark checks while timing them
+"""
+
+from champion_data import ATTRIBUTES, CHAMPIONS_PATH, load_champions
+from string import Formatter
+import argparse
+import random
+import time
+
+PLAYSTYLE_REASONS = {
+    'High Damage Output': ('damage', 'high damage output'),
+    'Tanky and Durable': ('toughness', 'excellent durability'),
+    'Support Team': ('utility', 'strong utility for the team'),
+}
+# Attribute rating counted as "high" on the page's 1-10 scale and on the roster's 1-3 scale
+PAGE_STRONG, ROSTER_STRONG = 7, 3
+
+CHAMPION_TEMPLATE = "{name} is an excellent choice for you with {reasons}. This champion offers {offers} and scales well into late game."
+
+# Metric -> [(lowest value of the tier, verdict sentence)], best tier first, and the sentence around it
+METRIC_TIERS = {
+    'p1': [(0.7, 'This is excellent - the #1 champion is highly relevant!'),
+           (0.4, 'This is decent - the top pick shows good alignment.'),
+           (None, 'Consider trying different preferences for a better top match.')],
+    'p3': [(0.7, 'Excellent! Most of your top picks are great matches.'),
+           (0.4, 'Good! You have solid options in your top 3.'),
+           (None, 'Try adjusting your answers to get more relevant matches in the top 3.')],
+    'p5': [(0.7, 'Outstanding performance! The majority of recommendations fit you well.'),
+           (0.4, 'Good spread of relevant champions in your top 10.'),
+           (None, 'You may want to refine your preferences for better top 10 matches.')],
+    'mrr': [(0.9, 'Very High Confidence - Our algorithms are extremely sure about your top pick! The recommendations '
+                  'balance accuracy with diverse options across different playstyles.'),
+            (0.7, "High Confidence - Strong match in top positions with good diversity. You'll likely be satisfied "
+                  "with the top 2-3 picks."),
+            (0.5, 'Medium Confidence - Decent matches found, with variety in the recommendations. Consider '
+                  'exploring multiple options.'),
+            (None, "Lower Confidence - Your preferences suggest diverse possibilities. We're prioritizing variety to "
+                   "help you discover new champions.")],
+}
+METRIC_TEMPLATES = {
+    'p1': "Your top recommendation has a {percentage}% match with your preferences. {verdict} We found {relevant} relevant champions total.",
+    'p3': "{percentage}% of your top 3 recommendations match your preferences. {verdict} {relevant} champions matched your criteria.",
+    'p5': "{percentage}% of your top 10 recommendations are relevant to your playstyle. {verdict} Total relevant: {relevant} champions.",
+    'mrr': "Confidence Score: {percentage}%. {verdict} {relevant} relevant champions found across the pool.",
+}
+DEFAULT_METRIC_TEMPLATE = "Score: {percentage}% with {relevant} relevant champions found."
+
+
+def tier_verdict(metric, value):
+    return next(text for lowest, text in METRIC_TIERS[metric] if lowest is None or value >= lowest)
+
+
+def champion_reasons(preferences, champion_data, strong=PAGE_STRONG):
+    reasons = []
+    if preferences.get('role') == champion_data['role']:
+        reasons.append(f"perfect {champion_data['role']} role fit")
+    attribute, phrase = PLAYSTYLE_REASONS.get(preferences.get('playstyle'), (None, None))
+    if attribute and champion_data[attribute] >= strong:
+        reasons.append(phrase)
+    if champion_data['mobility'] >= strong:
+        reasons.append('high mobility for outplays')
+    return ' and '.join(reasons[:2]) if reasons else f"{champion_data['role']} playstyle"
+
+
+# Naive assembly, as the page does it per request
+
+def fallback_explanation(champion_name, preferences, champion_data, strong=PAGE_STRONG):
+    """generateFallbackExplanation: every part of the sentence rebuilt per call"""
+    reason_text = champion_reasons(preferences, champion_data, strong)
+    offers = 'strong damage potential' if champion_data['damage'] >= strong else 'reliable performance'
+    return (f"{champion_name} is an excellent choice for you with {reason_text}. This champion offers {offers} "
+            f"and scales well into late game.")
+
+
+def metric_fallback_explanation(metric, value, relevant_count):
+    """generateMetricFallbackExplanation"""
+    percentage = f"{value * 100:.1f}"
+    if metric not in METRIC_TEMPLATES:
+        return f"Score: {percentage}% with {relevant_count} relevant champions found."
+    return METRIC_TEMPLATES[metric].format(percentage=percentage, verdict=tier_verdict(metric, value),
+                                           relevant=relevant_count)
+
+
+# Compiled templates
+
+class SlotTemplate:
+    """Template text whose static fields are rendered at compile time; the remaining {slots} are
+    filled per request by joining them between the pre-rendered literal pieces"""
+
+    __slots__ = ('literals', 'slots')
+
+    def __init__(self, text, static=None):
+        static = static or {}
+        literals, slots, pending = [], [], ''
+        for literal, field, spec, conversion in Formatter().parse(text):
+            pending += literal
+            if field is None:
+                continue
+            if field in static:
+                pending += format(static[field], spec or '')
+            else:
+                literals.append(pending)
+                slots.append(field)
+                pending = ''
+        literals.append(pending)
+        self.literals = tuple(literals)
+        self.slots = tuple(slots)
+
+    def fill(self, *values):
+        """Values in slot order"""
+        if len(values) == 1:
+            return ''.join((self.literals[0], values[0], self.literals[1]))
+        parts = [self.literals[0]]
+        for value, literal in zip(values, self.literals[1:]):
+            parts.append(value)
+            parts.append(literal)
+        return ''.join(parts)
+
+
+class ChampionExplainer:
+    """One champion's fallback explanation with everything but the reason phrase pre-rendered.
+
+    The reason phrase only depends on whether the role matches and on the
+    playstyle, so its slot is filled for each of those ten combinations at
+    compile time and a request is two dictionary lookups.
+    """
+
+    __slots__ = ('role', 'rendered')
+
+    def __init__(self, champion_name, champion_data, strong=PAGE_STRONG):
+        self.role = champion_data['role']
+        offers = 'strong damage potential' if champion_data['damage'] >= strong else 'reliable performance'
+        template = SlotTemplate(CHAMPION_TEMPLATE, {'name': champion_name, 'offers': offers})
+        self.rendered = {}
+        for role_match in (True, False):
+            role = self.role if role_match else None
+            for playstyle in list(PLAYSTYLE_REASONS) + [None]:
+                reasons = champion_reasons({'role': role, 'playstyle': playstyle}, champion_data, strong)
+                self.rendered[role_match, playstyle] = template.fill(reasons)
+
+    def explain(self, preferences):
+        key = (preferences.get('role') == self.role, preferences.get('playstyle'))
+        text = self.rendered.get(key)
+        # Any other playstyle adds no reason of its own
+        return text if text is not None else self.rendered[key[0], None]
+
+
+class MetricExplainer:
+    """One metric's fallback explanation pre-rendered per score tier, with percentage and count slots"""
+
+    __slots__ = ('tiers', 'last')
+
+    def __init__(self, metric):
+        if metric in METRIC_TEMPLATES:
+            tiers = [(lowest, SlotTemplate(METRIC_TEMPLATES[metric], {'verdict': verdict}).literals)
+                     for lowest, verdict in METRIC_TIERS[metric]]
+        else:
+            tiers = [(None, SlotTemplate(DEFAULT_METRIC_TEMPLATE).literals)]
+        # Bounded tiers are checked in order; the open-ended lowest tier is the fallthrough
+        self.tiers = tuple(tiers[:-1])
+        self.last = tiers[-1][1]
+
+    def explain(self, value, relevant_count):
+        literals = self.last
+        for lowest, tier_literals in self.tiers:
+            if value >= lowest:
+                literals = tier_literals
+                break
+        first, middle, last = literals
+        return ''.join((first, f"{value * 100:.1f}", middle, str(relevant_count), last))
+
+
+class FallbackExplainer:
+    """Compiled explainers for a whole roster and every metric"""
+
+    def __init__(self, champions, strong=PAGE_STRONG):
+        """`champions` maps champion name -> data with role, damage, toughness, utility and mobility"""
+        self.champions = {name: ChampionExplainer(name, data, strong) for name, data in champions.items()}
+        self.metrics = {metric: MetricExplainer(metric) for metric in METRIC_TEMPLATES}
+        self._default_metric = MetricExplainer(None)
+
+    def champion(self, champion_name, preferences):
+        return self.champions[champion_name].explain(preferences)
+
+    def metric(self, metric, value, relevant_count):
+        return (self.metrics.get(metric) or self._default_metric).explain(value, relevant_count)
+
+
+def roster_champion_data(champions):
+    """{name: data} from roster records; the role is the herotype and ratings are on the 1-3 scale"""
+    return {c['name']: {'role': c.get('herotype') or c.get('role'),
+                        **{a: c.get('attributes', {}).get(a, 2.0) for a in ATTRIBUTES}}
+            for c in champions}
+
+
+def random_requests(champion_data, n, seed=0):
+    rng = random.Random(seed)
+    names = list(champion_data)
+    roles = sorted({data['role'] for data in champion_data.values()}) + ['No Preference']
+    playstyles = list(PLAYSTYLE_REASONS) + ['Balanced/Hybrid']
+    champion_requests = [(rng.choice(names), {'role': rng.choice(roles), 'playstyle': rng.choice(playstyles)})
+                         for _ in range(n)]
+    metric_requests = [(rng.choice(list(METRIC_TEMPLATES)), rng.randint(0, 20) / 20, rng.randint(0, 171))
+                       for _ in range(n)]
+    return champion_requests, metric_requests
+
+
+def benchmark(champion_data, n, strong):
+    champion_requests, metric_requests = random_requests(champion_data, n)
+
+    start = time.perf_counter()
+    explainer = FallbackExplainer(champion_data, strong)
+    compile_time = time.perf_counter() - start
+
+    timings = {}
+    start = time.perf_counter()
+    naive_champions = [fallback_explanation(name, prefs, champion_data[name], strong)
+                       for name, prefs in champion_requests]
+    timings['champion', 'naive'] = time.perf_counter() - start
+    start = time.perf_counter()
+    compiled_champions = [explainer.champion(name, prefs) for name, prefs in champion_requests]
+    timings['champion', 'compiled'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive_metrics = [metric_fallback_explanation(*request) for request in metric_requests]
+    timings['metric', 'naive'] = time.perf_counter() - start
+    start = time.perf_counter()
+    compiled_metrics = [explainer.metric(*request) for request in metric_requests]
+    timings['metric', 'compiled'] = time.perf_counter() - start
+
+    mismatches = sum(a != b for a, b in zip(naive_champions, compiled_champions)) + \
+        sum(a != b for a, b in zip(naive_metrics, compiled_metrics))
+
+    print("\n" + "=" * 66)
+    print(f"{'Explanation':<14}{'Naive (ns)':>14}{'Compiled (ns)':>16}{'Speedup':>10}{'Per second':>12}")
+    print("-" * 66)
+    for kind in ('champion', 'metric'):
+        naive, compiled = timings[kind, 'naive'] / n * 1e9, timings[kind, 'compiled'] / n * 1e9
+        print(f"{kind:<14}{naive:>14.0f}{compiled:>16.0f}{naive / compiled:>9.1f}x{1e9 / compiled:>12,.0f}")
+    print("=" * 66)
+    print(f"{n:,} requests each; compiled {len(explainer.champions)} champions in {compile_time * 1000:.1f} ms; "
+          f"{mismatches} mismatched outputs")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compiled fallback explanations for batch runs.')
+    parser.add_argument('--roster', default=CHAMPIONS_PATH)
+    parser.add_argument('--champion', help='Print the explanation for this champion name')
+    parser.add_argument('--role', default='No Preference')
+    parser.add_argument('--playstyle', default='Balanced/Hybrid')
+    parser.add_argument('--metric', choices=sorted(METRIC_TEMPLATES), help='Print the explanation for this metric')
+    parser.add_argument('--value', type=float, default=0.5, help='Metric value, 0-1')
+    parser.add_argument('--relevant', type=int, default=10, help='Relevant champions found')
+    parser.add_argument('--benchmark', type=int, metavar='N', help='Time N requests, naive against compiled')
+    args = parser.parse_args()
+
+    champion_data = roster_champion_data(load_champions(args.roster))
+    if args.benchmark:
+        if benchmark(champion_data, args.benchmark, ROSTER_STRONG):
+            raise SystemExit(1)
+        return
+    if not args.champion and not args.metric:
+        parser.error("pass --champion, --metric or --benchmark")
+
+    explainer = FallbackExplainer(champion_data, ROSTER_STRONG)
+    if args.champion:
+        if args.champion not in explainer.champions:
+            parser.error(f"unknown champion: {args.champion}")
+        print(explainer.champion(args.champion, {'role': args.role, 'playstyle': args.playstyle}))
+    if args.metric:
+        print(explainer.metric(args.metric, args.value, args.relevant))
+
+
+if __name__ == "__main__":
+    main()
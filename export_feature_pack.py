@@ -0,0 +1,247 @@
+"""
+Champion Feature Pack Exporter
+LoL Champion Recommender System
+Writes the roster's scoring features as one little-endian binary file that a
+browser can view directly as typed arrays instead of walking champion objects:
+
+    header     40 bytes, see HEADER
+    floats     Float32Array(count * n_float), row-major, one row per champion
+    bytes      Uint8Array(count * n_u8), row-major
+    names      Uint32Array(count) end offsets, then UTF-8 "id<TAB>name" strings
+    meta       UTF-8 JSON: feature names and the role/range/position vocabularies
+
+The role byte encodes `herotype`; the roster's `role` field is 'Fighter' for
+every champion and carries no information
+
+Every block starts on a 4-byte boundary so Float32Array/Uint32Array views can
+be created over the fetched ArrayBuffer without copying
+"""
+
+from champion_data import ATTRIBUTES, CHAMPIONS_PATH, DATA_DIR, load_champions, parse_set_literal
+import argparse
+import gzip
+import json
+import os
+import struct
+import time
+import numpy as np
+
+MAGIC = b'LOLF'
+VERSION = 1
+# magic, version, reserved, count, n_float, n_u8,
+# float_offset, u8_offset, names_offset, names_length, meta_offset, meta_length
+HEADER = struct.Struct('<4sHHIHHIIIIII')
+
+FLOAT_FEATURES = list(ATTRIBUTES) + ['difficulty']
+U8_FEATURES = ['difficulty', 'role', 'range_type', 'positions']
+
+DEFAULT_OUTPUT = os.path.join(DATA_DIR, 'roster', 'features.bin')
+
+
+def _align(offset):
+    return (offset + 3) & ~3
+
+
+def champion_role(champion):
+    return champion.get('herotype') or 'Unknown'
+
+
+def build_vocabularies(champions):
+    return {
+        'role': sorted({champion_role(c) for c in champions}),
+        'range_type': sorted({c.get('range_type') or 'Unknown' for c in champions}),
+        # Bit i of the positions byte is set when the champion plays positions[i]
+        'positions': sorted({p for c in champions for p in parse_set_literal(c.get('position'))}),
+    }
+
+
+def encode_features(champions, vocab):
+    """Return (float32 matrix, uint8 matrix) in roster order"""
+    floats = np.empty((len(champions), len(FLOAT_FEATURES)), dtype='<f4')
+    small = np.zeros((len(champions), len(U8_FEATURES)), dtype=np.uint8)
+    role_index = {name: i for i, name in enumerate(vocab['role'])}
+    range_index = {name: i for i, name in enumerate(vocab['range_type'])}
+    position_bit = {name: 1 << i for i, name in enumerate(vocab['positions'])}
+    if len(position_bit) > 8:
+        raise ValueError(f"{len(position_bit)} positions do not fit in one byte")
+
+    for row, champion in enumerate(champions):
+        attributes = champion.get('attributes', {})
+        floats[row] = [attributes.get(name, 0.0) for name in FLOAT_FEATURES]
+        small[row, 0] = champion.get('difficulty') or 0
+        small[row, 1] = role_index[champion_role(champion)]
+        small[row, 2] = range_index[champion.get('range_type') or 'Unknown']
+        for position in parse_set_literal(champion.get('position')):
+            small[row, 3] |= position_bit[position]
+    return floats, small
+
+
+def pack_features(champions):
+    """Serialize the roster into the feature pack format; returns bytes"""
+    vocab = build_vocabularies(champions)
+    floats, small = encode_features(champions, vocab)
+
+    encoded_names = [f"{c['id']}\t{c['name']}".encode('utf-8') for c in champions]
+    ends = np.cumsum([len(n) for n in encoded_names], dtype='<u4')
+    names = ends.tobytes() + b''.join(encoded_names)
+    meta = json.dumps({'float_features': FLOAT_FEATURES, 'u8_features': U8_FEATURES, **vocab},
+                      separators=(',', ':')).encode('utf-8')
+
+    float_offset = _align(HEADER.size)
+    u8_offset = _align(float_offset + floats.nbytes)
+    names_offset = _align(u8_offset + small.nbytes)
+    meta_offset = _align(names_offset + len(names))
+
+    buffer = bytearray(meta_offset + len(meta))
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, 0, len(champions), len(FLOAT_FEATURES), len(U8_FEATURES),
+                     float_offset, u8_offset, names_offset, len(names), meta_offset, len(meta))
+    buffer[float_offset:float_offset + floats.nbytes] = floats.tobytes()
+    buffer[u8_offset:u8_offset + small.nbytes] = small.tobytes()
+    buffer[names_offset:names_offset + len(names)] = names
+    buffer[meta_offset:] = meta
+    return bytes(buffer)
+
+
+def patch_features(data, champions, rows):
+    """Re-encode only the given roster rows into an existing pack.
+
+    Returns the patched bytes, or None when the pack cannot be patched in
+    place (different champion count, names or vocabularies) and must be
+    rebuilt with pack_features.
+    """
+    pack = unpack_features(data)
+    vocab = build_vocabularies(champions)
+    if len(pack['ids']) != len(champions) or any(pack['meta'][k] != vocab[k] for k in vocab):
+        return None
+    rows = sorted(rows)
+    if any(pack['ids'][r] != champions[r]['id'] or pack['names'][r] != champions[r]['name'] for r in rows):
+        return None
+    floats, small = encode_features([champions[r] for r in rows], vocab)
+    _, _, _, _, n_float, n_u8, float_offset, u8_offset = HEADER.unpack_from(data, 0)[:8]
+    buffer = bytearray(data)
+    for i, row in enumerate(rows):
+        start = float_offset + row * n_float * 4
+        buffer[start:start + n_float * 4] = floats[i].tobytes()
+        start = u8_offset + row * n_u8
+        buffer[start:start + n_u8] = small[i].tobytes()
+    return bytes(buffer)
+
+
+def unpack_features(data):
+    """Parse a feature pack without copying the numeric blocks.
+
+    Returns a dict with ids, names, floats (count x n_float), u8 (count x n_u8)
+    and meta.
+    """
+    (magic, version, _, count, n_float, n_u8, float_offset, u8_offset,
+     names_offset, names_length, meta_offset, meta_length) = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a champion feature pack")
+    if version != VERSION:
+        raise ValueError(f"unsupported feature pack version {version}")
+
+    floats = np.frombuffer(data, dtype='<f4', count=count * n_float, offset=float_offset).reshape(count, n_float)
+    small = np.frombuffer(data, dtype=np.uint8, count=count * n_u8, offset=u8_offset).reshape(count, n_u8)
+    ends = np.frombuffer(data, dtype='<u4', count=count, offset=names_offset)
+    # Offsets count bytes, so slice before decoding to keep multi-byte names aligned
+    raw = bytes(data[names_offset + 4 * count:names_offset + names_length])
+    starts = np.concatenate(([0], ends[:-1]))
+    entries = [raw[s:e].decode('utf-8').split('\t', 1) for s, e in zip(starts, ends)]
+    meta = json.loads(bytes(data[meta_offset:meta_offset + meta_length]))
+    return {
+        'ids': [e[0] for e in entries],
+        'names': [e[1] for e in entries],
+        'floats': floats,
+        'u8': small,
+        'meta': meta,
+    }
+
+
+def verify_round_trip(champions, data):
+    """Check every value in the pack against the roster; returns a list of problems"""
+    pack = unpack_features(data)
+    vocab = build_vocabularies(champions)
+    floats, small = encode_features(champions, vocab)
+    problems = []
+    if pack['ids'] != [c['id'] for c in champions]:
+        problems.append("champion ids differ")
+    if pack['names'] != [c['name'] for c in champions]:
+        problems.append("champion names differ")
+    if not np.array_equal(pack['floats'], floats):
+        problems.append("float features differ")
+    if not np.array_equal(pack['u8'], small):
+        problems.append("byte features differ")
+    for key in ('role', 'range_type', 'positions'):
+        if pack['meta'][key] != vocab[key]:
+            problems.append(f"{key} vocabulary differs")
+    # A constant role column cannot separate anything in role matching
+    role_column = U8_FEATURES.index('role')
+    if len(champions) > 1 and len(np.unique(pack['u8'][:, role_column])) == 1:
+        problems.append(f"role column is constant ({pack['meta']['role'][pack['u8'][0, role_column]]})")
+    # The attributes the engines actually read must survive float32 exactly
+    for row, champion in enumerate(champions):
+        attributes = champion.get('attributes', {})
+        for col, name in enumerate(FLOAT_FEATURES):
+            if float(pack['floats'][row, col]) != float(attributes.get(name, 0.0)):
+                problems.append(f"{champion['id']}.{name} does not round-trip")
+    return problems
+
+
+def json_features(text):
+    """What a client does with the JSON today: parse it and pull features off each object"""
+    champions = json.loads(text)['champions']
+    return np.array([[c['attributes'][name] for name in FLOAT_FEATURES] for c in champions], dtype=np.float32)
+
+
+def compare(roster_path, data, repeat=200):
+    """Print size and parse time of the JSON roster against the feature pack"""
+    with open(roster_path, 'rb') as f:
+        text = f.read()
+
+    def best_of(fn):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    json_time = best_of(lambda: json_features(text))
+    pack_time = best_of(lambda: unpack_features(data)['floats'])
+
+    print("\n" + "=" * 60)
+    print(f"{'Format':<16}{'Bytes':>10}{'gzip':>10}{'Parse (us)':>14}")
+    print("-" * 60)
+    print(f"{'JSON roster':<16}{len(text):>10}{len(gzip.compress(text, 9)):>10}{json_time * 1e6:>14.1f}")
+    print(f"{'Feature pack':<16}{len(data):>10}{len(gzip.compress(data, 9)):>10}{pack_time * 1e6:>14.1f}")
+    print("=" * 60)
+    print(f"{len(text) / len(data):.1f}x smaller, {json_time / pack_time:.1f}x faster to parse")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export champion scoring features as a binary typed-array pack.')
+    parser.add_argument('--roster', default=CHAMPIONS_PATH)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--compare', action='store_true', help='Compare size and parse time with the JSON roster')
+    args = parser.parse_args()
+
+    champions = load_champions(args.roster)
+    data = pack_features(champions)
+    problems = verify_round_trip(champions, data)
+    if problems:
+        for problem in problems[:20]:
+            print(f"  {problem}")
+        raise SystemExit(f"Round-trip verification failed with {len(problems)} problems")
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'wb') as f:
+        f.write(data)
+    print(f"Wrote {len(champions)} champions x {len(FLOAT_FEATURES)} float + {len(U8_FEATURES)} byte features "
+          f"({len(data)} bytes) to {args.output}; round trip verified")
+
+    if args.compare:
+        compare(args.roster, data)
+
+
+if __name__ == "__main__":
+    main()
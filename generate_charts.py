@@ -1,5 +1,7 @@
 import matplotlib.pyplot as plt
+import argparse
 import json
+import metrics
 import os
 from collections import Counter
 import numpy as np
@@ -13,6 +15,10 @@ colors_pie_range = ['#e74c3c', '#3498db'] # Red for Melee, Blue for Ranged
 colors_pie_diff = ['#1abc9c', '#3498db', '#e74c3c'] # Green (Low), Blue (Med), Red (High)
 color_line = '#9b59b6'
 
+def save_chart(filename):
+    with metrics.CHART_SECONDS.labels(os.path.splitext(filename)[0]).time():
+        plt.savefig(filename, dpi=100, bbox_inches='tight')
+
 def load_data():
     file_path = 'src/data/champions.json'
     if not os.path.exists(file_path):
@@ -42,7 +48,7 @@ def create_charts():
     plt.title('Champions per Hero Type', fontsize=16, pad=20)
     plt.ylabel('Number of Champions')
     plt.grid(axis='y', alpha=0.3)
-    plt.savefig('chart_hero_type.png', dpi=100, bbox_inches='tight')
+    save_chart('chart_hero_type.png')
     plt.close()
 
     # 2. Melee vs. Ranged (Pie Chart)
@@ -53,7 +59,7 @@ def create_charts():
     plt.pie(range_counts.values(), labels=range_counts.keys(), autopct='%1.1f%%', 
             colors=colors_pie_range, startangle=90)
     plt.title('Melee vs. Ranged', fontsize=16)
-    plt.savefig('chart_range_type.png', dpi=100, bbox_inches='tight')
+    save_chart('chart_range_type.png')
     plt.close()
 
     # 3. Resource Types (Bar Chart) - Simulated based on analytics.html logic
@@ -73,7 +79,7 @@ def create_charts():
     plt.title('Resource Types', fontsize=16, pad=20)
     plt.ylabel('Number of Champions')
     plt.grid(axis='y', alpha=0.3)
-    plt.savefig('chart_resource_type.png', dpi=100, bbox_inches='tight')
+    save_chart('chart_resource_type.png')
     plt.close()
 
     # 4. Champion Difficulty Distribution (Pie Chart)
@@ -88,7 +94,7 @@ def create_charts():
     plt.pie(d_values, labels=d_labels, autopct='%1.1f%%', 
             colors=colors_pie_diff, startangle=140)
     plt.title('Champion Difficulty Distribution', fontsize=16)
-    plt.savefig('chart_difficulty.png', dpi=100, bbox_inches='tight')
+    save_chart('chart_difficulty.png')
     plt.close()
 
     # 5. Champions Released by Year (Line Chart)
@@ -100,10 +106,44 @@ def create_charts():
     plt.title('Champions Released by Year', fontsize=16, pad=20)
     plt.ylabel('Champions Released')
     plt.grid(True, alpha=0.3)
-    plt.savefig('chart_release_year.png', dpi=100, bbox_inches='tight')
+    save_chart('chart_release_year.png')
     plt.close()
 
     print("All charts generated successfully.")
 
+def create_metrics_charts(snapshot_path=os.path.join(metrics.DEFAULT_METRICS_DIR, metrics.JSON_FILE)):
+    """Plot mean and p95 of every timing histogram in an exported metrics snapshot"""
+    snapshot = metrics.load_snapshot(snapshot_path)
+    for name, metric in snapshot['metrics'].items():
+        samples = [s for s in metric['samples'] if metric['type'] == 'histogram' and s['count']]
+        if not samples:
+            continue
+        labels = [','.join(s['labels'].values()) or name for s in samples]
+        means = [s['sum'] / s['count'] for s in samples]
+        p95s = [metrics.histogram_quantile(s['buckets'], 0.95) for s in samples]
+        y = np.arange(len(samples))
+
+        plt.figure(figsize=(10, max(3, 0.4 * len(samples) + 1.5)))
+        plt.barh(y - 0.2, means, height=0.4, color=colors_bar[1], label='Mean')
+        plt.barh(y + 0.2, p95s, height=0.4, color=colors_bar[0], label='p95 (bucket estimate)')
+        plt.yticks(y, labels)
+        plt.xlabel('Seconds')
+        plt.title(metric['help'], fontsize=16, pad=20)
+        plt.legend()
+        plt.grid(axis='x', alpha=0.3)
+        save_chart(f"chart_metrics_{name}.png")
+        plt.close()
+        print(f"Metrics chart saved to chart_metrics_{name}.png")
+
 if __name__ == "__main__":
-    create_charts()
+    parser = argparse.ArgumentParser(description='Generate the roster charts, or plot an exported metrics snapshot.')
+    parser.add_argument('--metrics-charts', metavar='SNAPSHOT', nargs='?',
+                        const=os.path.join(metrics.DEFAULT_METRICS_DIR, metrics.JSON_FILE),
+                        help='Only plot the timing histograms in SNAPSHOT as chart_metrics_*.png')
+    args = parser.parse_args()
+    if args.metrics_charts:
+        if not os.path.exists(args.metrics_charts):
+            parser.error(f"{args.metrics_charts} not found; run a build with --metrics first")
+        create_metrics_charts(args.metrics_charts)
+    else:
+        create_charts()
@@ -1,7 +1,15 @@
 from fpdf import FPDF
+from report_image_cache import ImageCache
+from report_profiler import ReportProfiler, profile_path_for
 import os
+import sys
 
 class PDF(FPDF):
+    def __init__(self, image_cache=None):
+        super().__init__()
+        # Optional ImageCache that resamples charts to print resolution before embedding
+        self.image_cache = image_cache
+
     def header(self):
         self.set_font('Arial', 'B', 15)
         self.cell(0, 10, 'Champion Analysis Report', 0, 1, 'C')
@@ -29,6 +37,8 @@ class PDF(FPDF):
         
         # Add Image
         if os.path.exists(image_path):
+            if self.image_cache:
+                image_path = self.image_cache.prepare(image_path, 180 / 25.4)
             # Center image
             self.image(image_path, x=15, w=180)
             self.ln(5)
@@ -43,8 +53,10 @@ class PDF(FPDF):
         self.multi_cell(0, 5, explanation)
         self.ln(10)
 
-def generate_pdf():
-    pdf = PDF()
+def generate_pdf(image_cache=None, output_path='Champion_Analysis_Report.pdf', profiler=None):
+    pdf = PDF(image_cache)
+    if profiler:
+        profiler.instrument_fpdf(pdf)
     pdf.alias_nb_pages()
     
     # Title Page
@@ -134,9 +146,14 @@ def generate_pdf():
     )
 
     # Save
-    output_path = 'Champion_Analysis_Report.pdf'
     pdf.output(output_path, 'F')
     print(f"PDF generated successfully: {output_path}")
+    if image_cache:
+        print(image_cache.summary())
+    if profiler:
+        print(profiler.finish())
 
 if __name__ == "__main__":
-    generate_pdf()
+    output_path = 'Champion_Analysis_Report.pdf'
+    generate_pdf(ImageCache() if '--image-cache' in sys.argv else None, output_path,
+                 ReportProfiler('champion_analysis', profile_path_for(output_path)) if '--profile' in sys.argv else None)
@@ -1,5 +1,7 @@
 from fpdf import FPDF
+from report_profiler import ReportProfiler, profile_path_for
 import datetime
+import sys
 
 class ProjectSummaryPDF(FPDF):
     def header(self):
@@ -41,8 +43,10 @@ class ProjectSummaryPDF(FPDF):
             self.multi_cell(0, 5, point)
         self.ln()
 
-def generate_report():
+def generate_report(output_filename='Project_Summary_Report.pdf', profiler=None):
     pdf = ProjectSummaryPDF()
+    if profiler:
+        profiler.instrument_fpdf(pdf)
     pdf.alias_nb_pages()
     pdf.add_page()
     
@@ -95,9 +99,11 @@ def generate_report():
     pdf.bullet_points(future_work)
     
     # --- Output ---
-    output_filename = 'Project_Summary_Report.pdf'
     pdf.output(output_filename, 'F')
     print(f"Successfully generated report: {output_filename}")
+    if profiler:
+        print(profiler.finish())
 
 if __name__ == '__main__':
-    generate_report()
+    generate_report(profiler=ReportProfiler('project_summary', profile_path_for('Project_Summary_Report.pdf'))
+                    if '--profile' in sys.argv else None)
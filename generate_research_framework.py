@@ -1,10 +1,22 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from fpdf import FPDF
+from fpdf import FPDF, FPDF_VERSION
+from report_image_cache import ImageCache
+from report_profiler import ReportProfiler, profile_path_for
 import datetime
+import metrics
+import os
+import sys
+
+# fpdf2 (2.x) can embed SVG files as vector paths; the classic 1.7 release cannot
+FPDF_SUPPORTS_SVG = int(FPDF_VERSION.split('.')[0]) >= 2
 
 def create_framework_diagram(filename='framework_diagram.png'):
-    """Generates a detailed Research Framework Diagram using Matplotlib."""
+    """Generates a detailed Research Framework Diagram using Matplotlib.
+
+    The output format follows the file extension, so passing a .svg name
+    produces a vector diagram instead of a 300 dpi raster.
+    """
     fig, ax = plt.subplots(figsize=(14, 8))
     ax.axis('off')
     
@@ -70,7 +82,9 @@ def create_framework_diagram(filename='framework_diagram.png'):
     ax.annotate('', xy=(0.90, 0.60), xytext=(0.86, 0.60), arrowprops=arrow_args)
 
     plt.tight_layout()
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    with metrics.CHART_SECONDS.labels('framework_diagram').time():
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+    plt.close(fig)
     print(f"Detailed Diagram saved to {filename}")
 
 class ResearchFrameworkPDF(FPDF):
@@ -99,13 +113,23 @@ class ResearchFrameworkPDF(FPDF):
         self.multi_cell(0, 5, body)
         self.ln()
 
-def generate_report():
+def generate_report(vector=False, output_filename='Research_Framework.pdf', image_cache=None, diagram_dir='.',
+                    profiler=None):
     # 1. Create Diagram
-    diagram_filename = 'framework_diagram.png'
-    create_framework_diagram(diagram_filename)
+    if vector and not FPDF_SUPPORTS_SVG:
+        print(f"fpdf {FPDF_VERSION} cannot embed SVG; install fpdf2 for vector mode. Using PNG.")
+        vector = False
+    diagram_filename = os.path.join(diagram_dir, 'framework_diagram.svg' if vector else 'framework_diagram.png')
+    if profiler:
+        with profiler.phase('framework diagram'):
+            create_framework_diagram(diagram_filename)
+    else:
+        create_framework_diagram(diagram_filename)
 
     # 2. Create PDF
     pdf = ResearchFrameworkPDF()
+    if profiler:
+        profiler.instrument_fpdf(pdf)
     pdf.alias_nb_pages()
     pdf.add_page()
 
@@ -119,6 +143,8 @@ def generate_report():
 
     # --- Framework Diagram ---
     pdf.chapter_title("2. Research Framework Diagram")
+    if image_cache and not vector:
+        diagram_filename = image_cache.prepare(diagram_filename, 190 / 25.4)
     pdf.image(diagram_filename, x=10, w=190)
     pdf.ln(5)
     pdf.set_font('Arial', 'I', 9)
@@ -171,9 +197,15 @@ def generate_report():
     )
     pdf.ln(5)
 
-    output_filename = 'Research_Framework.pdf'
-    pdf.output(output_filename, 'F')
+    pdf.output(output_filename)
     print(f"Successfully generated report: {output_filename}")
+    if image_cache:
+        print(image_cache.summary())
+    if profiler:
+        print(profiler.finish())
 
 if __name__ == '__main__':
-    generate_report()
+    generate_report(vector='--vector' in sys.argv,
+                    image_cache=ImageCache() if '--image-cache' in sys.argv else None,
+                    profiler=ReportProfiler('research_framework', profile_path_for('Research_Framework.pdf'))
+                    if '--profile' in sys.argv else None)
@@ -0,0 +1,294 @@
+"""
+Synthetic Data Generator
+LoL Champion Recommender System
+Fits the archived champion CSV (herotype, range, resource, damage type,
+positions, difficulty and the 1-3 attributes) and samples arbitrarily large
+synthetic rosters and questionnaire-answer populations from it for load
+testing the engines, analytics and benchmarks.
+
+Champions are drawn from the empirical joint distribution, with each field
+independently re-drawn from another champion of the same herotype with
+probability --novelty, which keeps the per-herotype marginals while creating
+combinations the real roster does not have. Users pick a real champion they
+have in mind and answer the roster-backed questions consistently with it,
+except with probability --noise; the psychological questions are uniform.
+
+Rows are produced in fixed-size chunks, each seeded from (seed, kind, chunk),
+so the output is identical for any number of workers. Output is either NDJSON
+shards or one .npy column per field that workers fill in place
+"""
+
+from champion_data import ATTRIBUTES, CSV_PATH, DATA_DIR, load_champion_csv, parse_set_literal
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import time
+import numpy as np
+
+QUESTIONS_PATH = os.path.join(DATA_DIR, 'questions.json')
+DEFAULT_OUTPUT_DIR = 'synthetic_data'
+CHUNK_ROWS = 100_000
+NO_PREFERENCE = 'No Preference'
+
+CATEGORICAL = ('herotype', 'range_type', 'resource', 'damage_type')
+CSV_COLUMNS = {'herotype': 'herotype', 'range_type': 'rangetype', 'resource': 'resource',
+               'damage_type': 'adaptivetype'}
+NUMERIC = ('difficulty',) + ATTRIBUTES
+# Every sampled field; positions is a bitmask over model['positions_vocab']
+FIELDS = CATEGORICAL + ('positions',) + NUMERIC
+KIND_SEEDS = {'champions': 0, 'users': 1}
+
+# How a user who has a champion in mind answers the roster-backed questions
+DIFFICULTY_OPTIONS = {1: ['Easy (1-3)'], 2: ['Medium (4-6)'], 3: ['Hard (7-8)', 'Very Hard (9-10)']}
+POSITION_OPTIONS = {'Top': 'Top', 'Jungle': 'Jungle', 'Middle': 'Mid', 'Bottom': 'Bot', 'Support': 'Support'}
+PLAYSTYLE_OPTIONS = {
+    'Tank': ['Tanky and Durable'],
+    'Fighter': ['High Damage Output', 'Tanky and Durable', 'Balanced/Hybrid'],
+    'Assassin': ['High Damage Output'],
+    'Marksman': ['High Damage Output'],
+    'Mage': ['High Damage Output', 'Support Team', 'Balanced/Hybrid'],
+    'Support': ['Support Team', 'Balanced/Hybrid'],
+}
+
+
+def fit_model(rows, questions, noise=0.15):
+    """Encode the CSV into code arrays plus per-question answer distributions"""
+    rows = sorted(rows.values(), key=lambda r: r['herotype'])
+    model = {'count': len(rows)}
+    for field in CATEGORICAL:
+        vocab = sorted({r[CSV_COLUMNS[field]] or 'Unknown' for r in rows})
+        model[field + '_vocab'] = vocab
+        model[field] = np.array([vocab.index(r[CSV_COLUMNS[field]] or 'Unknown') for r in rows], dtype=np.uint8)
+    position_sets = [parse_set_literal(r['positions']) for r in rows]
+    model['positions_vocab'] = sorted({p for s in position_sets for p in s})
+    bit = {p: 1 << i for i, p in enumerate(model['positions_vocab'])}
+    model['positions'] = np.array([sum(bit[p] for p in s) for s in position_sets], dtype=np.uint8)
+    for field in NUMERIC:
+        model[field] = np.array([int(r[field]) for r in rows], dtype=np.uint8)
+
+    # Rows are sorted by herotype, so each herotype is one contiguous group of donors
+    _, model['group_start'], model['group_size'] = np.unique(model['herotype'], return_index=True,
+                                                             return_counts=True)
+
+    model['questions'] = [{'id': q['id'], 'options': q['options'],
+                           'cumulative': np.cumsum(answer_distribution(q, rows, position_sets, noise), axis=1)}
+                          for q in questions]
+    return model
+
+
+def answer_distribution(question, rows, position_sets, noise):
+    """(champions x options) probability that a user thinking of each champion picks each option"""
+    options = question['options']
+    uniform = np.full(len(options), 1.0 / len(options))
+    consistent = []
+    for row, positions in zip(rows, position_sets):
+        feature = question.get('feature_mapping')
+        if feature == 'difficulty':
+            picks = DIFFICULTY_OPTIONS.get(int(row['difficulty']), [])
+        elif feature == 'role':
+            picks = [row['herotype']]
+        elif feature == 'position':
+            picks = [POSITION_OPTIONS[p] for p in positions if p in POSITION_OPTIONS]
+        elif feature == 'playstyle':
+            picks = PLAYSTYLE_OPTIONS.get(row['herotype'], [])
+        elif feature == 'attack_range':
+            picks = [row['rangetype']]
+        elif feature == 'resource_type':
+            picks = [row['resource']]
+        elif feature == 'damage_type':
+            picks = [row['adaptivetype']]
+        else:
+            picks = []
+        picks = [p for p in picks if p in options]
+        if not picks and NO_PREFERENCE in options:
+            picks = [NO_PREFERENCE]
+        if not picks:
+            consistent.append(uniform)
+            continue
+        dist = np.zeros(len(options))
+        for pick in picks:
+            dist[options.index(pick)] += 1.0 / len(picks)
+        consistent.append((1 - noise) * dist + noise * uniform)
+    return np.array(consistent)
+
+
+def chunk_rng(seed, kind, chunk):
+    return np.random.default_rng(np.random.SeedSequence([seed, KIND_SEEDS[kind], chunk]))
+
+
+def sample_champions(model, rng, n, novelty):
+    """{field: codes} for n synthetic champions"""
+    template = rng.integers(0, model['count'], n)
+    herotype = model['herotype'][template]
+    start, size = model['group_start'][herotype], model['group_size'][herotype]
+    columns = {'herotype': herotype}
+    for field in FIELDS[1:]:
+        donor = start + (rng.random(n) * size).astype(np.int64)
+        source = np.where(rng.random(n) < novelty, donor, template)
+        columns[field] = model[field][source]
+    return columns
+
+
+def sample_users(model, rng, n):
+    """{'q<id>': option index} for n synthetic questionnaire answers"""
+    persona = rng.integers(0, model['count'], n)
+    columns = {}
+    for question in model['questions']:
+        cumulative = question['cumulative'][persona]
+        columns[f"q{question['id']}"] = (rng.random((n, 1)) > cumulative[:, :-1]).sum(axis=1).astype(np.uint8)
+    return columns
+
+
+def sample_chunk(model, kind, seed, chunk, n, novelty):
+    rng = chunk_rng(seed, kind, chunk)
+    return sample_champions(model, rng, n, novelty) if kind == 'champions' else sample_users(model, rng, n)
+
+
+def champion_records(model, columns, first_id):
+    for i in range(len(columns['herotype'])):
+        number = first_id + i
+        herotype = model['herotype_vocab'][columns['herotype'][i]]
+        mask = int(columns['positions'][i])
+        positions = [p for b, p in enumerate(model['positions_vocab']) if mask & (1 << b)]
+        yield {
+            'id': f"synthetic-{number}",
+            'name': f"Synthetic {number}",
+            'role': herotype,
+            'difficulty': int(columns['difficulty'][i]),
+            'tags': [herotype],
+            'attributes': {a: float(columns[a][i]) for a in ATTRIBUTES + ('difficulty',)},
+            'range_type': model['range_type_vocab'][columns['range_type'][i]],
+            'position': '{' + ', '.join(repr(p) for p in positions) + '}',
+            'herotype': herotype,
+            'resource': model['resource_vocab'][columns['resource'][i]],
+            'damage_type': model['damage_type_vocab'][columns['damage_type'][i]],
+        }
+
+
+def user_records(model, columns, first_id):
+    questions = model['questions']
+    for i in range(len(columns[f"q{questions[0]['id']}"])):
+        yield {
+            'id': first_id + i,
+            'answers': {str(q['id']): q['options'][columns[f"q{q['id']}"][i]] for q in questions},
+        }
+
+
+def write_chunk(task):
+    """Worker entry point: sample one chunk and write it to its shard or column slice"""
+    model, kind, fmt, output_dir, seed, chunk, start, n, novelty = task
+    columns = sample_chunk(model, kind, seed, chunk, n, novelty)
+    if fmt == 'ndjson':
+        records = champion_records if kind == 'champions' else user_records
+        path = os.path.join(output_dir, kind, f"part-{chunk:05d}.ndjson")
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records(model, columns, start):
+                f.write(json.dumps(record, separators=(',', ':')))
+                f.write('\n')
+    else:
+        for name, values in columns.items():
+            column = np.load(os.path.join(output_dir, kind, f"{name}.npy"), mmap_mode='r+')
+            column[start:start + n] = values
+            column.flush()
+            del column
+    return n
+
+
+def column_names(model, kind):
+    return list(FIELDS) if kind == 'champions' else [f"q{q['id']}" for q in model['questions']]
+
+
+def generate(model, kind, total, fmt, output_dir, seed, workers, novelty, chunk_rows=CHUNK_ROWS):
+    """Write `total` rows of one kind; returns elapsed seconds"""
+    directory = os.path.join(output_dir, kind)
+    os.makedirs(directory, exist_ok=True)
+    for filename in os.listdir(directory):
+        if filename.startswith('part-') or filename.endswith('.npy'):
+            os.remove(os.path.join(directory, filename))
+    if fmt == 'columnar':
+        for name in column_names(model, kind):
+            np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"), mode='w+',
+                                      dtype=np.uint8, shape=(total,)).flush()
+
+    tasks = [(model, kind, fmt, output_dir, seed, chunk, start, min(chunk_rows, total - start), novelty)
+             for chunk, start in enumerate(range(0, total, chunk_rows))]
+    begin = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(write_chunk, tasks))
+    else:
+        for task in tasks:
+            write_chunk(task)
+    return time.perf_counter() - begin
+
+
+def write_meta(model, output_dir, kind, total, fmt, seed, novelty, noise):
+    meta = {'kind': kind, 'rows': total, 'format': fmt, 'seed': seed, 'chunk_rows': CHUNK_ROWS,
+            'source': CSV_PATH, 'source_champions': model['count']}
+    if kind == 'champions':
+        meta['novelty'] = novelty
+        meta['columns'] = list(FIELDS)
+        meta['vocabularies'] = {f: model[f + '_vocab'] for f in CATEGORICAL + ('positions',)}
+    else:
+        meta['noise'] = noise
+        meta['questions'] = [{'column': f"q{q['id']}", 'id': q['id'], 'options': q['options']}
+                             for q in model['questions']]
+    with open(os.path.join(output_dir, kind, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+
+def print_fit(model, output_dir, sample_rows):
+    """Compare field marginals of a generated columnar roster against the source CSV"""
+    directory = os.path.join(output_dir, 'champions')
+    print("\n" + "=" * 60)
+    print(f"{'Field':<14}{'Values':>8}{'Max |p_syn - p_csv|':>24}")
+    print("-" * 60)
+    for field in FIELDS:
+        synthetic = np.load(os.path.join(directory, f"{field}.npy"), mmap_mode='r')[:sample_rows]
+        size = int(max(model[field].max(), synthetic.max())) + 1
+        p_csv = np.bincount(model[field], minlength=size) / model['count']
+        p_syn = np.bincount(synthetic, minlength=size) / len(synthetic)
+        print(f"{field:<14}{int((p_csv > 0).sum()):>8}{np.abs(p_csv - p_syn).max():>24.4f}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic rosters and questionnaire populations.')
+    parser.add_argument('--champions', type=int, default=0, help='Synthetic champions to generate')
+    parser.add_argument('--users', type=int, default=0, help='Synthetic questionnaire answers to generate')
+    parser.add_argument('--format', choices=['ndjson', 'columnar'], default='columnar')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--novelty', type=float, default=0.2,
+                        help='Chance each champion field is re-drawn within its herotype (default: 0.2)')
+    parser.add_argument('--noise', type=float, default=0.15,
+                        help="Chance a user's answer ignores the champion they have in mind (default: 0.15)")
+    parser.add_argument('--csv', default=CSV_PATH)
+    parser.add_argument('--questions', default=QUESTIONS_PATH)
+    args = parser.parse_args()
+
+    if not args.champions and not args.users:
+        parser.error("nothing to generate; pass --champions and/or --users")
+    if not 0 <= args.novelty <= 1 or not 0 <= args.noise <= 1:
+        parser.error("--novelty and --noise must be between 0 and 1")
+
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        questions = json.load(f)['questions']
+    model = fit_model(load_champion_csv(args.csv), questions, args.noise)
+    print(f"Fitted {model['count']} champions from {args.csv}")
+
+    for kind, total in (('champions', args.champions), ('users', args.users)):
+        if not total:
+            continue
+        elapsed = generate(model, kind, total, args.format, args.output_dir, args.seed, args.workers, args.novelty)
+        write_meta(model, args.output_dir, kind, total, args.format, args.seed, args.novelty, args.noise)
+        print(f"Wrote {total:,} {kind} to {os.path.join(args.output_dir, kind)} as {args.format} "
+              f"in {elapsed:.2f}s ({total / elapsed:,.0f} rows/s, {args.workers} workers)")
+    if args.champions and args.format == 'columnar':
+        print_fit(model, args.output_dir, min(args.champions, 1_000_000))
+
+
+if __name__ == "__main__":
+    main()
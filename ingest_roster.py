@@ -0,0 +1,257 @@
+"""
+Roster Patch Ingest
+LoL Champion Recommender System
+Reads a new roster dump (a Data Dragon directory with champion.json or
+championFull.json, or a CSV in the LoL_champion_data.csv layout), hashes each
+champion record against the current roster and applies only the added,
+changed and removed champions: the three champions.json copies, the roster
+index detail shards, rows of the binary feature pack, postings of the search
+index and the affected data bundles. Outputs that summarize the whole roster
+(analytics, option availability, similarity neighbors) are left to the build
+pipeline, which --build runs for just those targets.
+
+Data Dragon does not carry the curated 1-3 attributes or positions, so for a
+Data Dragon dump only name, title, herotype and range are taken from the dump
+for existing champions; new champions are seeded from its info ratings
+"""
+
+from build_data_bundles import build_bundles, canonical_bytes, content_hash
+from champion_data import (ATTRIBUTES, CHAMPIONS_PATH, DATA_DIR, load_champion_csv, load_champion_details,
+                           load_champions, name_key)
+import argparse
+import json
+import os
+import time
+
+import build_roster_index
+import champion_search
+import export_feature_pack
+import roster_snapshots
+
+# Every published copy of the roster; the first is the one the scripts read
+ROSTER_COPIES = [CHAMPIONS_PATH, os.path.join('data', 'champions.json'), os.path.join('public', 'data', 'champions.json')]
+DDRAGON_FILES = ('championFull.json', 'champion.json')
+RECORD_FIELDS = ('id', 'name', 'title', 'role', 'difficulty', 'tags', 'attributes', 'range_type', 'position',
+                 'herotype')
+# The roster's role and tags fields hold this for every champion; the class
+# lives in herotype, which every consumer reads instead
+ROSTER_ROLE = 'Fighter'
+# Data Dragon attack ranges at or below this are melee
+MELEE_RANGE = 325
+# Pipeline targets that summarize the whole roster
+AGGREGATE_TARGETS = ['analytics_data', 'option_index', 'similarity_index']
+
+
+def bucket(rating):
+    """Data Dragon 0-10 rating -> the roster's 1-3 scale"""
+    return 1 if rating <= 3 else 2 if rating <= 6 else 3
+
+
+def csv_record(row):
+    """Roster fields the CSV layout defines"""
+    return {
+        'id': name_key(row['Champion_name']),
+        'name': row['Champion_name'],
+        'title': row['title'],
+        'difficulty': int(row['difficulty']),
+        'attributes': {**{a: float(row[a]) for a in ATTRIBUTES}, 'difficulty': float(row['difficulty'])},
+        'range_type': row['rangetype'],
+        'position': row['positions'],
+        'herotype': row['herotype'],
+    }
+
+
+def ddragon_record(entry, existing):
+    """Roster fields a Data Dragon entry defines; ratings only seed champions not yet in the roster"""
+    record = {
+        'id': name_key(entry['id']),
+        'name': entry['id'],
+        'title': entry.get('title', ''),
+        'herotype': (entry.get('tags') or ['Unknown'])[0],
+        'range_type': 'Melee' if entry.get('stats', {}).get('attackrange', 0) <= MELEE_RANGE else 'Ranged',
+    }
+    if not existing:
+        info = entry.get('info', {})
+        difficulty = bucket(info.get('difficulty', 5))
+        record['difficulty'] = difficulty
+        record['attributes'] = {**{a: 2.0 for a in ATTRIBUTES},
+                                'damage': float(bucket(max(info.get('attack', 5), info.get('magic', 5)))),
+                                'toughness': float(bucket(info.get('defense', 5))),
+                                'difficulty': float(difficulty)}
+    return record
+
+
+def load_dump(path, current):
+    """{champion id: partial record} from a dump; `current` is {id: record} for merging defaults"""
+    if os.path.isdir(path):
+        for filename in DDRAGON_FILES:
+            candidate = os.path.join(path, filename)
+            if os.path.exists(candidate):
+                with open(candidate, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)['data'].values()
+                return 'ddragon', {name_key(e['id']): ddragon_record(e, current.get(name_key(e['id'])))
+                                   for e in entries}
+        csv_files = [f for f in sorted(os.listdir(path)) if f.endswith('.csv')]
+        if not csv_files:
+            raise FileNotFoundError(f"no {' or '.join(DDRAGON_FILES)} or .csv file in {path}")
+        path = os.path.join(path, csv_files[0])
+    records = [csv_record(row) for row in load_champion_csv(path).values()]
+    return 'csv', {r['id']: r for r in records}
+
+
+def merge_record(current, partial):
+    """Full roster record: the dump's fields over the current record, defaults for new champions"""
+    defaults = {'role': ROSTER_ROLE, 'tags': [ROSTER_ROLE], 'herotype': 'Unknown', 'difficulty': 2, 'position': '',
+                'attributes': {**{a: 2.0 for a in ATTRIBUTES}, 'difficulty': 2.0}}
+    merged = {**defaults, **(current or {}), **partial}
+    return {field: merged[field] for field in RECORD_FIELDS if field in merged}
+
+
+def record_hash(record):
+    return content_hash(canonical_bytes(record))
+
+
+def diff_roster(champions, incoming, keep_missing=False):
+    """(new roster list, added ids, changed ids, removed ids); roster order is kept, additions go last"""
+    current = {c['id']: c for c in champions}
+    roster, changed, removed = [], [], []
+    for champion in champions:
+        partial = incoming.get(champion['id'])
+        if partial is None:
+            if keep_missing:
+                roster.append(champion)
+            else:
+                removed.append(champion['id'])
+            continue
+        record = merge_record(champion, partial)
+        if record_hash(record) != record_hash(champion):
+            changed.append(champion['id'])
+        roster.append(record)
+    added = [champion_id for champion_id in incoming if champion_id not in current]
+    roster.extend(merge_record(None, incoming[champion_id]) for champion_id in added)
+    return roster, added, changed, removed
+
+
+def write_roster(champions, paths=ROSTER_COPIES):
+    payload = json.dumps({'champions': champions}, indent=2)
+    for path in paths:
+        if not os.path.exists(os.path.dirname(path) or '.'):
+            continue
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+
+def update_feature_pack(champions, touched_ids, path=export_feature_pack.DEFAULT_OUTPUT):
+    """Patch the changed rows in place when possible; returns 'patched', 'rebuilt' or 'absent'"""
+    if not os.path.exists(path):
+        return 'absent'
+    with open(path, 'rb') as f:
+        data = f.read()
+    rows = [i for i, c in enumerate(champions) if c['id'] in touched_ids]
+    patched = export_feature_pack.patch_features(data, champions, rows)
+    result = 'patched' if patched is not None else 'rebuilt'
+    with open(path, 'wb') as f:
+        f.write(patched if patched is not None else export_feature_pack.pack_features(champions))
+    return result
+
+
+def update_search_index(touched_ids, path=champion_search.DEFAULT_OUTPUT):
+    if not os.path.exists(path):
+        return 'absent'
+    champion_search.update_champions(touched_ids, output=path)
+    return 'updated'
+
+
+def ingest(dump_path, keep_missing=False, dry_run=False):
+    """Apply a dump; returns (added, changed, removed, {step: result})"""
+    champions = load_champions(CHAMPIONS_PATH)
+    kind, incoming = load_dump(dump_path, {c['id']: c for c in champions})
+    roster, added, changed, removed = diff_roster(champions, incoming, keep_missing)
+    steps = {'source': kind}
+    if dry_run or not (added or changed or removed):
+        return added, changed, removed, steps
+
+    touched = set(added) | set(changed) | set(removed)
+    timings = {}
+
+    start = time.perf_counter()
+    write_roster(roster)
+    timings['roster copies'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_dir = build_roster_index.DEFAULT_OUTPUT_DIR
+    details = load_champion_details(DATA_DIR)
+    if os.path.exists(os.path.join(index_dir, build_roster_index.INDEX_NAME)):
+        written = build_roster_index.update_index(roster, details, touched, index_dir)
+    else:
+        written = build_roster_index.build_index(roster, details, index_dir)[2]
+    timings['roster index'] = time.perf_counter() - start
+    steps['roster index'] = f"{written} shards written"
+
+    start = time.perf_counter()
+    steps['feature pack'] = update_feature_pack(roster, touched)
+    timings['feature pack'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    steps['search index'] = update_search_index(sorted(touched))
+    timings['search index'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    build_bundles(names=['champions', 'roster_index'])
+    timings['bundles'] = time.perf_counter() - start
+    steps['bundles'] = 'champions, roster_index'
+    steps['timings'] = timings
+    return added, changed, removed, steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply a new roster dump, updating only what changed.')
+    parser.add_argument('dump', help='Data Dragon directory, or a CSV file/directory in the archived layout')
+    parser.add_argument('--keep-missing', action='store_true',
+                        help='Keep champions the dump does not mention instead of removing them')
+    parser.add_argument('--dry-run', action='store_true', help='Only report the diff')
+    parser.add_argument('--build', action='store_true', help='Rebuild the whole-roster outputs afterwards')
+    parser.add_argument('--snapshot', metavar='VERSION', help='Also store the new roster as this snapshot version')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.dump):
+        parser.error(f"{args.dump} not found")
+    store = roster_snapshots.RosterStore() if args.snapshot else None
+    if store and args.snapshot in store.entries:
+        parser.error(f"roster version {args.snapshot} already exists")
+
+    start = time.perf_counter()
+    added, changed, removed, steps = ingest(args.dump, args.keep_missing, args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 60)
+    print(f"Source: {args.dump} ({steps['source']})")
+    for label, ids in (('Added', added), ('Changed', changed), ('Removed', removed)):
+        shown = ', '.join(ids[:8]) + (f" (+{len(ids) - 8} more)" if len(ids) > 8 else '')
+        print(f"{label:<10}{len(ids):>4}  {shown}")
+    print("=" * 60)
+    if not (added or changed or removed):
+        print("Roster is up to date; nothing to apply")
+        return
+    if args.dry_run:
+        print("Dry run; nothing written")
+        return
+
+    for step in ('roster index', 'feature pack', 'search index', 'bundles'):
+        print(f"  {step:<16}{steps[step]:<26}{steps['timings'][step] * 1000:>8.1f} ms")
+    print(f"Applied in {elapsed * 1000:.0f} ms")
+    if store:
+        entry = store.commit(load_champions(CHAMPIONS_PATH), args.snapshot, note=f"ingested from {args.dump}")
+        print(f"Stored roster version {args.snapshot} ({entry['kind']}, {entry['bytes']:,} bytes)")
+
+    if args.build:
+        from build_pipeline import BuildGraph
+        BuildGraph().build(AGGREGATE_TARGETS)
+    else:
+        print(f"Run python build_pipeline.py to refresh {', '.join(AGGREGATE_TARGETS)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+Metrics Registry
+LoL Champion Recommender System
+Counters, gauges and fixed-bucket histograms for the Python tools: image cache
+hits, rows scored, chart render times and PDF build times. Updates are plain
+attribute arithmetic on a child object looked up once (an increment costs
+about as much as a method call), so they are safe to leave in hot loops.
+
+Snapshots are written as a Prometheus text file (metrics.prom), a JSON file
+(metrics.json) and one line per snapshot appended to metrics_history.ndjson,
+either on demand with write_snapshot() or every few seconds from a
+PeriodicExporter thread. Readers of a live registry may see a histogram's
+count one observation ahead of its sum; every snapshot is internally
+consistent enough for dashboards and generate_charts.py --metrics-charts.
+
+Any process started with LOL_METRICS_DIR set writes a snapshot there when it
+exits, which is how build_pipeline.py --metrics collects the chart scripts
+and reports it runs as subprocesses
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+import argparse
+import atexit
+import copy
+import json
+import math
+import os
+import threading
+import time
+
+DEFAULT_METRICS_DIR = 'metrics'
+PROMETHEUS_FILE = 'metrics.prom'
+JSON_FILE = 'metrics.json'
+HISTORY_FILE = 'metrics_history.ndjson'
+METRICS_DIR_ENV = 'LOL_METRICS_DIR'
+# Seconds; spans a cached lookup up to a full PDF build
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Counter:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Gauge:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+class Histogram:
+    """Observation counts per fixed upper bound, plus their sum and count"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start)
+
+
+class MetricFamily:
+    """One named metric with a child per combination of label values"""
+
+    KINDS = {'counter': Counter, 'gauge': Gauge, 'histogram': Histogram}
+
+    def __init__(self, name, kind, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **named):
+        """The child for these label values, created on first use; keep it for hot loops"""
+        if named:
+            values = tuple(str(named[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        child = self.children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self.children.get(values)
+                if child is None:
+                    child = Histogram(self.buckets) if self.kind == 'histogram' else self.KINDS[self.kind]()
+                    self.children[values] = child
+        return child
+
+    # Unlabelled families can be used directly
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+
+class Registry:
+    def __init__(self):
+        self.families = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name, kind, help_text, labels, buckets=DEFAULT_BUCKETS):
+        with self._lock:
+            family = self.families.get(name)
+            if family is None:
+                family = self.families[name] = MetricFamily(name, kind, help_text, labels, buckets)
+            elif family.kind != kind or family.labelnames != tuple(labels):
+                raise ValueError(f"metric {name} is already registered as a {family.kind} "
+                                 f"with labels {family.labelnames}")
+            return family
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(name, 'counter', help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._register(name, 'gauge', help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(name, 'histogram', help_text, labels, buckets)
+
+    def snapshot(self):
+        """JSON-serializable copy of every metric; histogram buckets are cumulative"""
+        metrics = {}
+        for name, family in sorted(self.families.items()):
+            samples = []
+            for values, child in sorted(list(family.children.items())):
+                sample = {'labels': dict(zip(family.labelnames, values))}
+                if family.kind == 'histogram':
+                    counts = list(child.counts)
+                    cumulative, total = [], 0
+                    for bound, count in zip(list(family.buckets) + ['+Inf'], counts):
+                        total += count
+                        cumulative.append([bound, total])
+                    sample.update(buckets=cumulative, sum=child.sum, count=total)
+                else:
+                    sample['value'] = child.value
+                samples.append(sample)
+            metrics[name] = {'type': family.kind, 'help': family.help, 'samples': samples}
+        return {'timestamp': time.time(), 'metrics': metrics}
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+# Shared by every chart and report builder so their timings land in one family each
+CHART_SECONDS = histogram('chart_render_seconds', 'Time to render and save each chart', labels=('chart',))
+PDF_SECONDS = histogram('pdf_build_seconds', 'Time to build each PDF report', labels=('report',))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(labels, extra=None):
+    pairs = list(labels.items()) + ([extra] if extra else [])
+    return '{' + ','.join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def prometheus_text(snapshot):
+    """Prometheus text exposition format for a snapshot"""
+    lines = []
+    for name, metric in snapshot['metrics'].items():
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for sample in metric['samples']:
+            labels = sample['labels']
+            if metric['type'] == 'histogram':
+                for bound, count in sample['buckets']:
+                    lines.append(f"{name}_bucket{_label_text(labels, ('le', _number(bound)))} {count}")
+                lines.append(f"{name}_sum{_label_text(labels)} {_number(sample['sum'])}")
+                lines.append(f"{name}_count{_label_text(labels)} {sample['count']}")
+            else:
+                lines.append(f"{name}{_label_text(labels)} {_number(sample['value'])}")
+    return '\n'.join(lines) + '\n'
+
+
+def histogram_quantile(buckets, q):
+    """Estimate a quantile from cumulative [[upper bound, count], ...] by linear interpolation"""
+    total = buckets[-1][1]
+    if not total:
+        return None
+    rank, lower, below = q * total, 0.0, 0
+    for bound, count in buckets:
+        if count >= rank:
+            if bound == '+Inf':
+                return lower
+            return lower + (bound - lower) * (rank - below) / max(count - below, 1)
+        lower, below = bound, count
+    return lower
+
+
+def _write_atomic(path, text):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_snapshot(directory=DEFAULT_METRICS_DIR, registry=REGISTRY, history=True, snapshot=None):
+    """Write metrics.prom and metrics.json, appending to the history; returns the snapshot"""
+    os.makedirs(directory, exist_ok=True)
+    if snapshot is None:
+        snapshot = registry.snapshot()
+    _write_atomic(os.path.join(directory, PROMETHEUS_FILE), prometheus_text(snapshot))
+    _write_atomic(os.path.join(directory, JSON_FILE), json.dumps(snapshot, indent=2) + '\n')
+    if history:
+        with open(os.path.join(directory, HISTORY_FILE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot, separators=(',', ':')) + '\n')
+    return snapshot
+
+
+def load_snapshot(path=os.path.join(DEFAULT_METRICS_DIR, JSON_FILE)):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def merge_snapshots(snapshots):
+    """Combine snapshots from separate processes: counters and histograms add up, gauges keep the latest"""
+    merged = {}
+    for snapshot in sorted(snapshots, key=lambda s: s['timestamp']):
+        for name, metric in snapshot['metrics'].items():
+            target = merged.setdefault(name, {'type': metric['type'], 'help': metric['help'], 'samples': {}})
+            for sample in metric['samples']:
+                key = tuple(sorted(sample['labels'].items()))
+                current = target['samples'].get(key)
+                if current is None or metric['type'] == 'gauge':
+                    target['samples'][key] = copy.deepcopy(sample)
+                elif metric['type'] == 'histogram':
+                    current['buckets'] = [[bound, count + other] for (bound, count), (_, other)
+                                          in zip(current['buckets'], sample['buckets'])]
+                    current['sum'] += sample['sum']
+                    current['count'] += sample['count']
+                else:
+                    current['value'] += sample['value']
+    for metric in merged.values():
+        metric['samples'] = [metric['samples'][key] for key in sorted(metric['samples'])]
+    return {'timestamp': max((s['timestamp'] for s in snapshots), default=time.time()),
+            'metrics': dict(sorted(merged.items()))}
+
+
+def export_on_exit(directory):
+    """Write a snapshot to `directory` when the process exits"""
+    atexit.register(write_snapshot, directory)
+
+
+if os.environ.get(METRICS_DIR_ENV):
+    export_on_exit(os.environ[METRICS_DIR_ENV])
+
+
+class PeriodicExporter:
+    """Writes a snapshot every `interval` seconds from a daemon thread, and once more on stop().
+
+    Use as a context manager around a build:
+
+        with PeriodicExporter('metrics'):
+            build_all(...)
+    """
+
+    def __init__(self, directory=DEFAULT_METRICS_DIR, interval=15.0, registry=REGISTRY):
+        self.directory = directory
+        self.interval = interval
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            write_snapshot(self.directory, self.registry)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='metrics-exporter', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return write_snapshot(self.directory, self.registry)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def print_snapshot(snapshot):
+    print("\n" + "=" * 96)
+    print(f"{'Metric':<40}{'Labels':<26}{'Value':>30}")
+    print("-" * 96)
+    for name, metric in snapshot['metrics'].items():
+        for sample in metric['samples']:
+            labels = ','.join(f"{k}={v}" for k, v in sample['labels'].items())[:25]
+            if metric['type'] == 'histogram':
+                p95 = histogram_quantile(sample['buckets'], 0.95)
+                mean = sample['sum'] / sample['count'] if sample['count'] else 0.0
+                value = f"n={sample['count']} mean={mean:.3f}" + (f" p95={p95:.3f}" if p95 is not None else '')
+                print(f"{name:<40}{labels:<26}{value:>30}")
+            else:
+                print(f"{name:<40}{labels:<26}{_number(sample['value']):>30}")
+    print("=" * 96)
+    print(f"Snapshot taken {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snapshot['timestamp']))}")
+
+
+def benchmark(n=1_000_000):
+    """Per-update cost of a counter and a histogram child in a tight loop"""
+    registry = Registry()
+    rows = registry.counter('benchmark_rows_total', 'Rows').labels()
+    latency = registry.histogram('benchmark_seconds', 'Latency').labels()
+    start = perf_counter()
+    for _ in range(n):
+        pass
+    baseline = perf_counter() - start
+    start = perf_counter()
+    for _ in range(n):
+        rows.inc()
+    counter_cost = perf_counter() - start - baseline
+    start = perf_counter()
+    for i in range(n):
+        latency.observe(i * 1e-7)
+    histogram_cost = perf_counter() - start - baseline
+    print(f"counter.inc()        {counter_cost / n * 1e9:>7.1f} ns per update")
+    print(f"histogram.observe()  {histogram_cost / n * 1e9:>7.1f} ns per update ({len(DEFAULT_BUCKETS)} buckets)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show exported metrics or time metric updates.')
+    parser.add_argument('snapshot', nargs='?', default=os.path.join(DEFAULT_METRICS_DIR, JSON_FILE),
+                        help='metrics.json to show')
+    parser.add_argument('--prometheus', action='store_true', help='Print it in Prometheus text format instead')
+    parser.add_argument('--benchmark', action='store_true', help='Measure the cost of counter and histogram updates')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+        return
+    if not os.path.exists(args.snapshot):
+        parser.error(f"{args.snapshot} not found; run a build with --metrics first")
+    snapshot = load_snapshot(args.snapshot)
+    if args.prometheus:
+        print(prometheus_text(snapshot), end='')
+    else:
+        print_snapshot(snapshot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Chart Asset Optimizer
+LoL Champion Recommender System
+Post-render stage that turns the full-size chart PNGs into web-ready assets:
+resolution variants, lossless recompression and a thumbnail sprite sheet
+"""
+
+from PIL import Image
+import argparse
+import glob
+import json
+import os
+import shutil
+
+# Target widths in pixels for each variant. 'print' keeps the source size.
+VARIANTS = {
+    'thumb': 320,
+    'web': 1200,
+    'print': None,
+}
+
+DEFAULT_SOURCES = ['chart_*.png', 'src/Graphs/*.png']
+DEFAULT_OUTPUT_DIR = 'src/assets/charts'
+SPRITE_COLUMNS = 6
+
+
+def quantize_lossless(img):
+    """Convert to a palette image when that loses no pixels, else keep it as is."""
+    # getcolors returns None as soon as the limit is exceeded, so this stays cheap
+    if img.mode not in ('RGB', 'RGBA') or img.getcolors(maxcolors=256) is None:
+        return img
+    method = Image.Quantize.FASTOCTREE if img.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+    paletted = img.quantize(colors=256, method=method, dither=Image.Dither.NONE)
+    if paletted.convert(img.mode).tobytes() != img.tobytes():
+        return img
+    return paletted
+
+
+def resize_to_width(img, width):
+    """Downscale to the given width, never upscale."""
+    if width is None or img.width <= width:
+        return img.copy()
+    height = max(1, round(img.height * width / img.width))
+    return img.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def save_png(img, path):
+    """Write a maximally compressed PNG and return its size in bytes."""
+    quantize_lossless(img).save(path, format='PNG', optimize=True)
+    return os.path.getsize(path)
+
+
+def build_sprite(thumbs, output_dir, columns=SPRITE_COLUMNS):
+    """Pack thumbnails into one sprite sheet using fixed-height shelves."""
+    names = sorted(thumbs)
+    offsets = {}
+    x = y = shelf_height = sheet_width = 0
+
+    for index, name in enumerate(names):
+        img = thumbs[name]
+        if index and index % columns == 0:
+            y += shelf_height
+            x = shelf_height = 0
+        offsets[name] = {'x': x, 'y': y, 'w': img.width, 'h': img.height}
+        x += img.width
+        sheet_width = max(sheet_width, x)
+        shelf_height = max(shelf_height, img.height)
+
+    sheet = Image.new('RGBA', (sheet_width, y + shelf_height), (0, 0, 0, 0))
+    for name in names:
+        sheet.paste(thumbs[name], (offsets[name]['x'], offsets[name]['y']))
+
+    sprite_path = os.path.join(output_dir, 'charts_sprite.png')
+    sprite_bytes = save_png(sheet, sprite_path)
+
+    sprite_map = {
+        'image': os.path.basename(sprite_path),
+        'width': sheet.width,
+        'height': sheet.height,
+        'frames': offsets,
+    }
+    with open(os.path.join(output_dir, 'charts_sprite.json'), 'w') as f:
+        json.dump(sprite_map, f, indent=2)
+
+    return sprite_bytes
+
+
+def optimize_chart(source_path, output_dir):
+    """Emit every variant for one chart and return per-variant sizes plus the thumbnail image."""
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    sizes = {}
+    thumb = None
+
+    with Image.open(source_path) as src:
+        src.load()
+        img = src.convert('RGBA') if src.mode not in ('RGB', 'RGBA') else src
+        for variant, width in VARIANTS.items():
+            resized = resize_to_width(img, width)
+            out_path = os.path.join(output_dir, f'{name}.{variant}.png')
+            sizes[variant] = save_png(resized, out_path)
+            if resized.size == img.size and sizes[variant] >= os.path.getsize(source_path):
+                # Recompression did not beat the renderer's own output
+                shutil.copyfile(source_path, out_path)
+                sizes[variant] = os.path.getsize(out_path)
+            if variant == 'thumb':
+                thumb = resized.convert('RGBA')
+
+    return name, sizes, thumb
+
+
+def optimize_assets(sources=None, output_dir=DEFAULT_OUTPUT_DIR):
+    """Optimize all matching charts and write a manifest with byte savings."""
+    patterns = sources or DEFAULT_SOURCES
+    paths = sorted({p for pattern in patterns for p in glob.glob(pattern)})
+    if not paths:
+        print("No chart images found.")
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = {'variants': VARIANTS, 'charts': {}}
+    thumbs = {}
+    total_original = total_web = 0
+
+    for path in paths:
+        name, sizes, thumb = optimize_chart(path, output_dir)
+        original = os.path.getsize(path)
+        thumbs[name] = thumb
+        manifest['charts'][name] = {
+            'source': path.replace(os.sep, '/'),
+            'original_bytes': original,
+            'variants': {v: f'{name}.{v}.png' for v in VARIANTS},
+            'bytes': sizes,
+        }
+        total_original += original
+        total_web += sizes['web']
+
+        saved = original - sizes['web']
+        print(f"  {name}: {original:,} -> web {sizes['web']:,} bytes "
+              f"(saved {saved:,}, {saved / original * 100:.1f}%), "
+              f"print {sizes['print']:,}, thumb {sizes['thumb']:,}")
+
+    sprite_bytes = build_sprite(thumbs, output_dir)
+    manifest['sprite'] = {'image': 'charts_sprite.png', 'map': 'charts_sprite.json', 'bytes': sprite_bytes}
+
+    with open(os.path.join(output_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    saved = total_original - total_web
+    print(f"\nCharts processed: {len(paths)}")
+    print(f"Full-size transfer: {total_original:,} bytes in {len(paths)} requests")
+    print(f"Web variants:       {total_web:,} bytes (saved {saved:,}, {saved / total_original * 100:.1f}%)")
+    print(f"Thumbnail sprite:   {sprite_bytes:,} bytes in 1 request")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate web-optimized chart assets.')
+    parser.add_argument('sources', nargs='*', help='Glob patterns of source PNGs')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args()
+    optimize_assets(args.sources, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Parallel PDF Report Builder
+LoL Champion Recommender System
+Renders the independent sections of the ML performance and ML methodology
+reports as separate PDF fragments in a process pool, then merges them into a
+single document with continuous page numbers and a bookmark outline
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate
+from report_image_cache import DEFAULT_CACHE_DIR, ImageCache
+import argparse
+import importlib.util
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:  # merging needs pypdf; the sequential builds do not
+    PdfReader = PdfWriter = None
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+GRAPHS_DIR = os.path.join(ROOT_DIR, 'src', 'Graphs')
+
+# Per-worker ML report generator, built once and reused for every section the worker renders
+_ml_generator = None
+
+
+def load_graphs_module(name):
+    """Import a src/Graphs script under a 'graphs_' prefixed module name.
+
+    src/Graphs/generate_pdf_report.py shares its name with the root Champion
+    Analysis script, so the directory cannot simply be put on sys.path.
+    """
+    module_name = 'graphs_' + name
+    if module_name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(GRAPHS_DIR, name + '.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name]
+
+
+def fragment_doc(template, path):
+    """A document with the same page setup as template, writing to path"""
+    return SimpleDocTemplate(
+        path,
+        pagesize=template.pagesize,
+        rightMargin=template.rightMargin,
+        leftMargin=template.leftMargin,
+        topMargin=template.topMargin,
+        bottomMargin=template.bottomMargin,
+    )
+
+
+def _ml_section_titles():
+    generator = load_graphs_module('generate_pdf_report').MLReportGenerator(os.devnull)
+    generator.build_story()
+    return [title for title, _ in generator.sections]
+
+
+def _render_ml_section(task):
+    global _ml_generator
+    index, fragment_path, vector, cache_dir = task
+    if _ml_generator is None:
+        os.chdir(GRAPHS_DIR)
+        module = load_graphs_module('generate_pdf_report')
+        image_cache = ImageCache(cache_dir) if cache_dir else None
+        _ml_generator = module.MLReportGenerator(os.devnull, vector=vector, image_cache=image_cache)
+        _ml_generator.build_story()
+    _, flowables = _ml_generator.section_stories()[index]
+    fragment_doc(_ml_generator.doc, fragment_path).build(flowables)
+    return fragment_path
+
+
+def _render_methodology_chapter(task):
+    index, fragment_path, work_dir = task
+    # Chart images are written to and read from the working directory
+    os.chdir(work_dir)
+    module = load_graphs_module('generate_methodology_report')
+    generator = module.MLMethodologyReportGenerator(fragment_path)
+    generator.generate_graphs(generator.CHAPTERS[index][2])
+    generator.add_chapter(index)
+    generator.doc.build(generator.story)
+    return fragment_path
+
+
+def _page_number_overlay(page_sizes):
+    """One overlay page per document page with a centred 'Page n of N' footer"""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer)
+    total = len(page_sizes)
+    for number, (width, height) in enumerate(page_sizes, start=1):
+        c.setPageSize((width, height))
+        c.setFont('Helvetica', 8)
+        c.setFillGray(0.4)
+        c.drawCentredString(width / 2, 20, f"Page {number} of {total}")
+        c.showPage()
+    c.save()
+    buffer.seek(0)
+    return PdfReader(buffer)
+
+
+def merge_fragments(fragments, output_path, number_pages=True):
+    """Concatenate (title, path) fragments, add an outline entry per fragment and
+    stamp continuous page numbers. Returns the merged page count."""
+    if PdfWriter is None:
+        raise RuntimeError("pypdf is required to merge report fragments (pip install pypdf)")
+
+    writer = PdfWriter()
+    starts = []
+    for title, path in fragments:
+        starts.append((title, len(writer.pages)))
+        writer.append(path, import_outline=False)
+
+    if number_pages:
+        sizes = [(float(p.mediabox.width), float(p.mediabox.height)) for p in writer.pages]
+        overlay = _page_number_overlay(sizes)
+        for page, stamp in zip(writer.pages, overlay.pages):
+            page.merge_page(stamp)
+
+    for title, page_index in starts:
+        writer.add_outline_item(title, page_index)
+
+    with open(output_path, 'wb') as f:
+        writer.write(f)
+    return len(writer.pages)
+
+
+def _render_and_merge(render, tasks, titles, output_path, workers):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        paths = list(pool.map(render, tasks, chunksize=1))
+    return merge_fragments(list(zip(titles, paths)), output_path)
+
+
+def build_ml_report_parallel(output_path, workers=None, vector=False, cache_dir=None):
+    """Build the ML performance report with one fragment per section"""
+    output_path = os.path.abspath(output_path)
+    if cache_dir:
+        cache_dir = os.path.abspath(cache_dir)
+    titles = _ml_section_titles()
+    work_dir = tempfile.mkdtemp(prefix='ml_report_')
+    try:
+        tasks = [(i, os.path.join(work_dir, f'section_{i:02d}.pdf'), vector, cache_dir)
+                 for i in range(len(titles))]
+        return _render_and_merge(_render_ml_section, tasks, titles, output_path, workers)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def build_methodology_report_parallel(output_path, workers=None):
+    """Build the ML methodology report with one fragment per chapter, each
+    worker rendering only the charts its chapter embeds"""
+    output_path = os.path.abspath(output_path)
+    module = load_graphs_module('generate_methodology_report')
+    chapters = module.MLMethodologyReportGenerator.CHAPTERS
+    work_dir = tempfile.mkdtemp(prefix='methodology_report_')
+    try:
+        tasks = [(i, os.path.join(work_dir, f'chapter_{i:02d}.pdf'), work_dir)
+                 for i in range(len(chapters))]
+        titles = [title for title, _, _ in chapters]
+        return _render_and_merge(_render_methodology_chapter, tasks, titles, output_path, workers)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def build_ml_report_sequential(output_path):
+    output_path = os.path.abspath(output_path)
+    cwd = os.getcwd()
+    os.chdir(GRAPHS_DIR)
+    try:
+        load_graphs_module('generate_pdf_report').MLReportGenerator(output_path).generate_report()
+    finally:
+        os.chdir(cwd)
+
+
+def build_methodology_report_sequential(output_path):
+    output_path = os.path.abspath(output_path)
+    cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix='methodology_report_')
+    os.chdir(work_dir)
+    try:
+        load_graphs_module('generate_methodology_report').MLMethodologyReportGenerator(output_path).build()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+REPORTS = {
+    'ml_report': ('ML_Performance_Comprehensive_Analysis_Report.pdf',
+                  build_ml_report_parallel, build_ml_report_sequential),
+    'methodology': ('ML_Methodology_Analysis_Report.pdf',
+                    build_methodology_report_parallel, build_methodology_report_sequential),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the reportlab PDF reports in parallel.')
+    parser.add_argument('reports', nargs='*', help=f"Reports to build (default: all of {', '.join(REPORTS)})")
+    parser.add_argument('--workers', type=int, default=None, help='Process pool size (default: CPU count)')
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--image-cache', action='store_true', help='Resample ML report charts through the shared image cache')
+    parser.add_argument('--compare', action='store_true', help='Also run the sequential build and compare wall-clock time')
+    args = parser.parse_args()
+
+    unknown = set(args.reports) - set(REPORTS)
+    if unknown:
+        parser.error(f"unknown report(s): {', '.join(sorted(unknown))}")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    rows = []
+    for name in args.reports or list(REPORTS):
+        filename, parallel, sequential = REPORTS[name]
+        output = os.path.join(args.output_dir, filename)
+
+        start = time.perf_counter()
+        options = {'cache_dir': os.path.join(ROOT_DIR, DEFAULT_CACHE_DIR)} if args.image_cache and name == 'ml_report' else {}
+        pages = parallel(output, workers=args.workers, **options)
+        parallel_time = time.perf_counter() - start
+        print(f"Merged {pages} pages into {output}")
+
+        sequential_time = None
+        if args.compare:
+            start = time.perf_counter()
+            sequential(os.path.join(args.output_dir, 'sequential_' + filename))
+            sequential_time = time.perf_counter() - start
+        rows.append((name, pages, parallel_time, sequential_time))
+
+    print("\n" + "=" * 60)
+    print(f"{'Report':<14}{'Pages':>7}{'Parallel (s)':>15}{'Sequential (s)':>17}")
+    print("-" * 60)
+    for name, pages, parallel_time, sequential_time in rows:
+        seq = f"{sequential_time:.2f}" if sequential_time is not None else '-'
+        print(f"{name:<14}{pages:>7}{parallel_time:>15.2f}{seq:>17}")
+    print("=" * 60)
+    print(f"Workers: {args.workers or os.cpu_count()}")
+
+
+if __name__ == "__main__":
+    main()
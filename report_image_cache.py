@@ -0,0 +1,100 @@
+"""
+Report Image Cache
+LoL Champion Recommender System
+Resamples chart images to the print resolution a PDF page actually needs and
+hands every report the same prepared file for identical content, so fpdf and
+reportlab decode less and embed each distinct image only once per document
+"""
+
+from PIL import Image
+import hashlib
+import os
+
+import metrics
+
+DEFAULT_CACHE_DIR = os.path.join('.report_cache', 'images')
+DEFAULT_DPI = 150
+
+CACHE_REQUESTS = metrics.counter('report_image_cache_requests_total', 'Chart images prepared for PDF reports',
+                                 labels=('result',))
+SAVED_BYTES = metrics.counter('report_image_cache_saved_bytes_total', 'Image bytes not embedded thanks to resampling')
+
+
+class ImageCache:
+    """Content-addressed cache of chart images resampled to a target print DPI"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, dpi=DEFAULT_DPI):
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self._hashes = {}
+        self.stats = {'hits': 0, 'misses': 0, 'passthrough': 0, 'source_bytes': 0, 'prepared_bytes': 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def source_hash(self, path):
+        """Hash file contents, remembering the result until the file changes"""
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._hashes.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        self._hashes[path] = (stamp, digest.hexdigest())
+        return self._hashes[path][1]
+
+    def target_size(self, source_size, width_in, height_in=None):
+        """Pixel size needed to print at width_in x height_in inches"""
+        src_w, src_h = source_size
+        width_px = max(1, round(width_in * self.dpi))
+        if height_in is None:
+            height_px = max(1, round(src_h * width_px / src_w))
+        else:
+            height_px = max(1, round(height_in * self.dpi))
+        return width_px, height_px
+
+    def prepare(self, path, width_in, height_in=None):
+        """Return a path to the image resampled for the given print size.
+
+        Identical source content at the same target size always maps to the
+        same cached file, which both fpdf and reportlab embed only once.
+        Images already at or below the target resolution are returned as is.
+        """
+        source_bytes = os.path.getsize(path)
+        self.stats['source_bytes'] += source_bytes
+
+        with Image.open(path) as img:
+            size = self.target_size(img.size, width_in, height_in)
+            if size[0] >= img.width or size[1] >= img.height:
+                self.stats['passthrough'] += 1
+                CACHE_REQUESTS.labels('passthrough').inc()
+                self.stats['prepared_bytes'] += source_bytes
+                return path
+
+            key = f"{self.source_hash(path)[:20]}_{size[0]}x{size[1]}"
+            cached_path = os.path.join(self.cache_dir, key + '.png')
+            if os.path.exists(cached_path):
+                self.stats['hits'] += 1
+                CACHE_REQUESTS.labels('hit').inc()
+            else:
+                self.stats['misses'] += 1
+                CACHE_REQUESTS.labels('miss').inc()
+                img.load()
+                resized = img.resize(size, Image.Resampling.LANCZOS)
+                tmp_path = cached_path + '.tmp'
+                resized.save(tmp_path, format='PNG', optimize=True)
+                os.replace(tmp_path, cached_path)
+
+        prepared_bytes = os.path.getsize(cached_path)
+        self.stats['prepared_bytes'] += prepared_bytes
+        SAVED_BYTES.inc(max(0, source_bytes - prepared_bytes))
+        return cached_path
+
+    def summary(self):
+        """One-line description of cache activity for build logs"""
+        s = self.stats
+        saved = s['source_bytes'] - s['prepared_bytes']
+        return (f"Image cache: {s['hits']} hits, {s['misses']} misses, {s['passthrough']} passthrough, "
+                f"{s['source_bytes'] / 1024:.0f} KB -> {s['prepared_bytes'] / 1024:.0f} KB "
+                f"({saved / 1024:.0f} KB saved) at {self.dpi} dpi")
@@ -0,0 +1,284 @@
+"""
+Report Profiler
+LoL Champion Recommender System
+Opt-in timing instrumentation for the PDF report builds. Records layout and
+draw time per section and per flowable (reportlab) or drawing call (fpdf),
+image bytes embedded, pages produced and page output time, then writes a
+JSON profile and prints the slowest sections
+"""
+
+from contextlib import contextmanager
+from time import perf_counter
+import json
+import os
+
+PHASES = ('wrap', 'split', 'draw')
+
+
+def profile_path_for(output_path):
+    """Report.pdf -> Report.profile.json"""
+    return os.path.splitext(output_path)[0] + '.profile.json'
+
+
+def _flowable_label(flowable):
+    if hasattr(flowable, 'getPlainText'):
+        return ' '.join(flowable.getPlainText().split())[:60]
+    filename = getattr(flowable, 'filename', None)
+    if isinstance(filename, str):
+        return os.path.basename(filename)
+    content = getattr(flowable, '_content', None)
+    if content:
+        return _flowable_label(content[0])
+    return ''
+
+
+class ReportProfiler:
+    """Collects timings for one report build.
+
+    Times are exclusive: a KeepTogether's wrap does not include the wrap time
+    of the paragraphs and images inside it, those are recorded on the
+    children, so section totals never count the same work twice.
+    """
+
+    def __init__(self, report_name, output_path=None):
+        self.report_name = report_name
+        self.output_path = output_path
+        self.sections = {}
+        self.phases = {}
+        self.pages = 0
+        self._embedded = set()
+        self._stack = []
+        self._current = None
+        self._started = perf_counter()
+
+    def _section(self, title):
+        if title not in self.sections:
+            self.sections[title] = {'title': title, 'pages': set(), 'image_bytes': 0, 'flowables': []}
+        return self.sections[title]
+
+    def _record(self, section, kind, label):
+        record = {'kind': kind, 'label': label, 'calls': 0, 'image_bytes': 0,
+                  **{phase: 0.0 for phase in PHASES}}
+        section['flowables'].append(record)
+        return record
+
+    def _add_image(self, section, record, path):
+        # Each distinct file is embedded once per document however often it is drawn
+        if not isinstance(path, str) or path in self._embedded or not os.path.exists(path):
+            return
+        self._embedded.add(path)
+        size = os.path.getsize(path)
+        record['image_bytes'] += size
+        section['image_bytes'] += size
+
+    def _measure(self, method, args, kwargs):
+        """Call method, returning (result, exclusive seconds)"""
+        self._stack.append(0.0)
+        start = perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+        return result, elapsed - nested
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block of work outside the flowables, e.g. chart rendering"""
+        self._stack.append(0.0)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed - nested
+
+    # reportlab
+
+    def instrument(self, flowables, section_title):
+        """Attribute the layout and draw time of these story flowables to a section"""
+        section = self._section(section_title)
+        for flowable in flowables:
+            self._instrument_flowable(flowable, section)
+
+    def _instrument_flowable(self, flowable, section, record=None):
+        if getattr(flowable, '_profile_record', None) is not None:
+            return
+        if record is None:
+            record = self._record(section, type(flowable).__name__, _flowable_label(flowable))
+            self._add_image(section, record, getattr(flowable, 'filename', None))
+        flowable._profile_record = record
+
+        def timed(phase, method):
+            def wrapper(*args, **kwargs):
+                result, seconds = self._measure(method, args, kwargs)
+                record[phase] += seconds
+                record['calls'] += 1
+                if phase == 'draw':
+                    section['pages'].add(args[0].getPageNumber())
+                elif phase == 'split':
+                    # Split pieces are new flowables; keep charging them to this record
+                    for piece in result or ():
+                        self._instrument_flowable(piece, section, record)
+                return result
+            return wrapper
+
+        flowable.wrap = timed('wrap', flowable.wrap)
+        flowable.split = timed('split', flowable.split)
+        flowable.drawOn = timed('draw', flowable.drawOn)
+        for child in getattr(flowable, '_content', None) or ():
+            self._instrument_flowable(child, section)
+
+    def canvasmaker(self):
+        """Canvas class for doc.build(..., canvasmaker=...) that times page output"""
+        from reportlab.pdfgen.canvas import Canvas
+        profiler = self
+
+        class ProfiledCanvas(Canvas):
+            def showPage(self):
+                profiler.pages += 1
+                with profiler.phase('page output'):
+                    super().showPage()
+
+            def save(self):
+                with profiler.phase('save'):
+                    super().save()
+
+        return ProfiledCanvas
+
+    # fpdf
+
+    def instrument_fpdf(self, pdf, first_section='Title page'):
+        """Time the drawing calls of an FPDF instance.
+
+        Each chapter_title() call starts a new section; multi_cell() and
+        image() calls get a record each, cell() calls are pooled per section.
+        """
+        self._current = self._section(first_section)
+        pooled = {}
+        in_page_break = []
+
+        def timed(kind, method, label=None, text_arg=0):
+            def wrapper(*args, **kwargs):
+                if in_page_break:
+                    # Header and footer drawing is part of page output
+                    return method(*args, **kwargs)
+                section = self._current
+                if label is None:
+                    text = args[text_arg] if len(args) > text_arg else kwargs.get('txt', kwargs.get('text', ''))
+                    record = self._record(section, kind, ' '.join(str(text).split())[:60])
+                else:
+                    record = pooled.get(id(section))
+                    if record is None:
+                        record = pooled[id(section)] = self._record(section, kind, label)
+                if kind == 'image':
+                    self._add_image(section, record, text)
+                result, seconds = self._measure(method, args, kwargs)
+                record['draw'] += seconds
+                record['calls'] += 1
+                section['pages'].add(pdf.page_no())
+                return result
+            return wrapper
+
+        def chapter_title(method):
+            def wrapper(*args, **kwargs):
+                self._current = self._section('. '.join(str(a) for a in args))
+                return method(*args, **kwargs)
+            return wrapper
+
+        def add_page(method):
+            def wrapper(*args, **kwargs):
+                in_page_break.append(True)
+                try:
+                    with self.phase('page output'):
+                        return method(*args, **kwargs)
+                finally:
+                    in_page_break.pop()
+                    self.pages += 1
+            return wrapper
+
+        def output(method):
+            def wrapper(*args, **kwargs):
+                with self.phase('save'):
+                    return method(*args, **kwargs)
+            return wrapper
+
+        pdf.cell = timed('cell', pdf.cell, label='text cells')
+        pdf.multi_cell = timed('multi_cell', pdf.multi_cell, text_arg=2)
+        pdf.image = timed('image', pdf.image)
+        pdf.chapter_title = chapter_title(pdf.chapter_title)
+        pdf.add_page = add_page(pdf.add_page)
+        pdf.output = output(pdf.output)
+
+    # results
+
+    def profile(self):
+        """The collected timings as a JSON-serializable dict"""
+        sections = []
+        for section in self.sections.values():
+            flowables = [dict(r, seconds=sum(r[p] for p in PHASES))
+                         for r in section['flowables'] if r['calls']]
+            pages = sorted(section['pages'])
+            sections.append({
+                'title': section['title'],
+                'seconds': sum(r['seconds'] for r in flowables),
+                **{phase: sum(r[phase] for r in flowables) for phase in PHASES},
+                'pages': len(pages),
+                'first_page': pages[0] if pages else None,
+                'last_page': pages[-1] if pages else None,
+                'image_bytes': section['image_bytes'],
+                'flowables': sorted(flowables, key=lambda r: r['seconds'], reverse=True),
+            })
+
+        by_kind = {}
+        for section in sections:
+            for record in section['flowables']:
+                totals = by_kind.setdefault(record['kind'], {'count': 0, **{p: 0.0 for p in PHASES}})
+                totals['count'] += 1
+                for phase in PHASES:
+                    totals[phase] += record[phase]
+
+        return {
+            'report': self.report_name,
+            'total_seconds': perf_counter() - self._started,
+            'pages': self.pages,
+            'image_bytes': sum(s['image_bytes'] for s in sections),
+            'phases': self.phases,
+            'by_kind': by_kind,
+            'sections': sections,
+        }
+
+    def summary(self, profile=None, top=5):
+        """Printable slowest-sections summary"""
+        profile = profile or self.profile()
+        lines = [f"Profile: {profile['report']} - {profile['total_seconds']:.2f}s, {profile['pages']} pages, "
+                 f"{profile['image_bytes'] / 1024:.0f} KB images embedded",
+                 "Slowest sections:"]
+        for section in sorted(profile['sections'], key=lambda s: s['seconds'], reverse=True)[:top]:
+            lines.append(f"  {section['seconds']:>7.3f}s  {section['title'][:48]:<48} "
+                         f"{section['pages']:>3} pages {section['image_bytes'] / 1024:>7.0f} KB")
+        phases = sorted(profile['phases'].items(), key=lambda item: item[1], reverse=True)
+        if phases:
+            lines.append("Phases: " + ', '.join(f"{name} {seconds:.3f}s" for name, seconds in phases))
+        kinds = sorted(((kind, phase, totals[phase]) for kind, totals in profile['by_kind'].items()
+                        for phase in PHASES if totals[phase]), key=lambda item: item[2], reverse=True)
+        if kinds:
+            lines.append("By flowable: " + ', '.join(f"{kind} {phase} {seconds:.3f}s"
+                                                     for kind, phase, seconds in kinds[:top]))
+        return '\n'.join(lines)
+
+    def finish(self):
+        """Write the JSON profile (if an output path was given) and return the summary"""
+        profile = self.profile()
+        if self.output_path:
+            with open(self.output_path, 'w') as f:
+                json.dump(profile, f, indent=2)
+        text = self.summary(profile)
+        if self.output_path:
+            text += f"\nProfile written to {self.output_path}"
+        return text
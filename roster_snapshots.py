@@ -0,0 +1,330 @@
+"""
+Roster Snapshot Store
+LoL Champion Recommender System
+Keeps every roster version (one per patch, say) so recommendations can be
+replayed against an older roster. Each version is stored as a delta against
+its parent: the changed fields of changed champions, added champion records
+and removed ids. Every CHECKPOINT_EVERY deltas a full checkpoint is written
+instead, so rebuilding any version reads at most one checkpoint and a short
+chain of deltas. Files are gzipped JSON under roster_versions/, listed in
+versions.json with each version's parent, champion count and content hash.
+
+Any script with a --roster flag reads a stored version directly when given
+@VERSION instead of a path (see champion_data.load_champions), so nothing is
+materialized on disk; `export` writes one version out for consumers that
+need a file
+"""
+
+from build_data_bundles import canonical_bytes, content_hash
+from champion_data import CHAMPIONS_PATH, load_champions
+from collections import OrderedDict
+import argparse
+import copy
+import gzip
+import json
+import os
+import time
+
+DEFAULT_STORE = 'roster_versions'
+MANIFEST_NAME = 'versions.json'
+# Deltas between full checkpoints; bounds how many files a reconstruction reads
+CHECKPOINT_EVERY = 10
+# Reconstructed versions kept in memory
+CACHE_SIZE = 8
+MISSING = object()
+
+
+def flatten(record, prefix=''):
+    """{'attributes.damage': 3.0, ...}: one level of nested dicts becomes dotted field paths"""
+    fields = {}
+    for key, value in record.items():
+        if isinstance(value, dict) and not prefix:
+            fields.update(flatten(value, key + '.'))
+        else:
+            fields[prefix + key] = value
+    return fields
+
+
+def set_field(record, path, value):
+    parent, _, key = path.rpartition('.')
+    target = record.setdefault(parent, {}) if parent else record
+    target[key] = value
+
+
+def unset_field(record, path):
+    parent, _, key = path.rpartition('.')
+    target = record.get(parent, {}) if parent else record
+    target.pop(key, None)
+
+
+def field_changes(old, new):
+    """{field path: (old value, new value)}; a missing field is None on its side"""
+    old_fields, new_fields = flatten(old), flatten(new)
+    return {path: (old_fields.get(path), new_fields.get(path))
+            for path in list(old_fields) + [p for p in new_fields if p not in old_fields]
+            if old_fields.get(path, MISSING) != new_fields.get(path, MISSING)}
+
+
+def compute_delta(parent, child):
+    """Delta that turns the parent champion list into the child list"""
+    parent_by_id = {c['id']: c for c in parent}
+    child_ids = {c['id'] for c in child}
+    delta = {'set': {}, 'unset': {}, 'add': {}, 'remove': [c['id'] for c in parent if c['id'] not in child_ids]}
+    for champion in child:
+        old = parent_by_id.get(champion['id'])
+        if old is None:
+            delta['add'][champion['id']] = champion
+            continue
+        new_fields = flatten(champion)
+        for path, (_, value) in field_changes(old, champion).items():
+            if path in new_fields:
+                delta['set'].setdefault(champion['id'], {})[path] = value
+            else:
+                delta['unset'].setdefault(champion['id'], []).append(path)
+    kept = [c['id'] for c in parent if c['id'] in child_ids] + list(delta['add'])
+    order = [c['id'] for c in child]
+    if order != kept:
+        delta['order'] = order
+    return {key: value for key, value in delta.items() if value}
+
+
+def apply_delta(parent, delta):
+    """New champion list; `parent` is not modified"""
+    removed = set(delta.get('remove', ()))
+    champions = {c['id']: c for c in parent if c['id'] not in removed}
+    for champion_id in set(delta.get('set', {})) | set(delta.get('unset', {})):
+        record = champions[champion_id] = copy.deepcopy(champions[champion_id])
+        for path, value in delta.get('set', {}).get(champion_id, {}).items():
+            set_field(record, path, value)
+        for path in delta.get('unset', {}).get(champion_id, ()):
+            unset_field(record, path)
+    champions.update(copy.deepcopy(delta.get('add', {})))
+    return [champions[champion_id] for champion_id in delta.get('order', champions)]
+
+
+def diff_rosters(old, new):
+    """{'added': [ids], 'removed': [ids], 'changed': {id: {field path: (old, new)}}}"""
+    old_by_id = {c['id']: c for c in old}
+    new_ids = {c['id'] for c in new}
+    changed = {}
+    for champion in new:
+        if champion['id'] in old_by_id:
+            fields = field_changes(old_by_id[champion['id']], champion)
+            if fields:
+                changed[champion['id']] = fields
+    return {'added': [c['id'] for c in new if c['id'] not in old_by_id],
+            'removed': [c['id'] for c in old if c['id'] not in new_ids],
+            'changed': changed}
+
+
+def roster_hash(champions):
+    return content_hash(canonical_bytes(champions))
+
+
+class RosterStore:
+    """Versions in a store directory; reconstruct() returns a version's champion list"""
+
+    def __init__(self, root=DEFAULT_STORE, checkpoint_every=CHECKPOINT_EVERY):
+        self.root = root
+        self.checkpoint_every = checkpoint_every
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {'head': None, 'versions': []}
+        self.entries = {entry['version']: entry for entry in self.manifest['versions']}
+        self._cache = OrderedDict()
+
+    @property
+    def head(self):
+        return self.manifest['head']
+
+    def versions(self):
+        return [entry['version'] for entry in self.manifest['versions']]
+
+    def entry(self, version):
+        if version not in self.entries:
+            raise KeyError(f"unknown roster version: {version}")
+        return self.entries[version]
+
+    def _read(self, entry):
+        with gzip.open(os.path.join(self.root, entry['file']), 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write(self, filename, data):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, filename)
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        tmp_path = path + '.tmp'
+        # mtime=0 keeps the gzip bytes stable for the same content
+        with open(tmp_path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    def _save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+            f.write('\n')
+        os.replace(tmp_path, self.manifest_path)
+
+    def _remember(self, version, champions):
+        self._cache[version] = champions
+        self._cache.move_to_end(version)
+        while len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def reconstruct(self, version=None):
+        """Champion list of a version (default: head); callers get their own copy"""
+        version = version or self.head
+        chain = []
+        entry = self.entry(version)
+        while entry['version'] not in self._cache and entry['kind'] != 'checkpoint':
+            chain.append(entry)
+            entry = self.entry(entry['parent'])
+        champions = self._cache.get(entry['version'])
+        if champions is None:
+            champions = self._read(entry)['champions']
+            self._remember(entry['version'], champions)
+        for entry in reversed(chain):
+            champions = apply_delta(champions, self._read(entry))
+            self._remember(entry['version'], champions)
+        return copy.deepcopy(champions)
+
+    def commit(self, champions, version, parent=None, note=''):
+        """Store a roster as a new version on top of `parent` (default: head); returns its manifest entry"""
+        if version in self.entries:
+            raise ValueError(f"roster version {version} already exists")
+        parent = parent or self.head
+        depth = self.entry(parent)['depth'] + 1 if parent else 0
+        kind = 'checkpoint' if parent is None or depth >= self.checkpoint_every else 'delta'
+        if kind == 'checkpoint':
+            depth, data = 0, {'champions': champions}
+        else:
+            data = compute_delta(self.reconstruct(parent), champions)
+        filename = f"{len(self.manifest['versions']):04d}-{kind}.json.gz"
+        size = self._write(filename, data)
+        entry = {'version': version, 'parent': parent, 'kind': kind, 'file': filename, 'depth': depth,
+                 'champions': len(champions), 'hash': roster_hash(champions), 'bytes': size,
+                 'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()), 'note': note}
+        self.manifest['versions'].append(entry)
+        self.manifest['head'] = version
+        self.entries[version] = entry
+        self._save_manifest()
+        self._remember(version, copy.deepcopy(champions))
+        return entry
+
+    def diff(self, old_version, new_version=None):
+        return diff_rosters(self.reconstruct(old_version), self.reconstruct(new_version))
+
+    def check(self):
+        """Versions whose reconstruction does not match the recorded hash"""
+        self._cache.clear()
+        return [version for version in self.versions() if roster_hash(self.reconstruct(version)) !=
+                self.entries[version]['hash']]
+
+
+def load_version(version, root=DEFAULT_STORE):
+    """Champion list of a stored version, for champion_data.load_champions('@VERSION')"""
+    return RosterStore(root).reconstruct(version or None)
+
+
+def format_value(value):
+    return '-' if value is None else json.dumps(value) if not isinstance(value, str) else value
+
+
+def print_versions(store):
+    print("\n" + "=" * 78)
+    print(f"{'Version':<18}{'Parent':<18}{'Kind':<12}{'Champions':>10}{'Bytes':>10}  Created")
+    print("-" * 78)
+    for version in store.versions():
+        entry = store.entry(version)
+        marker = ' *' if version == store.head else ''
+        print(f"{version + marker:<18}{entry['parent'] or '-':<18}{entry['kind']:<12}{entry['champions']:>10}"
+              f"{entry['bytes']:>10}  {entry['created'][:10]}")
+    print("=" * 78)
+
+
+def print_diff(old_version, new_version, diff):
+    print("\n" + "=" * 70)
+    print(f"{old_version} -> {new_version}: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+          f"{len(diff['changed'])} changed")
+    print("-" * 70)
+    for champion_id in diff['added']:
+        print(f"  + {champion_id}")
+    for champion_id in diff['removed']:
+        print(f"  - {champion_id}")
+    for champion_id, fields in diff['changed'].items():
+        for path, (old, new) in fields.items():
+            print(f"  ~ {champion_id:<16}{path:<24}{format_value(old):>12} -> {format_value(new)}")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Versioned roster snapshots stored as deltas.')
+    parser.add_argument('--store', default=DEFAULT_STORE, help='Snapshot store directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commit = commands.add_parser('commit', help='Store a roster file as a new version')
+    commit.add_argument('version')
+    commit.add_argument('--roster', default=CHAMPIONS_PATH)
+    commit.add_argument('--parent', help='Parent version (default: head)')
+    commit.add_argument('--note', default='')
+
+    commands.add_parser('list', help='List stored versions')
+
+    diff = commands.add_parser('diff', help='Field-level changes between two versions')
+    diff.add_argument('old')
+    diff.add_argument('new', nargs='?', help='Default: head')
+
+    export = commands.add_parser('export', help='Write one version as a champions.json style file')
+    export.add_argument('version')
+    export.add_argument('--output', required=True)
+
+    commands.add_parser('check', help='Rebuild every version and compare it with its recorded hash')
+    args = parser.parse_args()
+
+    store = RosterStore(args.store)
+    if args.command != 'commit' and not store.head:
+        parser.error(f"no versions in {args.store}; commit one first")
+
+    try:
+        if args.command == 'commit':
+            champions = load_champions(args.roster)
+            parent = args.parent or store.head
+            if parent and roster_hash(store.reconstruct(parent)) == roster_hash(champions):
+                parser.error(f"{args.roster} is identical to {parent}")
+            entry = store.commit(champions, args.version, args.parent, args.note)
+            full = len(json.dumps({'champions': champions}, separators=(',', ':')).encode('utf-8'))
+            print(f"Stored {args.version} as a {entry['kind']} on {entry['parent'] or 'nothing'}: "
+                  f"{entry['bytes']:,} bytes ({full:,} bytes uncompressed in full)")
+        elif args.command == 'list':
+            print_versions(store)
+        elif args.command == 'diff':
+            start = time.perf_counter()
+            result = store.diff(args.old, args.new)
+            elapsed = time.perf_counter() - start
+            print_diff(args.old, args.new or store.head, result)
+            print(f"Reconstructed and diffed in {elapsed * 1000:.1f} ms")
+        elif args.command == 'export':
+            champions = store.reconstruct(args.version)
+            tmp_path = args.output + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'champions': champions}, indent=2))
+            os.replace(tmp_path, args.output)
+            print(f"Wrote {args.version} ({len(champions)} champions) to {args.output}")
+        elif args.command == 'check':
+            bad = store.check()
+            print(f"{len(store.versions()) - len(bad)}/{len(store.versions())} versions verified")
+            if bad:
+                print(f"Hash mismatch: {', '.join(bad)}")
+                raise SystemExit(1)
+    except (KeyError, ValueError) as e:
+        parser.error(str(e.args[0]) if e.args else str(e))
+
+
+if __name__ == "__main__":
+    main()
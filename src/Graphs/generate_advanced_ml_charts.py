@@ -6,9 +6,15 @@ Generates additional in-depth charts for the LoL Champion Recommender System
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import os
+import sys
 from matplotlib.patches import Rectangle
 import matplotlib.patches as mpatches
 
+# Shared helpers live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import metrics
+
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.facecolor'] = 'white'
@@ -29,6 +35,16 @@ precision_5 = [82.1, 75.4, 78.9, 85.3]
 recall_5 = [39.2, 34.8, 37.1, 42.6]
 f1_5 = [53.1, 47.6, 50.3, 56.7]
 
+# Pass --svg to also write vector copies used by the PDF report's vector mode
+SAVE_SVG = '--svg' in sys.argv
+
+def save_chart(filename):
+    """Save the current figure as a 300 dpi PNG, plus an SVG copy when requested"""
+    with metrics.CHART_SECONDS.labels(os.path.splitext(os.path.basename(filename))[0]).time():
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+        if SAVE_SVG:
+            plt.savefig(os.path.splitext(filename)[0] + '.svg', bbox_inches='tight')
+
 def plot_precision_degradation():
     """Chart 11: Precision degradation across K values"""
     fig, ax = plt.subplots(figsize=(12, 7))
@@ -62,7 +78,7 @@ def plot_precision_degradation():
                    fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig('11_precision_degradation_analysis.png', dpi=300, bbox_inches='tight')
+    save_chart('11_precision_degradation_analysis.png')
     plt.close()
     print("✓ Generated: 11_precision_degradation_analysis.png")
 
@@ -89,7 +105,7 @@ def plot_recall_progression():
     ax.set_xticks(k_values)
     
     plt.tight_layout()
-    plt.savefig('12_recall_progression.png', dpi=300, bbox_inches='tight')
+    save_chart('12_recall_progression.png')
     plt.close()
     print("✓ Generated: 12_recall_progression.png")
 
@@ -119,7 +135,7 @@ def plot_f1_score_comparison():
     ax.grid(True, alpha=0.3, axis='y')
     
     plt.tight_layout()
-    plt.savefig('13_f1_score_k_comparison.png', dpi=300, bbox_inches='tight')
+    save_chart('13_f1_score_k_comparison.png')
     plt.close()
     print("✓ Generated: 13_f1_score_k_comparison.png")
 
@@ -148,7 +164,7 @@ def plot_algorithm_efficiency():
     ax.legend(fontsize=10)
     
     plt.tight_layout()
-    plt.savefig('14_algorithm_efficiency.png', dpi=300, bbox_inches='tight')
+    save_chart('14_algorithm_efficiency.png')
     plt.close()
     print("✓ Generated: 14_algorithm_efficiency.png")
 
@@ -178,7 +194,7 @@ def plot_weighted_contribution():
     ax.grid(True, alpha=0.3, axis='y')
     
     plt.tight_layout()
-    plt.savefig('15_ensemble_weighted_contribution.png', dpi=300, bbox_inches='tight')
+    save_chart('15_ensemble_weighted_contribution.png')
     plt.close()
     print("✓ Generated: 15_ensemble_weighted_contribution.png")
 
@@ -208,7 +224,7 @@ def plot_metric_correlation():
     ax.set_title('Quality Metrics Correlation Matrix', fontsize=16, fontweight='bold', pad=20)
     
     plt.tight_layout()
-    plt.savefig('16_metrics_correlation.png', dpi=300, bbox_inches='tight')
+    save_chart('16_metrics_correlation.png')
     plt.close()
     print("✓ Generated: 16_metrics_correlation.png")
 
@@ -239,7 +255,7 @@ def plot_performance_boxplot():
     ax.grid(True, alpha=0.3, axis='y')
     
     plt.tight_layout()
-    plt.savefig('17_performance_distribution.png', dpi=300, bbox_inches='tight')
+    save_chart('17_performance_distribution.png')
     plt.close()
     print("✓ Generated: 17_performance_distribution.png")
 
@@ -282,7 +298,7 @@ def plot_improvement_over_baseline():
     ax.grid(True, alpha=0.3, axis='y')
     
     plt.tight_layout()
-    plt.savefig('18_ensemble_improvement.png', dpi=300, bbox_inches='tight')
+    save_chart('18_ensemble_improvement.png')
     plt.close()
     print("✓ Generated: 18_ensemble_improvement.png")
 
@@ -318,7 +334,7 @@ def plot_precision_recall_curves():
     ax.set_ylim(50, 100)
     
     plt.tight_layout()
-    plt.savefig('19_precision_recall_curves.png', dpi=300, bbox_inches='tight')
+    save_chart('19_precision_recall_curves.png')
     plt.close()
     print("✓ Generated: 19_precision_recall_curves.png")
 
@@ -349,7 +365,7 @@ def plot_top_k_accuracy():
     ax.set_ylim(80, 100)
     
     plt.tight_layout()
-    plt.savefig('20_top_k_accuracy.png', dpi=300, bbox_inches='tight')
+    save_chart('20_top_k_accuracy.png')
     plt.close()
     print("✓ Generated: 20_top_k_accuracy.png")
 
@@ -386,7 +402,7 @@ def plot_algorithm_strengths():
     
     plt.suptitle('Individual Algorithm Strength Analysis', fontsize=18, fontweight='bold', y=0.995)
     plt.tight_layout()
-    plt.savefig('21_algorithm_strengths_radar.png', dpi=300, bbox_inches='tight')
+    save_chart('21_algorithm_strengths_radar.png')
     plt.close()
     print("✓ Generated: 21_algorithm_strengths_radar.png")
 
@@ -423,7 +439,7 @@ def plot_metric_trends():
     
     plt.suptitle('Comprehensive Quality Metrics Summary', fontsize=18, fontweight='bold')
     plt.tight_layout()
-    plt.savefig('22_metric_trends_summary.png', dpi=300, bbox_inches='tight')
+    save_chart('22_metric_trends_summary.png')
     plt.close()
     print("✓ Generated: 22_metric_trends_summary.png")
 
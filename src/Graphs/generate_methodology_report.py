@@ -4,14 +4,51 @@ from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle
 from reportlab.lib.units import inch
+from contextlib import nullcontext
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import math
 
+# Shared report helpers live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from report_profiler import ReportProfiler, profile_path_for
+import metrics
+
 class MLMethodologyReportGenerator:
-    def __init__(self, filename="ML_Methodology_Analysis_Report.pdf"):
+    # Chart key -> (render method, output file)
+    GRAPHS = {
+        'normalization': ('graph_normalization', 'normalization_chart.png'),
+        'radar': ('graph_radar', 'radar_chart.png'),
+        'random_forest': ('graph_random_forest', 'rf_chart.png'),
+        'decision_tree': ('graph_decision_tree', 'dt_chart.png'),
+        'knn': ('graph_knn', 'knn_chart.png'),
+        'ensemble': ('graph_ensemble', 'ensemble_chart.png'),
+        'score_distribution': ('graph_score_distribution', 'score_distribution.png'),
+    }
+
+    # Chapters are separated by page breaks, so each can be rendered on its own:
+    # (outline title, section methods, chart keys the sections embed)
+    CHAPTERS = [
+        ('Preprocessing & Champion Match',
+         ['add_title', 'add_preprocessing_section', 'add_champion_match_analysis'],
+         ['normalization', 'radar']),
+        ('Random Forest & Decision Tree',
+         ['add_random_forest_section', 'add_decision_tree_section'],
+         ['random_forest', 'decision_tree']),
+        ('KNN, Ensemble & Compatibility Scoring',
+         ['add_knn_section', 'add_ensemble_section', 'add_compatibility_score_section'],
+         ['knn', 'ensemble', 'score_distribution']),
+        ('Conclusion & Executive Summary',
+         ['add_conclusion_summary'],
+         []),
+    ]
+
+    def __init__(self, filename="ML_Methodology_Analysis_Report.pdf", styles=None, profiler=None):
         self.filename = filename
+        # Optional ReportProfiler that times chart rendering and every chapter's flowables
+        self.profiler = profiler
         self.doc = SimpleDocTemplate(
             filename,
             pagesize=letter,
@@ -20,11 +57,14 @@ class MLMethodologyReportGenerator:
             topMargin=72,
             bottomMargin=72
         )
-        self.styles = getSampleStyleSheet()
+        # A stylesheet may be shared with other reports built in the same process
+        self.styles = styles if styles is not None else getSampleStyleSheet()
         self.create_custom_styles()
         self.story = []
 
     def create_custom_styles(self):
+        if 'MainTitle' in self.styles:
+            return  # already added to this shared stylesheet
         self.styles.add(ParagraphStyle(
             name='MainTitle',
             parent=self.styles['Heading1'],
@@ -80,9 +120,15 @@ class MLMethodologyReportGenerator:
             textColor=colors.dimgrey
         ))
 
-    def generate_graphs(self):
+    def generate_graphs(self, names=None):
+        """Render the chart images (all of them, or just the given GRAPHS keys)"""
         print("Generating visualizations...")
-        
+        for name in self.GRAPHS if names is None else names:
+            with self.profiler.phase(f'chart {name}') if self.profiler else nullcontext(), \
+                    metrics.CHART_SECONDS.labels(name).time():
+                getattr(self, self.GRAPHS[name][0])()
+
+    def graph_normalization(self):
         # 1. Normalization Chart (Preprocessing) - IMPROVED
         plt.figure(figsize=(7, 4))
         features = ['Damage', 'Toughness', 'Control', 'Mobility', 'Utility']
@@ -121,6 +167,7 @@ class MLMethodologyReportGenerator:
         plt.savefig('normalization_chart.png')
         plt.close()
 
+    def graph_radar(self):
         # 2. Radar Chart (Champion Match Analysis)
         categories = ['Damage', 'Toughness', 'Control', 'Mobility', 'Utility']
         N = len(categories)
@@ -150,6 +197,7 @@ class MLMethodologyReportGenerator:
         plt.savefig('radar_chart.png')
         plt.close()
 
+    def graph_random_forest(self):
         # 3. Random Forest Feature Importance
         features = ['Role Match', 'Difficulty', 'Damage', 'Toughness', 'Mobility']
         importance = [0.35, 0.20, 0.15, 0.15, 0.15]
@@ -161,6 +209,7 @@ class MLMethodologyReportGenerator:
         plt.savefig('rf_chart.png')
         plt.close()
 
+    def graph_decision_tree(self):
         # 4. Decision Tree Split - FIXED LAYOUT
         plt.figure(figsize=(8, 5)) # Increased width
         
@@ -196,6 +245,7 @@ class MLMethodologyReportGenerator:
         plt.savefig('dt_chart.png')
         plt.close()
 
+    def graph_knn(self):
         # 5. KNN Distance
         plt.figure(figsize=(6, 4))
         # User point
@@ -216,6 +266,7 @@ class MLMethodologyReportGenerator:
         plt.savefig('knn_chart.png')
         plt.close()
 
+    def graph_ensemble(self):
         # 6. Ensemble Weights
         labels = ['Random Forest', 'Decision Tree', 'KNN']
         sizes = [40, 30, 30]
@@ -228,6 +279,7 @@ class MLMethodologyReportGenerator:
         plt.savefig('ensemble_chart.png')
         plt.close()
 
+    def graph_score_distribution(self):
         # 7. Compatibility Score Distribution
         plt.figure(figsize=(6, 4))
         scores = np.random.normal(60, 15, 1000) # Simulate 1000 scores
@@ -518,31 +570,33 @@ class MLMethodologyReportGenerator:
         """
         self.story.append(Paragraph(analysis, self.styles['ReportBodyText']))
 
+    def add_chapter(self, index):
+        """Append the sections of one CHAPTERS entry to the story"""
+        start = len(self.story)
+        for method in self.CHAPTERS[index][1]:
+            getattr(self, method)()
+        if self.profiler:
+            self.profiler.instrument(self.story[start:], self.CHAPTERS[index][0])
+
     def build(self):
         self.generate_graphs()
-        self.add_title()
-        self.add_preprocessing_section()
-        self.add_champion_match_analysis()
-        self.story.append(PageBreak())
-        self.add_random_forest_section()
-        self.add_decision_tree_section()
-        self.story.append(PageBreak())
-        self.add_knn_section()
-        self.add_ensemble_section()
-        self.add_compatibility_score_section()
-        self.story.append(PageBreak())
-        self.add_conclusion_summary()
-        
-        self.doc.build(self.story)
+        for index in range(len(self.CHAPTERS)):
+            if index:
+                self.story.append(PageBreak())
+            self.add_chapter(index)
+        
+        self.doc.build(self.story, **({'canvasmaker': self.profiler.canvasmaker()} if self.profiler else {}))
         print(f"✅ PDF Report Successfully Generated: {self.filename}")
+        if self.profiler:
+            print(self.profiler.finish())
         
         # Cleanup images
-        images = ['normalization_chart.png', 'radar_chart.png', 'rf_chart.png', 
-                 'dt_chart.png', 'knn_chart.png', 'ensemble_chart.png', 'score_distribution.png']
-        for img in images:
+        for _, img in self.GRAPHS.values():
             if os.path.exists(img):
                 os.remove(img)
 
 if __name__ == "__main__":
-    generator = MLMethodologyReportGenerator()
+    filename = "ML_Methodology_Analysis_Report.pdf"
+    generator = MLMethodologyReportGenerator(
+        filename, profiler=ReportProfiler('methodology', profile_path_for(filename)) if '--profile' in sys.argv else None)
     generator.build()
@@ -6,10 +6,15 @@ Generates PNG charts for ML algorithm performance and quality metrics
 
 import matplotlib.pyplot as plt
 import numpy as np
+import sys
 import seaborn as sns
 from matplotlib.patches import Rectangle
 import os
 
+# Shared helpers live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import metrics
+
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (12, 8)
@@ -20,6 +25,16 @@ plt.rcParams['axes.labelsize'] = 12
 # Create output directory if it doesn't exist
 output_dir = os.path.dirname(os.path.abspath(__file__))
 
+# Pass --svg to also write vector copies used by the PDF report's vector mode
+SAVE_SVG = '--svg' in sys.argv
+
+def save_chart(filename):
+    """Save the current figure as a 300 dpi PNG, plus an SVG copy when requested"""
+    with metrics.CHART_SECONDS.labels(os.path.splitext(os.path.basename(filename))[0]).time():
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+        if SAVE_SVG:
+            plt.savefig(os.path.splitext(filename)[0] + '.svg', bbox_inches='tight')
+
 # ============================================================================
 # DATA: ML Algorithm Performance Metrics
 # ============================================================================
@@ -88,7 +103,7 @@ for bars in [bars1, bars2, bars3]:
                 ha='center', va='bottom', fontsize=9, fontweight='bold')
 
 plt.tight_layout()
-plt.savefig(os.path.join(output_dir, '1_precision_comparison.png'), dpi=300, bbox_inches='tight')
+save_chart(os.path.join(output_dir, '1_precision_comparison.png'))
 print("✓ Generated: 1_precision_comparison.png")
 plt.close()
 
@@ -122,7 +137,7 @@ for bars in [bars1, bars2]:
                 ha='center', va='bottom', fontsize=9, fontweight='bold')
 
 plt.tight_layout()
-plt.savefig(os.path.join(output_dir, '2_recall_f1_comparison.png'), dpi=300, bbox_inches='tight')
+save_chart(os.path.join(output_dir, '2_recall_f1_comparison.png'))
 print("✓ Generated: 2_recall_f1_comparison.png")
 plt.close()
 
@@ -151,7 +166,7 @@ for i, bar in enumerate(bars):
             ha='center', va='bottom', fontsize=10, fontweight='bold')
 
 plt.tight_layout()
-plt.savefig(os.path.join(output_dir, '3_mrr_comparison.png'), dpi=300, bbox_inches='tight')
+save_chart(os.path.join(output_dir, '3_mrr_comparison.png'))
 print("✓ Generated: 3_mrr_comparison.png")
 plt.close()
 
@@ -184,7 +199,7 @@ ax.text(0.5, 0.95, 'Note: Ensemble runs all 3 algorithms in parallel',
         fontsize=9, style='italic')
 
 plt.tight_layout()
-plt.savefig(os.path.join(output_dir, '4_execution_time.png'), dpi=300, bbox_inches='tight')
+save_chart(os.path.join(output_dir, '4_execution_time.png'))
 print("✓ Generated: 4_execution_time.png")
 plt.close()
 
@@ -240,7 +255,7 @@ ax.set_title('Multi-Metric Performance Comparison (Radar Chart)',
 ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), framealpha=0.9)
 
 plt.tight_layout()
-plt.savefig(os.path.join(output_dir, '5_radar_performance.png'), dpi=300, bbox_inches='tight')
+save_chart(os.path.join(output_dir, '5_radar_performance.png'))
 print("✓ Generated: 5_radar_performance.png")
 plt.close()
 
@@ -270,7 +285,7 @@ for i, bar in enumerate(bars):
             ha='center', va='bottom', fontsize=10, fontweight='bold')
 
 plt.tight_layout()
-plt.savefig(os.path.join(output_dir, '6_champion_distribution.png'), dpi=300, bbox_inches='tight')
+save_chart(os.path.join(output_dir, '6_champion_distribution.png'))
 print("✓ Generated: 6_champion_distribution.png")
 plt.close()
 
@@ -300,7 +315,7 @@ for i, bar in enumerate(bars):
             ha='center', va='bottom', fontsize=11, fontweight='bold')
 
 plt.tight_layout()
-plt.savefig(os.path.join(output_dir, '7_difficulty_distribution.png'), dpi=300, bbox_inches='tight')
+save_chart(os.path.join(output_dir, '7_difficulty_distribution.png'))
 print("✓ Generated: 7_difficulty_distribution.png")
 plt.close()
 
@@ -331,7 +346,7 @@ ax.plot([60, 60], [65, 82], 'b--', alpha=0.3, label='Recall Baseline')
 ax.legend(loc='lower right', framealpha=0.9)
 
 plt.tight_layout()
-plt.savefig(os.path.join(output_dir, '8_precision_recall_tradeoff.png'), dpi=300, bbox_inches='tight')
+save_chart(os.path.join(output_dir, '8_precision_recall_tradeoff.png'))
 print("✓ Generated: 8_precision_recall_tradeoff.png")
 plt.close()
 
@@ -375,7 +390,7 @@ ax.set_title('Quality Metrics Heatmap - All Algorithms', fontweight='bold', pad=
 fig.colorbar(im, ax=ax, label='Score (%)')
 
 plt.tight_layout()
-plt.savefig(os.path.join(output_dir, '9_metrics_heatmap.png'), dpi=300, bbox_inches='tight')
+save_chart(os.path.join(output_dir, '9_metrics_heatmap.png'))
 print("✓ Generated: 9_metrics_heatmap.png")
 plt.close()
 
@@ -425,7 +440,7 @@ for i, (bar1, bar2) in enumerate(zip(bars1, bars2)):
                bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
 
 plt.tight_layout()
-plt.savefig(os.path.join(output_dir, '10_ensemble_advantage.png'), dpi=300, bbox_inches='tight')
+save_chart(os.path.join(output_dir, '10_ensemble_advantage.png'))
 print("✓ Generated: 10_ensemble_advantage.png")
 plt.close()
 
@@ -13,14 +13,45 @@ from reportlab.platypus import (
     Table, TableStyle, KeepTogether
 )
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+from contextlib import nullcontext
 from datetime import datetime
 import os
+import sys
+
+# Shared report helpers live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from report_image_cache import ImageCache
+from report_profiler import ReportProfiler, profile_path_for
+
+try:
+    from svglib.svglib import svg2rlg
+except ImportError:  # vector mode falls back to the PNG charts
+    svg2rlg = None
+
+
+def load_vector_chart(svg_path, width, height):
+    """Load an SVG chart as a reportlab Drawing scaled to fill the given box, or None if it cannot be parsed"""
+    drawing = svg2rlg(svg_path)
+    if drawing is None:
+        return None
+    drawing.scale(width / drawing.width, height / drawing.height)
+    drawing.width, drawing.height = width, height
+    return drawing
 
 class MLReportGenerator:
     """Generates comprehensive PDF report analyzing ML performance graphs"""
     
-    def __init__(self, output_filename="ML_Performance_Analysis_Report.pdf"):
+    def __init__(self, output_filename="ML_Performance_Analysis_Report.pdf", vector=False, image_cache=None,
+                 styles=None, profiler=None):
         self.output_filename = output_filename
+        # Optional ReportProfiler that times every section and flowable of the build
+        self.profiler = profiler
+        # Optional ImageCache that resamples the 300 dpi charts to print resolution
+        self.image_cache = image_cache
+        # Vector mode embeds the .svg sibling of each chart (see generate_ml_charts.py --svg)
+        self.vector = vector and svg2rlg is not None
+        if vector and svg2rlg is None:
+            print("Warning: svglib is not installed, embedding PNG charts instead")
         self.doc = SimpleDocTemplate(
             self.output_filename,
             pagesize=letter,
@@ -30,11 +61,16 @@ class MLReportGenerator:
             bottomMargin=18,
         )
         self.story = []
-        self.styles = getSampleStyleSheet()
+        # (title, story index) for each section; see start_section
+        self.sections = []
+        # A stylesheet may be shared with other reports built in the same process
+        self.styles = styles if styles is not None else getSampleStyleSheet()
         self._setup_custom_styles()
         
     def _setup_custom_styles(self):
         """Setup custom paragraph styles"""
+        if 'CustomTitle' in self.styles:
+            return  # already added to this shared stylesheet
         # Title style
         self.styles.add(ParagraphStyle(
             name='CustomTitle',
@@ -88,8 +124,13 @@ class MLReportGenerator:
             leading=16
         ))
         
+    def start_section(self, title):
+        """Mark where an independently renderable section begins in the story"""
+        self.sections.append((title, len(self.story)))
+        
     def add_cover_page(self):
         """Generate cover page"""
+        self.start_section("Cover")
         self.story.append(Spacer(1, 2*inch))
         
         title = Paragraph(
@@ -139,6 +180,7 @@ class MLReportGenerator:
         
     def add_executive_summary(self):
         """Add executive summary section"""
+        self.start_section("Executive Summary")
         heading = Paragraph("Executive Summary", self.styles['SectionHeading'])
         self.story.append(heading)
         self.story.append(Spacer(1, 0.2*inch))
@@ -172,6 +214,7 @@ class MLReportGenerator:
         
     def add_graph_analysis(self, graph_number, title, image_path, analysis_text):
         """Add a graph with detailed analysis"""
+        self.start_section(f"Graph {graph_number}: {title}")
         # Graph title
         graph_title = Paragraph(
             f"Graph {graph_number}: {title}",
@@ -183,9 +226,23 @@ class MLReportGenerator:
         
         # Image if exists
         elements = [graph_title, Spacer(1, 0.1*inch)]
+        svg_path = os.path.splitext(image_path)[0] + '.svg'
         
-        if os.path.exists(image_path):
+        drawing = None
+        if self.vector and os.path.exists(svg_path):
             try:
+                drawing = load_vector_chart(svg_path, 6*inch, 3.5*inch)
+                if drawing is None:
+                    print(f"Warning: Could not parse vector chart {svg_path}, embedding the PNG instead")
+            except Exception as e:
+                print(f"Warning: Could not load vector chart {svg_path}: {e}")
+        if drawing is not None:
+            elements.append(drawing)
+            elements.append(Spacer(1, 0.15*inch))
+        elif os.path.exists(image_path):
+            try:
+                if self.image_cache:
+                    image_path = self.image_cache.prepare(image_path, 6, 3.5)
                 img = Image(image_path, width=6*inch, height=3.5*inch)
                 elements.append(img)
                 elements.append(Spacer(1, 0.15*inch))
@@ -198,12 +255,8 @@ class MLReportGenerator:
         # Keep graph and analysis together
         self.story.append(KeepTogether(elements))
         
-    def generate_report(self):
-        """Generate the complete PDF report"""
-        print("\n" + "="*70)
-        print("Generating Comprehensive ML Performance Analysis PDF Report...")
-        print("="*70 + "\n")
-        
+    def build_story(self):
+        """Assemble every section of the report into self.story"""
         # Cover page
         self.add_cover_page()
         
@@ -213,12 +266,37 @@ class MLReportGenerator:
         # Graph analyses
         self._add_all_graph_analyses()
         
+    def section_stories(self):
+        """Split the assembled story into (title, flowables) per section"""
+        bounds = [start for _, start in self.sections[1:]] + [len(self.story)]
+        return [(title, self.story[start:end])
+                for (title, start), end in zip(self.sections, bounds)]
+        
+    def generate_report(self):
+        """Generate the complete PDF report"""
+        print("\n" + "="*70)
+        print("Generating Comprehensive ML Performance Analysis PDF Report...")
+        print("="*70 + "\n")
+        
+        with self.profiler.phase('story assembly') if self.profiler else nullcontext():
+            self.build_story()
+        
+        build_options = {}
+        if self.profiler:
+            for title, flowables in self.section_stories():
+                self.profiler.instrument(flowables, title)
+            build_options['canvasmaker'] = self.profiler.canvasmaker()
+        
         # Build PDF
         try:
-            self.doc.build(self.story)
+            self.doc.build(self.story, **build_options)
             print(f"\n✅ PDF Report Successfully Generated: {self.output_filename}")
             print(f"📄 Location: {os.path.abspath(self.output_filename)}")
             print(f"📊 Total Graphs Analyzed: 22")
+            if self.image_cache:
+                print(self.image_cache.summary())
+            if self.profiler:
+                print(self.profiler.finish())
             print("="*70 + "\n")
             return True
         except Exception as e:
@@ -959,6 +1037,7 @@ class MLReportGenerator:
         self.story.append(PageBreak())
         
         # Conclusion section
+        self.start_section("Conclusion")
         conclusion_heading = Paragraph("Conclusion", self.styles['SectionHeading'])
         self.story.append(conclusion_heading)
         self.story.append(Spacer(1, 0.2*inch))
@@ -1009,7 +1088,12 @@ class MLReportGenerator:
 
 def main():
     """Main execution function"""
-    generator = MLReportGenerator("ML_Performance_Comprehensive_Analysis_Report.pdf")
+    output_filename = "ML_Performance_Comprehensive_Analysis_Report.pdf"
+    generator = MLReportGenerator(output_filename,
+                                  vector='--vector' in sys.argv,
+                                  image_cache=ImageCache() if '--image-cache' in sys.argv else None,
+                                  profiler=ReportProfiler('ml_report', profile_path_for(output_filename))
+                                  if '--profile' in sys.argv else None)
     success = generator.generate_report()
     
     if success:
@@ -0,0 +1,272 @@
+"""
+Team Composition Scorer
+LoL Champion Recommender System
+Resolves the free-text categories in champion_counters.json ("Squishy
+carries", "Engage supports") to champion sets through roster attributes,
+materializes counter and synergy matrices from them, and scores 5-champion
+compositions or the best next pick with vectorized array ops.
+
+The matrices are stored dense (n x n float32, about 114 KB each for 171
+champions). Only around 3% of entries are non-zero, but at this size a dense
+fancy-index gather of a team's 5 x 5 block is cheaper than CSR row lookups;
+to_csr() exports the non-zero structure for consumers that want it.
+
+    counter[a, b]  > 0 when a is listed as strong against b or b as weak against a
+    synergy[a, b]  > 0 when either lists the other's category in synergizes_with
+
+Categories are split into terms ("squishy", "carries"); each term is a
+predicate over the champion profile and a category is the intersection of its
+terms. Categories with no recognised term resolve to no champions and are
+reported, so new wording in the counters file shows up instead of silently
+scoring zero
+"""
+
+from champion_data import (CHAMPIONS_PATH, CSV_PATH, DATA_DIR, load_champion_csv, load_champion_details,
+                           load_champions, name_key, parse_set_literal)
+from itertools import combinations
+import argparse
+import re
+import time
+import numpy as np
+
+import metrics
+
+TEAM_SIZE = 5
+DEFAULT_WEIGHTS = {'synergy': 1.0, 'counter': 1.0}
+ROWS_SCORED = metrics.counter('rows_scored_total', 'Rows scored by each scorer',
+                              labels=('scorer',)).labels('team_composition')
+
+# Term pattern -> predicate over a champion profile (see build_profiles)
+TERM_RULES = [
+    (r'long-range poke|poke', lambda p: 'Artillery' in p['classes'] or ('Mage' == p['herotype'] and p['ranged'])),
+    (r'point-and-click cc', lambda p: p['control'] == 3),
+    (r'aoe damage', lambda p: bool({'Battlemage', 'Artillery'} & p['classes'])),
+    (r'split push', lambda p: bool({'Skirmisher', 'Juggernaut', 'Specialist'} & p['classes'])),
+    (r'hypercarry', lambda p: p['herotype'] == 'Marksman' and p['difficulty'] >= 2),
+    (r'low mobility|immobile', lambda p: p['mobility'] == 1),
+    (r'high mobility', lambda p: p['mobility'] == 3),
+    (r'squishy', lambda p: p['toughness'] == 1),
+    (r'engage', lambda p: p['control'] == 3 or bool({'Vanguard', 'Catcher'} & p['classes'])),
+    (r'dive|divers?', lambda p: bool({'Diver', 'Assassin'} & p['classes'])),
+    (r'\bap\b', lambda p: p['damage_type'] == 'Magic'),
+    (r'\bad\b|adcs?', lambda p: p['herotype'] == 'Marksman'),
+    (r'carr(?:y|ies)', lambda p: p['damage'] == 3),
+    (r'melee', lambda p: not p['ranged']),
+    (r'ranged', lambda p: p['ranged']),
+    (r'tanks?', lambda p: p['herotype'] == 'Tank' or p['toughness'] == 3),
+    (r'assassins?', lambda p: p['herotype'] == 'Assassin' or 'Assassin' in p['classes']),
+    (r'fighters?', lambda p: p['herotype'] == 'Fighter'),
+    (r'mages?', lambda p: p['herotype'] == 'Mage'),
+    (r'supports?', lambda p: p['herotype'] == 'Support' or 'Support' in p['positions']),
+    (r'champions|compositions|dealers', lambda p: True),
+]
+TERM_PATTERNS = [(re.compile(pattern), rule) for pattern, rule in TERM_RULES]
+
+
+def build_profiles(champions, csv_rows):
+    """Flat per-champion facts the term predicates read"""
+    profiles = []
+    for champion in champions:
+        row = csv_rows.get(name_key(champion['name']), {})
+        attributes = champion.get('attributes', {})
+        profiles.append({
+            'herotype': champion.get('herotype'),
+            'ranged': champion.get('range_type') == 'Ranged',
+            'positions': set(parse_set_literal(champion.get('position'))),
+            'classes': set(parse_set_literal(row.get('role'))),
+            'damage_type': row.get('adaptivetype'),
+            'difficulty': champion.get('difficulty') or 2,
+            **{name: int(attributes.get(name, 0)) for name in ('damage', 'toughness', 'control', 'mobility')},
+        })
+    return profiles
+
+
+def resolve_category(category, profiles):
+    """Boolean mask of champions in a category, or None if no term is recognised"""
+    text = category.lower()
+    mask, matched = np.ones(len(profiles), dtype=bool), False
+    for pattern, rule in TERM_PATTERNS:
+        if pattern.search(text):
+            text = pattern.sub(' ', text)
+            mask &= np.array([rule(p) for p in profiles])
+            matched = True
+    return mask if matched else None
+
+
+class TeamCompositionScorer:
+    """Dense counter/synergy matrices over the roster plus batch scoring"""
+
+    def __init__(self, champions, counters, csv_rows, weights=None):
+        self.ids = [c['id'] for c in champions]
+        self.names = [c['name'] for c in champions]
+        self.index = {champion_id: i for i, champion_id in enumerate(self.ids)}
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        profiles = build_profiles(champions, csv_rows)
+
+        n = len(champions)
+        self.categories, self.unresolved = {}, set()
+        raw_counter = np.zeros((n, n), dtype=np.float32)
+        raw_synergy = np.zeros((n, n), dtype=np.float32)
+        self.annotated = 0
+        for champion_id, entry in counters.items():
+            row = self.index.get(champion_id)
+            if row is None:
+                continue
+            self.annotated += 1
+            for key, target, sign in (('strong_against', raw_counter, 1.0), ('weak_against', raw_counter, -1.0),
+                                      ('synergizes_with', raw_synergy, 1.0)):
+                for category in entry.get(key, []):
+                    members = self._category(category, profiles)
+                    if members is not None:
+                        target[row, members] += sign
+
+        # "a strong against b" is the same evidence as "b weak against a"
+        self.counter = raw_counter - raw_counter.T
+        self.synergy = raw_synergy + raw_synergy.T
+        np.fill_diagonal(self.counter, 0)
+        np.fill_diagonal(self.synergy, 0)
+
+    def _category(self, category, profiles):
+        if category not in self.categories:
+            mask = resolve_category(category, profiles)
+            if mask is None:
+                self.unresolved.add(category)
+            self.categories[category] = None if mask is None else np.flatnonzero(mask)
+        return self.categories[category]
+
+    def to_csr(self, name):
+        """(indptr, indices, data) for the 'counter' or 'synergy' matrix"""
+        matrix = getattr(self, name)
+        rows, cols = np.nonzero(matrix)
+        indptr = np.zeros(matrix.shape[0] + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=matrix.shape[0]), out=indptr[1:])
+        return indptr, cols.astype(np.int32), matrix[rows, cols]
+
+    def lookup(self, names):
+        """Row indices for champion ids or names"""
+        by_name = {name_key(name): i for i, name in enumerate(self.names)}
+        indices = []
+        for name in names:
+            i = self.index.get(name, by_name.get(name_key(name)))
+            if i is None:
+                raise KeyError(f"unknown champion: {name}")
+            indices.append(i)
+        return np.array(indices, dtype=np.int64)
+
+    def score_teams(self, teams, enemies=()):
+        """Score an (m x k) array of team rows against a fixed enemy team; returns m scores"""
+        teams = np.asarray(teams, dtype=np.int64)
+        ROWS_SCORED.inc(len(teams))
+        synergy = self.synergy[teams[:, :, None], teams[:, None, :]].sum(axis=(1, 2)) / 2
+        score = self.weights['synergy'] * synergy
+        if len(enemies):
+            advantage = self.counter[:, np.asarray(enemies, dtype=np.int64)].sum(axis=1)
+            score = score + self.weights['counter'] * advantage[teams].sum(axis=1)
+        return score
+
+    def pick_scores(self, allies=(), enemies=()):
+        """Marginal score of adding each champion to the allies; taken champions get -inf"""
+        allies, enemies = np.asarray(allies, dtype=np.int64), np.asarray(enemies, dtype=np.int64)
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        if len(allies):
+            scores += self.weights['synergy'] * self.synergy[:, allies].sum(axis=1)
+        if len(enemies):
+            scores += self.weights['counter'] * self.counter[:, enemies].sum(axis=1)
+        scores[np.concatenate([allies, enemies])] = -np.inf
+        return scores
+
+    def best_picks(self, allies=(), enemies=(), top=5):
+        scores = self.pick_scores(allies, enemies)
+        order = np.argsort(-scores, kind='stable')[:top]
+        return [(self.ids[i], float(scores[i])) for i in order]
+
+    def best_completions(self, allies=(), enemies=(), pool=20, top=5):
+        """Best ways to fill the remaining slots, enumerated over the top `pool` single picks"""
+        allies = list(allies)
+        missing = TEAM_SIZE - len(allies)
+        if missing <= 0:
+            return [(allies, float(self.score_teams([allies], enemies)[0]))]
+        candidates = np.argsort(-self.pick_scores(allies, enemies), kind='stable')[:pool]
+        fills = np.array(list(combinations(candidates, missing)), dtype=np.int64)
+        teams = np.hstack([np.tile(np.array(allies, dtype=np.int64), (len(fills), 1)), fills])
+        scores = self.score_teams(teams, enemies)
+        order = np.argsort(-scores, kind='stable')[:top]
+        return [([self.ids[i] for i in teams[j]], float(scores[j])) for j in order]
+
+
+def load_scorer(roster_path=CHAMPIONS_PATH, data_dir=DATA_DIR, csv_path=CSV_PATH, weights=None):
+    return TeamCompositionScorer(load_champions(roster_path), load_champion_details(data_dir)['counters'],
+                                 load_champion_csv(csv_path), weights)
+
+
+def print_coverage(scorer):
+    print("\n" + "=" * 70)
+    print(f"{'Category':<30}{'Champions':>10}")
+    print("-" * 70)
+    for category, members in sorted(scorer.categories.items()):
+        print(f"{category:<30}{'unresolved' if members is None else len(members):>10}")
+    print("=" * 70)
+    print(f"{scorer.annotated} annotated champions; counter nnz {np.count_nonzero(scorer.counter)}, "
+          f"synergy nnz {np.count_nonzero(scorer.synergy)} of {scorer.counter.size}")
+
+
+def benchmark(scorer, teams=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    n = len(scorer.ids)
+    # Distinct champions per row: first five columns of a random permutation of each row
+    candidates = np.argsort(rng.random((teams, n)), axis=1)[:, :2 * TEAM_SIZE]
+    allies, enemies = candidates[:, :TEAM_SIZE], candidates[0, TEAM_SIZE:]
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        scorer.score_teams(allies, enemies)
+        best = min(best, time.perf_counter() - start)
+    print(f"Scored {teams:,} compositions in {best * 1000:.1f} ms ({teams / (best * 1000):,.0f} per ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score team compositions from champion counter and synergy data.')
+    parser.add_argument('--allies', nargs='*', default=[], help='Champion ids or names already on the team')
+    parser.add_argument('--enemies', nargs='*', default=[], help='Champion ids or names on the enemy team')
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--pool', type=int, default=20, help='Single picks considered when completing a team')
+    parser.add_argument('--coverage', action='store_true', help='Show how each category resolved')
+    parser.add_argument('--benchmark', type=int, metavar='TEAMS', help='Time scoring this many random teams')
+    parser.add_argument('--roster', default=CHAMPIONS_PATH)
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--metrics', metavar='DIR', nargs='?', const=metrics.DEFAULT_METRICS_DIR,
+                        help=f"Export rows scored to DIR on exit (default: {metrics.DEFAULT_METRICS_DIR})")
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.export_on_exit(args.metrics)
+
+    scorer = load_scorer(args.roster, args.data_dir)
+    try:
+        allies, enemies = scorer.lookup(args.allies), scorer.lookup(args.enemies)
+    except KeyError as e:
+        parser.error(e.args[0])
+    if len(allies) > TEAM_SIZE or len(enemies) > TEAM_SIZE:
+        parser.error(f"teams have at most {TEAM_SIZE} champions")
+
+    if args.coverage:
+        print_coverage(scorer)
+    if scorer.unresolved:
+        print(f"Unresolved categories: {', '.join(sorted(scorer.unresolved))}")
+
+    if len(allies) == TEAM_SIZE:
+        score = scorer.score_teams([allies], enemies)[0]
+        print(f"Composition score: {score:.2f}")
+    elif args.allies or args.enemies:
+        print("\nBest next picks:")
+        for champion_id, score in scorer.best_picks(allies, enemies, args.top):
+            print(f"  {champion_id:<16}{score:>7.2f}")
+        print("\nBest completions:")
+        for team, score in scorer.best_completions(list(allies), enemies, args.pool, args.top):
+            print(f"  {score:>7.2f}  {', '.join(team)}")
+
+    if args.benchmark:
+        benchmark(scorer, args.benchmark)
+
+
+if __name__ == "__main__":
+    main()